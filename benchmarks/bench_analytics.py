@@ -0,0 +1,63 @@
+"""Write throughput and dashboard read latency of the analytics store.
+
+    python benchmarks/bench_analytics.py --rows 1000000
+
+Records ``--rows`` predictions spread over ``--days`` into a fresh database,
+then times the dashboard's reads (``summary`` from the bucket pre-aggregates
+and ``recent``) against a full scan of the raw log.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector.analytics import AnalyticsStore  # noqa: E402
+
+
+def best_ms(fn, runs=20):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return min(samples) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int,   default=1000000)
+    ap.add_argument("--days", type=float, default=30)
+    args = ap.parse_args(argv)
+
+    rng   = np.random.default_rng(0)
+    now   = time.time()
+    ts    = np.sort(now - rng.uniform(0, args.days * 86400, args.rows))
+    probs = rng.uniform(0, 1, args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AnalyticsStore(os.path.join(tmp, "analytics.db"))
+        t0 = time.perf_counter()
+        for t, p in zip(ts.tolist(), probs.tolist()):
+            store.record(p, "so tired of everything, I just want it to stop", ts=t)
+        t_record = time.perf_counter() - t0
+        store.flush()
+        t_total = time.perf_counter() - t0
+
+        db = store._db()
+        print(f"{args.rows} predictions over {args.days:g} days, {len(store.timeline())} buckets\n")
+        print(f"record()            {t_record / args.rows * 1e6:8.2f} µs per call (request path)")
+        print(f"written             {args.rows / t_total:8.0f} rows/s including the final flush")
+        print(f"summary()           {best_ms(store.summary):8.2f} ms")
+        print(f"summary(last day)   {best_ms(lambda: store.summary(now - 86400)):8.2f} ms")
+        print(f"recent(5)           {best_ms(lambda: store.recent(5)):8.2f} ms")
+        print(f"full scan of log    {best_ms(lambda: db.execute('SELECT COUNT(*), SUM(prob >= 0.5) FROM predictions').fetchone(), 3):8.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
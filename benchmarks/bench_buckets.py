@@ -0,0 +1,68 @@
+"""Throughput of fixed maxlen padding versus length-bucketed padding.
+
+    python benchmarks/bench_buckets.py --model lstm_model.npz --bucket-sizes 64,256,1024
+
+Scores every row of the CSV once padded to 100 tokens and once per bucket
+size, and prints rows/s, mean padded width, and how far the bucketed
+probabilities and labels drift from the fixed-width ones (the model has no
+masking, so leading zeros are not a no-op).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector import THRESHOLD, Predictor  # noqa: E402
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--model",        default="lstm_model.npz")
+    ap.add_argument("--tokenizer",    default="tokenizer.vocab")
+    ap.add_argument("--csv",          default="df_polarity.csv")
+    ap.add_argument("--column",       default="clean_text")
+    ap.add_argument("--batch-size",   type=int, default=256, help="rows per forward pass at fixed width")
+    ap.add_argument("--bucket-sizes", default="64,256,1024")
+    args = ap.parse_args(argv)
+
+    texts = pd.read_csv(args.csv)[args.column].fillna("").astype(str).tolist()
+    fixed = Predictor.from_files(args.model, args.tokenizer, mode=None if args.model.endswith(".npz") else "graph")
+    x = fixed.encode(texts)
+    lengths = np.count_nonzero(x, axis=1)
+    print(f"{len(x)} rows, tokens per row: median {np.median(lengths):.0f}, "
+          f"p95 {np.percentile(lengths, 95):.0f}, max {lengths.max()}\n")
+
+    def run_fixed(x):
+        return np.concatenate([fixed.forward(x[i:i + args.batch_size])
+                               for i in range(0, len(x), args.batch_size)])
+
+    fixed.warmup()
+    base, secs = timed(run_fixed, x)
+    print(f"{'padding':<14}{'rows/s':>10}{'width':>8}{'speedup':>9}{'max|dp|':>10}{'agree':>8}")
+    print(f"{'fixed 100':<14}{len(x) / secs:>10.0f}{x.shape[1]:>8.1f}{1.0:>9.2f}{0.0:>10.5f}{1.0:>8.4f}")
+
+    bucketed = Predictor(fixed.model, fixed.tokenizer, fixed.maxlen, fixed.mode,
+                         bucket_size=max(int(b) for b in args.bucket_sizes.split(",")))
+    bucketed.warmup()
+    for size in (int(b) for b in args.bucket_sizes.split(",")):
+        probs, bsecs = timed(bucketed.forward_bucketed, x, size)
+        order = np.argsort(lengths, kind="stable")
+        width = np.mean([lengths[order[i:i + size]].max() for i in range(0, len(x), size)])
+        agree = np.mean((probs >= THRESHOLD) == (base >= THRESHOLD))
+        print(f"{f'bucket {size}':<14}{len(x) / bsecs:>10.0f}{width:>8.1f}{secs / bsecs:>9.2f}"
+              f"{np.abs(probs - base).max():>10.5f}{agree:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
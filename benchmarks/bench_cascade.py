@@ -0,0 +1,70 @@
+"""Escalation rate, throughput and agreement of the linear → LSTM cascade.
+
+    python -m detector.linear df_polarity.csv linear_model.npz
+    python benchmarks/bench_cascade.py --model lstm_model.npz --fast linear_model.npz
+
+For each confidence band, scores every CSV row through the cascade and
+prints the share of rows escalated to the LSTM, end-to-end rows/s against
+the LSTM-only path, label agreement with LSTM-only, and accuracy / ROC-AUC
+on the notebook's held-out split.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector import THRESHOLD, Predictor  # noqa: E402
+from detector.linear import LinearModel, notebook_split  # noqa: E402
+
+
+def run(predictor, texts, batch_size):
+    t0 = time.perf_counter()
+    probs = np.concatenate([predictor.predict(texts[i:i + batch_size])
+                            for i in range(0, len(texts), batch_size)])
+    return probs, len(texts) / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--model",      default="lstm_model.npz")
+    ap.add_argument("--tokenizer",  default="tokenizer.vocab")
+    ap.add_argument("--fast",       default="linear_model.npz")
+    ap.add_argument("--csv",        default="df_polarity.csv")
+    ap.add_argument("--batch-size", type=int, default=256)
+    ap.add_argument("--bands",      default="0.02:0.98,0.05:0.95,0.1:0.9,0.2:0.8",
+                    help="comma-separated LOW:HIGH pairs")
+    args = ap.parse_args(argv)
+
+    texts = pd.read_csv(args.csv)["clean_text"].astype(str).fillna("").tolist()
+    _, x_test, _, y_test = notebook_split(args.csv)
+    lstm = Predictor.from_files(args.model, args.tokenizer).warmup()
+    fast = LinearModel.load(args.fast)
+
+    base, base_rate = run(lstm, texts, args.batch_size)
+    base_test = lstm.predict(x_test)
+    print(f"{len(texts)} rows; held-out split {len(x_test)} rows\n")
+    print(f"{'tier':<14}{'escalated':>10}{'rows/s':>10}{'speedup':>9}{'agree':>8}{'acc':>8}{'auc':>8}")
+    print(f"{'lstm only':<14}{1.0:>10.1%}{base_rate:>10.0f}{1.0:>9.2f}{1.0:>8.4f}"
+          f"{accuracy_score(y_test, base_test >= THRESHOLD):>8.4f}{roc_auc_score(y_test, base_test):>8.4f}")
+
+    for band in args.bands.split(","):
+        low, high = (float(b) for b in band.split(":"))
+        cascade = Predictor(lstm.model, lstm.tokenizer, lstm.maxlen, lstm.mode, fast=fast, band=(low, high))
+        cascade._serve = lstm._serve   # reuse the traced graph
+        probs, rate = run(cascade, texts, args.batch_size)
+        escalated = cascade.escalated / max(cascade.screened, 1)
+        agree = np.mean((probs >= THRESHOLD) == (base >= THRESHOLD))
+        test = cascade.predict(x_test)
+        print(f"{f'{low:g}-{high:g}':<14}{escalated:>10.1%}{rate:>10.0f}{rate / base_rate:>9.2f}{agree:>8.4f}"
+              f"{accuracy_score(y_test, test >= THRESHOLD):>8.4f}{roc_auc_score(y_test, test):>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
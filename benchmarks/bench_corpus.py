@@ -0,0 +1,75 @@
+"""Reading ``df_polarity.csv`` versus opening its ``detector.corpus`` copy.
+
+    python benchmarks/bench_corpus.py --sizes 10000,100000,1000000
+
+For each size, ``df_polarity.csv`` is repeated up to that many rows, written
+as a CSV and converted once.  Fresh processes then time what a consumer
+pays before it can use one 2048-row batch: parsing the CSV and tokenizing
+``clean_text`` (the notebook's way), or opening the corpus and slicing its
+texts and token ids.  Each process reports its peak RSS.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from detector.corpus import convert  # noqa: E402
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+kind, path, tokenizer = sys.argv[1:4]
+if kind == "csv":
+    import pandas as pd
+    from detector.vocab import load_tokenizer
+    texts = pd.read_csv(path)["clean_text"].astype(str).tolist()
+    x = load_tokenizer(tokenizer).encode(texts, 100)
+    batch = texts[-2048:], x[-2048:]
+else:
+    from detector.corpus import Corpus
+    corpus = Corpus.open(path)
+    n = len(corpus)
+    batch = corpus.texts(n - 2048, n), corpus.tokens[n - 2048:n].sum()
+elapsed = time.perf_counter() - t0
+rss = next(int(l.split()[1]) for l in open("/proc/self/status") if l.startswith("VmHWM:"))
+print(json.dumps({"s": elapsed, "rss": rss}))
+"""
+
+
+def child(kind, path, tokenizer):
+    proc = subprocess.run([sys.executable, "-c", CHILD, kind, path, tokenizer], capture_output=True,
+                          text=True, cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT), check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--csv",       default="df_polarity.csv")
+    ap.add_argument("--tokenizer", default="tokenizer.vocab")
+    ap.add_argument("--sizes",     default="10000,100000,1000000")
+    args = ap.parse_args(argv)
+
+    base = pd.read_csv(args.csv)
+    print(f"{'rows':>9}{'convert s':>11}{'csv s':>9}{'csv MB':>9}{'corpus s':>10}{'corpus MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in (int(s) for s in args.sizes.split(",")):
+            csv, path = os.path.join(tmp, f"{rows}.csv"), os.path.join(tmp, f"{rows}.corpus")
+            base.iloc[[i % len(base) for i in range(rows)]].to_csv(csv, index=False)
+            t0 = time.perf_counter()
+            convert(csv, path, args.tokenizer, log=open(os.devnull, "w"))
+            built = time.perf_counter() - t0
+            a, b = child("csv", csv, args.tokenizer), child("corpus", path, args.tokenizer)
+            print(f"{rows:>9}{built:>11.1f}{a['s']:>9.2f}{a['rss'] / 1024:>9.0f}"
+                  f"{b['s']:>10.3f}{b['rss'] / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Single-tweet latency of ``model.predict`` versus the traced graph path.
+
+    python benchmarks/bench_latency.py --runs 300
+
+Prints p50/p99 milliseconds for each inference mode on the same encoded
+tweets, measured after a warm-up call.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector import Predictor  # noqa: E402
+
+TWEETS = [
+    "Just got promoted at work! Feeling blessed and grateful for this opportunity.",
+    "I feel like nobody cares anymore. I am so depressed. What's the point of trying?",
+    "Coffee with friends then a long walk, perfect Sunday",
+    "So tired of everything, I just want the pain to stop",
+]
+
+
+def percentiles(samples):
+    ms = np.asarray(samples) * 1000
+    return np.percentile(ms, 50), np.percentile(ms, 99)
+
+
+def bench(predictor, rows, runs):
+    predictor.warmup()
+    samples = []
+    for i in range(runs):
+        x  = rows[i % len(rows)][None, :]
+        t0 = time.perf_counter()
+        predictor.forward(x)
+        samples.append(time.perf_counter() - t0)
+    return percentiles(samples)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--model",     default="lstm_model.h5")
+    ap.add_argument("--tokenizer", default="tokenizer.pkl")
+    ap.add_argument("--runs",      type=int, default=200)
+    args = ap.parse_args(argv)
+
+    base = Predictor.from_files(args.model, args.tokenizer, mode="predict")
+    fast = Predictor(base.model, base.tokenizer, mode="graph")
+    rows = base.encode(TWEETS)
+
+    print(f"{'mode':<10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, predictor in (("predict", base), ("graph", fast)):
+        p50, p99 = bench(predictor, rows, args.runs)
+        print(f"{name:<10}{p50:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
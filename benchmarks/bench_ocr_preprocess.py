@@ -0,0 +1,58 @@
+"""OCR latency versus accuracy for each preprocessing setting.
+
+    python benchmarks/bench_ocr_preprocess.py --images 20
+
+Renders synthetic tweet screenshots (see ``screenshots.py``), runs
+tesseract on them with each preprocessing preset, and prints mean/p95 OCR
+milliseconds and mean character error rate against the rendered text.
+Preprocessing time is included in the latency.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.screenshots import cer, fixture_set  # noqa: E402
+from detector.ocr import extract_text  # noqa: E402
+
+PRESETS = {
+    "none":                    (),
+    "gray":                    ("gray",),
+    "gray,downscale":          ("gray", "downscale"),
+    "gray,downscale,binarize": ("gray", "downscale", "binarize"),
+    "downscale,binarize,crop": ("downscale", "binarize", "crop"),
+}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--data",      default="df_polarity.csv")
+    ap.add_argument("--images",    type=int, default=20)
+    ap.add_argument("--max-width", type=int, default=None, help="override DETECTOR_OCR_MAX_WIDTH")
+    args = ap.parse_args(argv)
+
+    if args.max_width:
+        from detector import config
+        config.OCR_MAX_WIDTH = args.max_width
+
+    import pandas as pd
+    fixtures = fixture_set(pd.read_csv(args.data)["clean_text"].tolist(), args.images)
+
+    print(f"{len(fixtures)} screenshots")
+    print(f"{'preset':<26}{'mean ms':>10}{'p95 ms':>10}{'CER':>8}")
+    for name, steps in PRESETS.items():
+        times, errors = [], []
+        for _, img, truth in fixtures:
+            t0   = time.perf_counter()
+            text = extract_text(img, steps=steps)
+            times.append((time.perf_counter() - t0) * 1000)
+            errors.append(cer(truth, text))
+        print(f"{name:<26}{np.mean(times):>10.0f}{np.percentile(times, 95):>10.0f}{np.mean(errors):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Batch-scoring throughput from 1 to N worker processes.
+
+    python benchmarks/bench_parallel.py --weights lstm_model.npz --max-workers 8
+
+Scores ``df_polarity.csv`` (repeated ``--repeat`` times) through
+``ParallelScorer`` at each worker count and prints rows/s and the speedup
+over a single worker.  Pool start-up (spawn + weight mapping) is excluded.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector.parallel import ParallelScorer  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--data",        default="df_polarity.csv")
+    ap.add_argument("--weights",     default="lstm_model.npz")
+    ap.add_argument("--tokenizer",   default="tokenizer.vocab")
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch-size",  type=int, default=512)
+    ap.add_argument("--repeat",      type=int, default=1)
+    args = ap.parse_args(argv)
+
+    import pandas as pd
+    texts = pd.read_csv(args.data)["clean_text"].fillna("").astype(str).tolist() * args.repeat
+    counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers], args.max_workers})
+
+    print(f"{len(texts)} texts, batch size {args.batch_size}")
+    print(f"{'workers':>8}{'rows/s':>12}{'speedup':>10}")
+    base = None
+    for n in counts:
+        with ParallelScorer(args.weights, args.tokenizer, workers=n) as pool:
+            pool.predict(texts[:n * args.batch_size], args.batch_size)  # warm every worker
+            t0 = time.perf_counter()
+            pool.predict(texts, args.batch_size)
+            rate = len(texts) / (time.perf_counter() - t0)
+        base = base or rate
+        print(f"{n:>8}{rate:>12,.0f}{rate / base:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Notebook-style per-tweet cleaning/labelling versus ``detector.preprocess``.
+
+    python benchmarks/bench_preprocess.py --rows 200000
+
+Builds a synthetic scrape from ``df_polarity.csv`` (tweets with URLs,
+mentions, hashtags, ``RT`` prefixes, emoji and punctuation mixed in), runs
+both implementations, checks the outputs are identical and prints the time
+for each stage.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector.preprocess import (  # noqa: E402
+    clean_texts, clean_tweet, lexicon_label, lexicon_labels,
+)
+
+NOISE = ["https://t.co/x1Ab", "www.example.com", "#COVID19", "#Kenya", "@user_1", "@KenyaNews",
+         "😂", "😭", "👍🏽", "🇰🇪", "❤️", "…", "!!", "?", ",", "'", "a", "I", "&amp;"]
+
+
+def synthetic(texts, rows, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(rows):
+        words = rng.choice(texts).split()
+        for _ in range(rng.randint(0, 6)):
+            words.insert(rng.randint(0, len(words)), rng.choice(NOISE))
+        out.append(("RT " if rng.random() < 0.2 else "") + " ".join(words))
+    return out
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    return fn(*args), time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--csv",  default="df_polarity.csv")
+    ap.add_argument("--rows", type=int, default=100000)
+    args = ap.parse_args(argv)
+
+    base = pd.read_csv(args.csv, keep_default_na=False)["clean_text"].astype(str).tolist()
+    raw  = synthetic(base, args.rows)
+
+    ref_clean, t_ref_clean = timed(lambda: [clean_tweet(t) for t in raw])
+    new_clean, t_new_clean = timed(clean_texts, raw)
+    ref_label, t_ref_label = timed(lambda: [lexicon_label(t) for t in ref_clean])
+    new_label, t_new_label = timed(lexicon_labels, new_clean)
+
+    print(f"{len(raw)} synthetic tweets\n")
+    print(f"{'stage':<10}{'notebook s':>12}{'vectorized s':>14}{'speedup':>9}{'identical':>11}")
+    for name, tr, tn, same in (("clean", t_ref_clean, t_new_clean, ref_clean == new_clean),
+                               ("label", t_ref_label, t_new_label, ref_label == new_label)):
+        print(f"{name:<10}{tr:>12.2f}{tn:>14.2f}{tr / tn:>9.1f}{str(same):>11}")
+
+
+if __name__ == "__main__":
+    main()
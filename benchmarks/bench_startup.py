@@ -0,0 +1,68 @@
+"""Cold-start breakdown of the Streamlit app: time to first paint vs first prediction.
+
+    python benchmarks/bench_startup.py --runs 3
+
+Each run starts a fresh Python process that drives ``streamlit_app.py``
+through Streamlit's ``AppTest``: ``first_paint`` is when the first script
+run finishes (the page is drawn), ``model_ready`` when the background load
+completes, and ``first_prediction`` when an Analyze click returns a result.
+All times are seconds since the child process started, medians over runs.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(timeout):
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=timeout).run()
+    first_paint = time.perf_counter() - t0
+
+    # the engine lives in st.cache_resource, shared with this process
+    from detector.engine import Engine
+    import gc
+    engine = next(o for o in gc.get_objects() if isinstance(o, Engine))
+    engine.wait()
+    model_ready = time.perf_counter() - t0
+
+    at.text_area(key="text_area").input("I feel like nobody cares anymore.").run()
+    at.button(key="analyze_text").click().run()
+    first_prediction = time.perf_counter() - t0
+    if at.exception:
+        raise SystemExit(str(at.exception))
+    print(json.dumps({"first_paint": first_paint, "model_ready": model_ready,
+                      "first_prediction": first_prediction}))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs",    type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=300)
+    ap.add_argument("--child",   action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        os.chdir(ROOT)
+        return child(args.timeout)
+
+    runs = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, __file__, "--child", "--timeout", str(args.timeout)],
+                             capture_output=True, text=True, check=True, cwd=ROOT)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(f"{'stage':<18}{'median s':>10}")
+    for stage in ("first_paint", "model_ready", "first_prediction"):
+        print(f"{stage:<18}{statistics.median(r[stage] for r in runs):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
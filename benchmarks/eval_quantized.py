@@ -0,0 +1,97 @@
+"""Accuracy-versus-speed report for the fp32 / fp16 / int8 weight variants.
+
+    python -m detector.quantize lstm_model.npz --variant fp16
+    python -m detector.quantize lstm_model.npz --variant int8
+    python benchmarks/eval_quantized.py --weights lstm_model.npz
+
+Scores the notebook's held-out split (stratified 80/20, ``random_state=42``
+over ``df_polarity.csv``) with each variant and prints file size, load time,
+batch latency, accuracy / F1 / ROC-AUC and agreement with fp32.  Variants
+whose file is missing are skipped.  ``--corpus`` reads the split from a
+``detector.corpus`` directory instead, using its token ids when they match
+the tokenizer.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector import THRESHOLD, Predictor  # noqa: E402
+from detector.corpus import Corpus  # noqa: E402
+from detector.numpy_backend import NumpyBiLSTM  # noqa: E402
+from detector.linear import notebook_split  # noqa: E402
+from detector.quantize import VARIANTS, variant_path  # noqa: E402
+from detector.vocab import load_tokenizer  # noqa: E402
+
+
+def latency_ms(predictor, x, batch, runs):
+    """Median milliseconds per forward pass of ``batch`` rows."""
+    rows = x[:batch] if len(x) >= batch else np.resize(x, (batch, x.shape[1]))
+    predictor.forward(rows)
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        predictor.forward(rows)
+        samples.append(time.perf_counter() - t0)
+    return float(np.median(samples) * 1000)
+
+
+def main(argv=None):
+    from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--weights",   default="lstm_model.npz")
+    ap.add_argument("--tokenizer", default="tokenizer.vocab")
+    ap.add_argument("--csv",       default="df_polarity.csv")
+    ap.add_argument("--corpus",    help="detector.corpus directory to use instead of --csv")
+    ap.add_argument("--batches",   default="1,32,256", help="batch sizes to time")
+    ap.add_argument("--runs",      type=int, default=20)
+    args = ap.parse_args(argv)
+
+    tokenizer = load_tokenizer(args.tokenizer)
+    tokens    = None
+    if args.corpus:
+        corpus      = Corpus.open(args.corpus)
+        _, test_idx = corpus.split()
+        texts, y    = corpus.texts(test_idx), corpus.labels[test_idx]
+        if corpus.encoded_with(tokenizer):
+            tokens = corpus.tokens[test_idx]
+    else:
+        _, texts, _, y = notebook_split(args.csv)
+    batches = [int(b) for b in args.batches.split(",")]
+
+    print(f"{len(texts)} test rows\n")
+    head = f"{'variant':<8}{'MB':>7}{'load ms':>9}" + "".join(f"{f'b{b} ms':>9}" for b in batches)
+    print(head + f"{'acc':>8}{'f1':>8}{'auc':>8}{'agree':>8}{'max|dp|':>9}")
+
+    reference = None
+    for variant in VARIANTS:
+        path = variant_path(args.weights, variant)
+        if not os.path.exists(path):
+            print(f"{variant:<8}  (missing {path})")
+            continue
+        t0 = time.perf_counter()
+        model = NumpyBiLSTM.load(path)
+        load_ms = (time.perf_counter() - t0) * 1000
+        predictor = Predictor(model, tokenizer, mode="numpy")
+
+        x = predictor.encode(texts) if tokens is None else tokens
+        probs = predictor.forward(x)
+        pred = (probs >= THRESHOLD).astype(int)
+        if reference is None:
+            reference = probs
+        agree = np.mean(pred == (reference >= THRESHOLD))
+        drift = np.abs(probs - reference).max()
+
+        times = "".join(f"{latency_ms(predictor, x, b, args.runs):>9.2f}" for b in batches)
+        print(f"{variant:<8}{os.path.getsize(path) / 1e6:>7.2f}{load_ms:>9.1f}{times}"
+              f"{accuracy_score(y, pred):>8.4f}{f1_score(y, pred):>8.4f}"
+              f"{roc_auc_score(y, probs):>8.4f}{agree:>8.4f}{drift:>9.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Fixed-workload benchmark suite with JSON results and a baseline check.
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --baseline baseline.json --threshold 0.15
+
+Workloads (pick with ``--only``), all on the artifacts ``Predictor.load()``
+selects, so the ``DETECTOR_*`` settings apply:
+
+    latency     ``predict_one`` on single tweets after a warm-up (the work behind
+                ``run_analysis`` without the cache): p50/p95/p99 ms
+    throughput  rows/s of ``predict`` at batch sizes 1–1024 over ``df_polarity.csv``
+    cold_start  a fresh interpreter from spawn to ``Predictor.load().warmup()`` and
+                to its first prediction (``load_model_and_tokenizer`` plus one
+                request), and that process's peak RSS
+    ocr         ``extract_text`` on generated screenshots (``screenshots.py``):
+                ms per image and character error rate
+
+``peak_rss_mb`` is the high-water mark of the suite process itself.  Texts
+and screenshots are drawn with a fixed seed, so runs see the same inputs.
+Latency and throughput keep the best of ``--repeats`` rounds, since
+interference from the rest of the machine only ever makes a round slower.
+
+Every metric is stored with its unit and whether lower or higher is better.
+With ``--baseline`` (an earlier ``-o`` file from the same machine), a metric
+worse than the baseline by more than ``--threshold`` (relative) is flagged
+and the exit status is 1.  Metrics present on only one side are listed but
+never fail the run; skipped workloads (e.g. no tesseract) are recorded with
+the reason.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.screenshots import cer, fixture_set  # noqa: E402
+from detector import Predictor, config  # noqa: E402
+
+WORKLOADS   = ("latency", "throughput", "cold_start", "ocr")
+BATCH_SIZES = (1, 4, 16, 64, 256, 1024)
+
+COLD_START = """
+import json, resource, sys, time
+spawned = float(sys.argv[1])
+from detector import Predictor
+p = Predictor.load().warmup()
+ready = time.time() - spawned
+p.predict_one("I feel like nobody cares anymore")
+first = time.time() - spawned
+try:   # VmHWM belongs to this image; Linux carries ru_maxrss over from the parent across exec
+    rss = next(int(l.split()[1]) for l in open("/proc/self/status") if l.startswith("VmHWM:"))
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"ready": ready, "first": first, "rss": rss}))
+"""
+
+
+def _rss_mb(maxrss):
+    return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)   # bytes on macOS, KiB elsewhere
+
+
+def _metric(value, unit, better="lower"):
+    return {"value": float(value), "unit": unit, "better": better}
+
+
+def sample_texts(path, n, seed):
+    """The first ``n`` of a seeded shuffle, so a smaller ``n`` gives a prefix of the same texts."""
+    import pandas as pd
+
+    texts = pd.read_csv(path)["clean_text"].astype(str).tolist()
+    order = np.random.default_rng(seed).permutation(len(texts))
+    return [texts[i] for i in order[:n]]
+
+
+def bench_latency(predictor, texts, runs, repeats):
+    predictor.predict_one(texts[0])
+    best = None
+    for _ in range(repeats):
+        samples = []
+        for i in range(runs):
+            t0 = time.perf_counter()
+            predictor.predict_one(texts[i % len(texts)])
+            samples.append((time.perf_counter() - t0) * 1000)
+        pct  = np.percentile(samples, (50, 95, 99))
+        best = pct if best is None else np.minimum(best, pct)
+    return {f"latency_p{q}_ms": _metric(v, "ms") for q, v in zip((50, 95, 99), best)}
+
+
+def bench_throughput(predictor, texts, sizes, repeats):
+    out = {}
+    for size in sizes:
+        rows = texts[:max(size, len(texts) // size * size)]
+        predictor.predict(rows[:size])   # warm this shape (traced graphs are per batch size)
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            for start in range(0, len(rows), size):
+                predictor.predict(rows[start:start + size])
+            times.append(time.perf_counter() - t0)
+        out[f"throughput_b{size}_rows_s"] = _metric(len(rows) / min(times), "rows/s", "higher")
+    return out
+
+
+def bench_cold_start(runs):
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", COLD_START, repr(time.time())],
+                              capture_output=True, text=True, cwd=ROOT,
+                              env=dict(os.environ, PYTHONPATH=ROOT))
+        if proc.returncode:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return {"cold_start_ready_s":      _metric(statistics.median(r["ready"] for r in results), "s"),
+            "cold_start_first_pred_s": _metric(statistics.median(r["first"] for r in results), "s"),
+            "cold_start_peak_rss_mb":  _metric(statistics.median(_rss_mb(r["rss"]) for r in results), "MB")}
+
+
+def bench_ocr(texts, images, seed):
+    from detector.ocr import extract_text
+
+    fixtures = fixture_set(texts, images, seed)
+    extract_text(fixtures[0][1])
+    times, errors = [], []
+    for _, img, truth in fixtures:
+        t0   = time.perf_counter()
+        text = extract_text(img)
+        times.append((time.perf_counter() - t0) * 1000)
+        errors.append(cer(truth, text))
+    return {"ocr_mean_ms": _metric(np.mean(times), "ms"),
+            "ocr_p95_ms":  _metric(np.percentile(times, 95), "ms"),
+            "ocr_cer":     _metric(np.mean(errors), "ratio")}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=ROOT).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count(),
+            "config": {"backend": config.BACKEND, "inference_mode": config.INFERENCE_MODE,
+                       "model_variant": config.MODEL_VARIANT, "fast_model_path": config.FAST_MODEL_PATH}}
+
+
+def run(workloads, data="df_polarity.csv", seed=0, runs=200, rows=2048, sizes=BATCH_SIZES, repeats=3,
+        cold_runs=3, images=10, log=sys.stderr):
+    """Run the selected workloads; returns the results document."""
+    texts     = sample_texts(data, max(rows, runs), seed)
+    metrics   = {}
+    skipped   = {}
+    predictor = None
+    for name in workloads:
+        print(f"running {name}…", file=log, flush=True)
+        t0 = time.perf_counter()
+        if name in ("latency", "throughput") and predictor is None:
+            predictor = Predictor.load().warmup()
+        if name == "latency":
+            metrics.update(bench_latency(predictor, texts, runs, repeats))
+        elif name == "throughput":
+            metrics.update(bench_throughput(predictor, texts[:rows], sizes, repeats))
+        elif name == "cold_start":
+            metrics.update(bench_cold_start(cold_runs))
+        elif name == "ocr":
+            if shutil.which("tesseract") is None:
+                skipped[name] = "tesseract not found"
+                continue
+            metrics.update(bench_ocr(texts, images, seed))
+        print(f"  {time.perf_counter() - t0:.1f}s", file=log, flush=True)
+    metrics["peak_rss_mb"] = _metric(_rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss), "MB")
+    return {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(),
+            "params": {"workloads": list(workloads), "data": data, "seed": seed, "runs": runs, "rows": rows,
+                       "batch_sizes": list(sizes), "repeats": repeats, "cold_runs": cold_runs,
+                       "images": images},
+            "metrics": metrics, "skipped": skipped}
+
+
+def compare(current, baseline, threshold):
+    """``[(name, baseline, current, change, regressed)]``; ``change`` > 0 means worse."""
+    rows = []
+    cur, base = current["metrics"], baseline["metrics"]
+    for name in sorted(set(cur) | set(base)):
+        if name not in cur or name not in base:
+            rows.append((name, base.get(name, {}).get("value"), cur.get(name, {}).get("value"), None, False))
+            continue
+        b, c   = base[name]["value"], cur[name]["value"]
+        change = (c - b) / b if b else 0.0
+        if cur[name]["better"] == "higher":
+            change = -change
+        rows.append((name, b, c, change, change > threshold))
+    return rows
+
+
+def _fmt(v):
+    return "—" if v is None else f"{v:.4g}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("-o", "--output",   help="write the results JSON here")
+    ap.add_argument("--baseline",       help="results JSON to compare against")
+    ap.add_argument("--threshold",      type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+    ap.add_argument("--only",           default=",".join(WORKLOADS), help="comma-separated workloads")
+    ap.add_argument("--data",           default="df_polarity.csv")
+    ap.add_argument("--seed",           type=int, default=0)
+    ap.add_argument("--runs",           type=int, default=200, help="single-text latency samples per round")
+    ap.add_argument("--rows",           type=int, default=2048, help="texts per throughput pass")
+    ap.add_argument("--batch-sizes",    default=",".join(map(str, BATCH_SIZES)))
+    ap.add_argument("--repeats",        type=int, default=3, help="latency rounds and throughput passes; the best counts")
+    ap.add_argument("--cold-runs",      type=int, default=3, help="fresh processes for cold start (median)")
+    ap.add_argument("--images",         type=int, default=10, help="generated OCR screenshots")
+    args = ap.parse_args(argv)
+
+    workloads = [w for w in args.only.split(",") if w]
+    unknown   = set(workloads) - set(WORKLOADS)
+    if unknown:
+        ap.error(f"unknown workloads: {', '.join(sorted(unknown))} (choose from {', '.join(WORKLOADS)})")
+    sizes = [int(s) for s in args.batch_sizes.split(",")]
+    if max(sizes) > args.rows:
+        ap.error("--rows must be at least the largest batch size")
+
+    result = run(workloads, args.data, args.seed, args.runs, args.rows, sizes, args.repeats,
+                 args.cold_runs, args.images)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    for name, reason in result["skipped"].items():
+        print(f"skipped {name}: {reason}")
+    if not args.baseline:
+        for name, m in result["metrics"].items():
+            print(f"{name:<28}{m['value']:>12.4g} {m['unit']}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(result, baseline, args.threshold)
+    print(f"{'metric':<28}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, b, c, change, bad in rows:
+        delta = "" if change is None else f"{change:+.1%}"
+        print(f"{name:<28}{_fmt(b):>12}{_fmt(c):>12}{delta:>9}{'  REGRESSION' if bad else ''}")
+    failed = [r[0] for r in rows if r[4]]
+    if failed:
+        print(f"{len(failed)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Synthetic tweet screenshots with known text, for OCR benchmarks.
+
+Renders tweets from ``df_polarity.csv`` the way a phone would show them:
+1170 px wide (3× scale), a header with avatar and handle, wrapped body text,
+light and dark themes.  Deterministic for a given seed.
+"""
+import random
+import textwrap
+
+THEMES = {
+    "light": {"bg": (255, 255, 255), "fg": (15, 20, 25),    "muted": (83, 100, 113)},
+    "dark":  {"bg": (0, 0, 0),       "fg": (231, 233, 234), "muted": (113, 118, 123)},
+}
+
+
+def render(text, theme="light", width=1170, font_size=46, dpi=144):
+    """One screenshot of ``text`` as a PIL image (tagged with ``dpi``)."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    colors = THEMES[theme]
+    font   = ImageFont.load_default(size=font_size)
+    small  = ImageFont.load_default(size=int(font_size * 0.8))
+    lines  = textwrap.wrap(text, width=max(10, int(width / (font_size * 0.55))))
+    line_h = int(font_size * 1.35)
+    height = 260 + line_h * len(lines) + 200
+
+    img  = Image.new("RGB", (width, height), colors["bg"])
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((48, 60, 168, 180), fill=(29, 155, 240))
+    draw.text((200, 70),  "Some User", font=small, fill=colors["fg"])
+    draw.text((200, 125), "@someuser · 2h", font=small, fill=colors["muted"])
+    y = 240
+    for line in lines:
+        draw.text((48, y), line, font=font, fill=colors["fg"])
+        y += line_h
+    draw.line((48, y + 60, width - 48, y + 60), fill=colors["muted"], width=2)
+    img.info["dpi"] = (dpi, dpi)
+    return img
+
+
+def fixture_set(texts, n=20, seed=0):
+    """``n`` (name, image, ground_truth) triples drawn from ``texts``, alternating themes."""
+    rng   = random.Random(seed)
+    texts = [t for t in texts if isinstance(t, str) and 40 <= len(t) <= 280]
+    out   = []
+    for i, text in enumerate(rng.sample(texts, min(n, len(texts)))):
+        theme = "light" if i % 2 == 0 else "dark"
+        out.append((f"tweet_{i:03d}_{theme}.png", render(text, theme), text))
+    return out
+
+
+def cer(reference, hypothesis):
+    """Character error rate: Levenshtein distance / reference length, whitespace-normalised."""
+    ref = " ".join(reference.split())
+    hyp = " ".join((hypothesis or "").split())
+    if not ref:
+        return float(bool(hyp))
+    prev = list(range(len(hyp) + 1))
+    for i, rc in enumerate(ref, 1):
+        cur = [i]
+        for j, hc in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (rc != hc)))
+        prev = cur
+    return prev[-1] / len(ref)
@@ -0,0 +1,10 @@
+"""Inference engine behind the Suicidal Tweet Detector.
+
+Everything here is importable without Streamlit so the web app, batch jobs
+and services can share a single warm model.
+"""
+from detector.batcher import MicroBatcher
+from detector.cache import LRUCache
+from detector.predictor import MAXLEN, THRESHOLD, Predictor, classify
+
+__all__ = ["MAXLEN", "THRESHOLD", "LRUCache", "MicroBatcher", "Predictor", "classify"]
@@ -0,0 +1,237 @@
+"""Append-only prediction log shared by every session and worker process.
+
+Each prediction is a row in a SQLite database in WAL mode, so any number of
+readers (other sessions, other Streamlit workers, the CLI) run alongside the
+single writer.  ``record`` only appends to an in-memory list; a background
+thread flushes it in one transaction every ``flush_ms`` (or once
+``flush_size`` rows are waiting), so the request path never touches disk.
+
+The same transaction folds the rows into ``buckets``: per time bucket
+(``bucket_s`` wide) totals, positives and probability sums.  Dashboard reads
+sum a few thousand bucket rows instead of scanning millions of predictions,
+and the latest entries come straight off the primary key.
+
+A batch being written stays visible in ``_inflight`` until its transaction
+commits, and the commit and the hand-over happen under ``_visible``, which
+readers also hold; so every row is counted exactly once, whether it is still
+queued, being written or already in the database.
+
+    python -m detector.analytics analytics.db --days 7
+"""
+import argparse
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from detector import config
+from detector.predictor import THRESHOLD
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id      INTEGER PRIMARY KEY,
+    ts      REAL    NOT NULL,
+    prob    REAL    NOT NULL,
+    snippet TEXT    NOT NULL,
+    source  TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket   INTEGER PRIMARY KEY,   -- bucket start, unix seconds
+    total    INTEGER NOT NULL,
+    positive INTEGER NOT NULL,
+    prob_sum REAL    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+UPSERT = """
+INSERT INTO buckets (bucket, total, positive, prob_sum) VALUES (?, ?, ?, ?)
+ON CONFLICT(bucket) DO UPDATE SET
+    total    = total    + excluded.total,
+    positive = positive + excluded.positive,
+    prob_sum = prob_sum + excluded.prob_sum
+"""
+
+
+def snippet(text, width=38):
+    """The short preview kept per prediction (the dashboard's "Recent" list)."""
+    return text[:width] + "…" if len(text) > width else text
+
+
+class AnalyticsStore:
+    """Batched, background-written SQLite log with time-bucketed pre-aggregates."""
+
+    def __init__(self, path=None, bucket_s=None, flush_ms=None, flush_size=None):
+        self.path       = path or config.ANALYTICS_PATH
+        self.flush_ms   = flush_ms   if flush_ms   is not None else config.ANALYTICS_FLUSH_MS
+        self.flush_size = flush_size or config.ANALYTICS_FLUSH_SIZE
+        self._local     = threading.local()
+        self._pending   = []
+        self._inflight  = []                   # the batch being written, until it commits
+        self._cond      = threading.Condition()
+        self._visible   = threading.Lock()     # readers vs. the commit that empties _inflight
+        self._flushing  = threading.Lock()     # one batch in flight at a time
+        self._closed    = False
+
+        db = self._connect()
+        db.executescript(SCHEMA)
+        db.execute("INSERT OR IGNORE INTO meta VALUES ('bucket_s', ?)", (str(bucket_s or config.ANALYTICS_BUCKET_S),))
+        db.commit()
+        # the width a database was created with wins, so its buckets stay consistent
+        self.bucket_s = int(db.execute("SELECT value FROM meta WHERE key = 'bucket_s'").fetchone()[0])
+        db.close()
+
+        self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)   # don't drop the last flush interval on shutdown
+
+    # ── Public API ───────────────────────────────────────────────────────────
+    def record(self, prob, text, source="text", ts=None):
+        """Queue one prediction; it reaches the database on the next flush."""
+        if self._closed:
+            raise RuntimeError("AnalyticsStore is closed")
+        row = (time.time() if ts is None else ts, float(prob), snippet(text), source)
+        with self._cond:
+            self._pending.append(row)
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify()
+
+    def flush(self):
+        """Write everything queued so far (also done by the background thread)."""
+        with self._flushing:
+            with self._cond:
+                rows, self._pending = self._pending, []
+                self._inflight = rows
+            if not rows:
+                return
+            try:
+                self._write(rows)
+            except sqlite3.Error:
+                with self._cond:
+                    self._pending[:0] = rows
+                    self._inflight = []
+                raise
+
+    def close(self):
+        """Flush and stop the writer thread."""
+        if self._closed:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+    def summary(self, since=None):
+        """``{'total', 'positive', 'negative', 'mean_prob'}`` over all sessions, queued rows included.
+
+        ``since`` (unix seconds) is rounded down to its bucket.
+        """
+        where, args = ("WHERE bucket >= ?", (self._bucket(since),)) if since else ("", ())
+        with self._visible:
+            total, positive, prob_sum = self._db().execute(
+                f"SELECT COALESCE(SUM(total), 0), COALESCE(SUM(positive), 0), COALESCE(SUM(prob_sum), 0)"
+                f" FROM buckets {where}", args).fetchone()
+            with self._cond:
+                pending = [r for r in self._inflight + self._pending
+                           if not since or r[0] >= self._bucket(since)]
+        total    += len(pending)
+        positive += sum(r[1] >= THRESHOLD for r in pending)
+        prob_sum += sum(r[1] for r in pending)
+        return {'total': total, 'positive': positive, 'negative': total - positive,
+                'mean_prob': prob_sum / total if total else 0.0}
+
+    def recent(self, n=5):
+        """The newest ``n`` predictions, newest first, as the dashboard's history dicts."""
+        with self._visible:
+            with self._cond:
+                rows = (self._inflight + self._pending)[-n:][::-1]
+            if len(rows) < n:
+                rows += self._db().execute("SELECT ts, prob, snippet, source FROM predictions "
+                                           "ORDER BY id DESC LIMIT ?", (n - len(rows),)).fetchall()
+        return [{'ts':   datetime.fromtimestamp(ts).strftime("%H:%M"),
+                 'cls':  "Positive" if prob >= THRESHOLD else "Negative",
+                 'prob': prob,
+                 'txt':  txt} for ts, prob, txt, _ in rows]
+
+    def timeline(self, since=None):
+        """``[(bucket_start, total, positive)]`` in time order, from the pre-aggregates."""
+        where, args = ("WHERE bucket >= ?", (self._bucket(since),)) if since else ("", ())
+        return self._db().execute(f"SELECT bucket, total, positive FROM buckets {where} ORDER BY bucket",
+                                  args).fetchall()
+
+    # ── Internals ────────────────────────────────────────────────────────────
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")   # durable at checkpoints; fine for analytics
+        return db
+
+    def _db(self):
+        """One read connection per thread (sqlite3 connections are not shared across threads)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self._connect()
+        return db
+
+    def _bucket(self, ts):
+        return int(ts // self.bucket_s * self.bucket_s)
+
+    def _write(self, rows):
+        agg = {}
+        for ts, prob, _, _ in rows:
+            b = agg.setdefault(self._bucket(ts), [0, 0, 0.0])
+            b[0] += 1
+            b[1] += prob >= THRESHOLD
+            b[2] += prob
+        db = self._db()
+        try:   # one transaction: the log and its aggregates never disagree
+            db.executemany("INSERT INTO predictions (ts, prob, snippet, source) VALUES (?, ?, ?, ?)", rows)
+            db.executemany(UPSERT, [(k, *v) for k, v in agg.items()])
+            with self._visible:   # readers see the batch in _inflight or in the database, never both
+                db.commit()
+                with self._cond:
+                    self._inflight = []
+        except sqlite3.Error:
+            db.rollback()
+            raise
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._pending) < self.flush_size:
+                    self._cond.wait(self.flush_ms / 1000)
+                closed = self._closed
+            if closed:
+                return
+            try:
+                self.flush()
+            except sqlite3.Error as e:   # keep serving; the rows are retried on the next flush
+                log.warning("analytics flush failed, will retry: %s", e)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarise the shared analytics log.")
+    ap.add_argument("path", nargs="?", default=config.ANALYTICS_PATH)
+    ap.add_argument("--days", type=float, help="only the last N days")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        ap.error(f"{args.path} does not exist")
+    store = AnalyticsStore(args.path)
+    since = time.time() - args.days * 86400 if args.days else None
+    s = store.summary(since)
+    print(f"{s['total']} predictions: {s['positive']} positive, {s['negative']} negative, "
+          f"mean probability {s['mean_prob']:.3f}")
+    for bucket, total, positive in store.timeline(since):
+        print(f"{datetime.fromtimestamp(bucket):%Y-%m-%d %H:%M}  {total:>8}  {positive / total:>6.1%} positive")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Coalesce concurrent single-text requests into batched forward passes.
+
+Every Streamlit session calling ``model.predict`` on a 1×100 array pays the
+full Keras per-call overhead.  ``MicroBatcher`` runs one background thread
+that gathers encoded rows from all callers for at most ``max_wait_ms`` (or
+until ``max_size`` rows are queued), runs a single forward pass and hands
+each caller its own probability through a ``Future``.
+
+It wraps ``Predictor.forward`` rather than ``Predictor.predict`` on purpose:
+callers (the app and the service) first run ``Predictor.screen`` so the fast
+tier answers confident texts without queueing, then encode and consult the
+prediction cache, which is keyed on the encoded row.  Only the rows that
+reach the LSTM are submitted here.  Length bucketing stays out because it is
+confined to offline scoring; served rows are always full ``maxlen`` width.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from detector import config
+from detector.metrics import observe
+
+
+class MicroBatcher:
+    """Shared background batcher in front of a ``forward(x) -> probs`` callable."""
+
+    def __init__(self, forward, max_size=None, max_wait_ms=None):
+        self.forward     = forward
+        self.max_size    = max_size    or config.BATCH_MAX_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else config.BATCH_MAX_WAIT_MS
+
+        self._queue   = queue.Queue()
+        self._lock    = threading.Lock()
+        self._stats   = {'batches': 0, 'items': 0, 'max_batch': 0, 'wait_ms_total': 0.0, 'wait_ms_max': 0.0}
+        self._sizes   = {}
+        self._closed  = False
+        self._thread  = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    # ── Public API ───────────────────────────────────────────────────────────
+    def submit(self, row):
+        """Queue one encoded row; the returned Future resolves to its probability."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        fut = Future()
+        self._queue.put((np.asarray(row), fut, time.perf_counter()))
+        return fut
+
+    def predict(self, row, timeout=None):
+        """Blocking convenience wrapper around ``submit``."""
+        return self.submit(row).result(timeout)
+
+    def close(self):
+        """Stop the worker once the queued requests have been served."""
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """Batch-size and wait-window metrics since start-up."""
+        with self._lock:
+            s = dict(self._stats)
+            sizes = dict(sorted(self._sizes.items()))
+        s['mean_batch']   = s['items'] / s['batches'] if s['batches'] else 0.0
+        s['mean_wait_ms'] = s['wait_ms_total'] / s['items'] if s['items'] else 0.0
+        s['batch_sizes']  = sizes
+        s['max_size']     = self.max_size
+        s['max_wait_ms']  = self.max_wait_ms
+        s['queued']       = self._queue.qsize()
+        return s
+
+    # ── Worker ───────────────────────────────────────────────────────────────
+    def _collect(self):
+        """Block for the first request, then gather more until size or deadline."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch    = [first]
+        deadline = first[2] + self.max_wait_ms / 1000
+        while len(batch) < self.max_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # re-post so the loop exits after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            try:
+                probs = self.forward(np.stack([row for row, _, _ in batch]))
+            except Exception as e:
+                for _, fut, _ in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut, _), p in zip(batch, probs):
+                fut.set_result(float(p))
+            self._record(batch, start)
+
+    def _record(self, batch, start):
+        waits = [(start - t) * 1000 for _, _, t in batch]
+        n = len(batch)
+        for w in waits:
+            observe("queue", w / 1000)
+        with self._lock:
+            s = self._stats
+            s['batches']       += 1
+            s['items']         += n
+            s['max_batch']      = max(s['max_batch'], n)
+            s['wait_ms_total'] += sum(waits)
+            s['wait_ms_max']    = max(s['wait_ms_max'], max(waits))
+            self._sizes[n]      = self._sizes.get(n, 0) + 1
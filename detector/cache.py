@@ -0,0 +1,165 @@
+"""Process-wide caches for model predictions and OCR results.
+
+Prediction keys are the encoded, padded token-id row, so texts that differ
+only in case or punctuation (or in words the model maps to the same ids)
+share one entry — exactly the inputs the model cannot tell apart anyway.
+OCR keys are a hash of the uploaded bytes, with an optional on-disk tier so
+repeat uploads skip tesseract across restarts too.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from detector import config
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry time-to-live."""
+
+    def __init__(self, maxsize=None, ttl=None):
+        self.maxsize = maxsize if maxsize is not None else config.CACHE_SIZE
+        self.ttl     = ttl     if ttl     is not None else config.CACHE_TTL_S
+        self._data   = OrderedDict()
+        self._lock   = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl and time.monotonic() - item[1] > self.ttl:
+                del self._data[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._data), 'maxsize': self.maxsize, 'ttl_s': self.ttl,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+def row_key(row):
+    """Cache key for one encoded (maxlen,) token-id row."""
+    return row.tobytes()
+
+
+class DiskCache:
+    """One small UTF-8 file per key in ``path``; least recently used files are evicted."""
+
+    def __init__(self, path, max_entries=None):
+        self.path        = path
+        self.max_entries = max_entries or config.OCR_CACHE_DISK_ENTRIES
+        os.makedirs(path, exist_ok=True)
+        self._lock  = threading.Lock()
+        self._count = sum(1 for n in os.listdir(path) if n.endswith(".txt"))
+        self.hits = self.misses = self.evictions = 0
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.txt")
+
+    def get(self, key, default=None):
+        try:
+            with open(self._file(key), encoding="utf-8") as f:
+                value = f.read()
+            os.utime(self._file(key))  # mtime doubles as the LRU clock
+        except OSError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        tmp = f"{self._file(key)}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(value)
+        existed = os.path.exists(self._file(key))
+        os.replace(tmp, self._file(key))
+        with self._lock:
+            self._count += not existed
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        """Drop the oldest files down to 90% of ``max_entries`` so eviction runs rarely."""
+        files = sorted((e.stat().st_mtime, e.path) for e in os.scandir(self.path) if e.name.endswith(".txt"))
+        excess = len(files) - int(self.max_entries * 0.9)
+        for _, path in files[:max(excess, 0)]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+        self._count = len(files) - max(excess, 0)
+
+    def stats(self):
+        return {'size': self._count, 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional ``DiskCache``; disk hits are promoted."""
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk   = disk
+        self.hits = self.misses = 0
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory': self.memory.stats(), 'disk': self.disk.stats() if self.disk is not None else None}
+
+
+def ocr_cache():
+    """OCR text cache built from ``DETECTOR_OCR_CACHE_*`` settings."""
+    disk = DiskCache(config.OCR_CACHE_DIR) if config.OCR_CACHE_DIR else None
+    return TieredCache(LRUCache(config.OCR_CACHE_SIZE, ttl=0), disk)
+
+
+def content_key(data, *salt):
+    """SHA-256 of raw bytes plus anything that changes the result (e.g. OCR settings)."""
+    h = hashlib.sha256(data)
+    for part in salt:
+        h.update(b"\0" + str(part).encode())
+    return h.hexdigest()
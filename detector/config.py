@@ -0,0 +1,77 @@
+"""Runtime settings, overridable through ``DETECTOR_*`` environment variables."""
+import os
+
+
+def _env(name, default, cast=str):
+    value = os.environ.get(f"DETECTOR_{name}")
+    return default if value is None or value == "" else cast(value)
+
+
+# ─── Artifacts ─────────────────────────────────────────────────────────────────
+MODEL_PATH     = _env("MODEL_PATH",     "lstm_model.h5")
+WEIGHTS_PATH   = _env("WEIGHTS_PATH",   "lstm_model.npz")  # exported by detector.numpy_backend
+TOKENIZER_PATH = _env("TOKENIZER_PATH", "tokenizer.vocab")  # or the pickled Keras tokenizer.pkl
+
+# ─── Inference ─────────────────────────────────────────────────────────────────
+BACKEND        = _env("BACKEND", "auto")          # "auto" (NumPy when WEIGHTS_PATH exists), "keras", "numpy"
+INFERENCE_MODE = _env("INFERENCE_MODE", "graph")  # Keras only: "graph" (traced tf.function) or "predict"
+MODEL_VARIANT  = _env("MODEL_VARIANT", "fp32")     # "fp32", "fp16" or "int8" NumPy weights (detector.quantize)
+
+# ─── Cascade ───────────────────────────────────────────────────────────────────
+FAST_MODEL_PATH = _env("FAST_MODEL_PATH", "")        # linear_model.npz from detector.linear; empty disables
+CASCADE_LOW     = _env("CASCADE_LOW",  0.1, float)  # fast-tier prob <= LOW  → Negative without the LSTM
+CASCADE_HIGH    = _env("CASCADE_HIGH", 0.9, float)  # fast-tier prob >= HIGH → Positive without the LSTM
+
+# ─── Micro-batching ────────────────────────────────────────────────────────────
+BATCH_MAX_SIZE    = _env("BATCH_MAX_SIZE",    32,  int)    # rows per forward pass
+BATCH_MAX_WAIT_MS = _env("BATCH_MAX_WAIT_MS", 5.0, float)  # how long the first request may wait
+
+# ─── Prediction cache ──────────────────────────────────────────────────────────
+CACHE_SIZE  = _env("CACHE_SIZE",  4096, int)     # entries; 0 disables caching
+CACHE_TTL_S = _env("CACHE_TTL_S", 3600.0, float)  # seconds; 0 keeps entries until evicted
+
+# ─── HTTP service ──────────────────────────────────────────────────────────────
+SERVICE_HOST        = _env("SERVICE_HOST",        "0.0.0.0")
+SERVICE_PORT        = _env("SERVICE_PORT",        8080, int)
+SERVICE_CONCURRENCY = _env("SERVICE_CONCURRENCY", 4,    int)  # requests running in the executor at once
+SERVICE_MAX_QUEUE   = _env("SERVICE_MAX_QUEUE",   64,   int)  # admitted requests before answering 429
+SERVICE_MAX_BATCH   = _env("SERVICE_MAX_BATCH",   1024, int)  # texts per /predict/batch call
+
+# ─── OCR ───────────────────────────────────────────────────────────────────────
+OCR_TESSERACT_CONFIG   = _env("OCR_TESSERACT_CONFIG", "--psm 6")
+OCR_WORKERS            = _env("OCR_WORKERS", min(4, os.cpu_count() or 1), int)  # tesseract subprocesses at once
+OCR_PREPROCESS         = _env("OCR_PREPROCESS", "none")            # any of gray, downscale, binarize, crop; or none
+OCR_MAX_WIDTH          = _env("OCR_MAX_WIDTH",  1280, int)          # px, for the downscale step
+OCR_TARGET_DPI         = _env("OCR_TARGET_DPI", 150,  int)          # files tagged with a higher DPI are shrunk to it
+OCR_CACHE_SIZE         = _env("OCR_CACHE_SIZE",         256,   int)  # in-memory entries; 0 disables
+OCR_CACHE_DIR          = _env("OCR_CACHE_DIR",          "")         # on-disk tier; empty disables
+OCR_CACHE_DISK_ENTRIES = _env("OCR_CACHE_DISK_ENTRIES", 10000, int)
+
+# ─── Analytics ─────────────────────────────────────────────────────────────────
+ANALYTICS_PATH       = _env("ANALYTICS_PATH",       "analytics.db")  # SQLite (WAL) log shared by all sessions
+ANALYTICS_BUCKET_S   = _env("ANALYTICS_BUCKET_S",   3600, int)       # pre-aggregate width, fixed per database
+ANALYTICS_FLUSH_MS   = _env("ANALYTICS_FLUSH_MS",   1000.0, float)   # background write interval
+ANALYTICS_FLUSH_SIZE = _env("ANALYTICS_FLUSH_SIZE", 512, int)        # or sooner, once this many rows wait
+
+# ─── Metrics ───────────────────────────────────────────────────────────────────
+METRICS_HOST = _env("METRICS_HOST", "0.0.0.0")
+METRICS_PORT = _env("METRICS_PORT", 0, int)   # app's /metrics + /metrics.json listener; 0 disables
+
+# ─── Streaming ─────────────────────────────────────────────────────────────────
+STREAM_WINDOW_S       = _env("STREAM_WINDOW_S",       3600,  int)    # risk window length
+STREAM_STEP_S         = _env("STREAM_STEP_S",         300,   int)    # how far the window slides per report
+STREAM_RATE_ALERT     = _env("STREAM_RATE_ALERT",     0.5,   float)  # negative rate that raises an alert
+STREAM_MIN_COUNT      = _env("STREAM_MIN_COUNT",      20,    int)    # texts a window needs before rate alerts
+STREAM_TREND_WINDOWS  = _env("STREAM_TREND_WINDOWS",  12,    int)    # whole windows in the Mann-Kendall test
+STREAM_TREND_ALPHA    = _env("STREAM_TREND_ALPHA",    0.05,  float)
+STREAM_BATCH_SIZE     = _env("STREAM_BATCH_SIZE",     512,   int)
+STREAM_MAX_WAIT_MS    = _env("STREAM_MAX_WAIT_MS",    50.0,  float)
+STREAM_MAX_QUEUE      = _env("STREAM_MAX_QUEUE",      10000, int)    # queued lines before the reader blocks
+
+# ─── Topic tracking ────────────────────────────────────────────────────────────
+TOPICS_PATH      = _env("TOPICS_PATH",      "topics")             # state directory for detector.topics
+TOPICS_NUM       = _env("TOPICS_NUM",       10,      int)         # as the notebook's LdaModel
+TOPICS_ID_RANGE  = _env("TOPICS_ID_RANGE",  1 << 17, int)         # hashed vocabulary size, fixed per state
+TOPICS_CHUNKSIZE = _env("TOPICS_CHUNKSIZE", 2000,    int)         # documents per online update
+TOPICS_ETA       = _env("TOPICS_ETA",       0.01,    float)       # topic-word prior per hashed id
+TOPICS_WORKERS   = _env("TOPICS_WORKERS",   max(1, (os.cpu_count() or 1) - 1), int)  # >1 uses LdaMulticore
@@ -0,0 +1,239 @@
+"""Memory-mapped columnar copy of a ``df_polarity``-style CSV.
+
+    python -m detector.corpus df_polarity.csv df_polarity.corpus --tokenizer tokenizer.vocab
+    python -m detector.score df_polarity.corpus -o scored.jsonl
+    python -m detector.train df_polarity.corpus
+
+Every consumer of ``df_polarity.csv`` re-parses the whole CSV and re-tokenizes
+``clean_text``.  The conversion does that once, a chunk at a time, and writes a
+directory of flat columns:
+
+    text.bin     the texts as concatenated UTF-8
+    offsets.npy  int64, rows + 1: row i is ``text.bin[offsets[i]:offsets[i + 1]]``
+    labels.npy   int64 labels (when the CSV has a label column)
+    tokens.npy   int32 (rows, maxlen) left-padded ids from the given tokenizer
+    meta.json    row count, column names, maxlen and the tokenizer's fingerprint
+
+``Corpus.open`` memory-maps the arrays, so opening costs the same for a
+thousand rows or ten million and pages are only read when a slice is used.
+Texts are stored as the notebook reads them (``astype(str)``, so a missing
+text is ``"nan"``), which keeps ``split`` identical to ``notebook_split``.
+The token ids are only valid for the tokenizer they were built with;
+``encoded_with`` compares fingerprints so callers fall back to encoding texts
+when the vocabulary differs.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import time
+
+import numpy as np
+
+from detector.predictor import MAXLEN
+from detector.vocab import Vocabulary, load_tokenizer
+
+FORMAT = "detector-corpus/1"
+HEADER = 128   # bytes reserved for each .npy header, so it can be rewritten with the final shape
+
+
+def fingerprint(tokenizer):
+    """SHA-256 of everything that decides a tokenizer's ids (Keras ``Tokenizer`` or ``Vocabulary``)."""
+    vocab = tokenizer if isinstance(tokenizer, Vocabulary) else Vocabulary.from_tokenizer(tokenizer)
+    h = hashlib.sha256(json.dumps([vocab.num_words, vocab.oov_token, vocab.filters,
+                                   vocab.lower, vocab.split]).encode("utf-8"))
+    h.update("\n".join(vocab.words).encode("utf-8"))
+    return h.hexdigest()
+
+
+def is_corpus(path):
+    return os.path.isfile(os.path.join(path, "meta.json"))
+
+
+class _NpyAppender:
+    """A C-order ``.npy`` file grown one block of rows at a time."""
+
+    def __init__(self, path, dtype, row_shape=()):
+        self.dtype     = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.rows      = 0
+        self.f         = open(path, "wb")
+        self._header()
+
+    def _header(self):
+        header = repr({'descr': self.dtype.str, 'fortran_order': False,
+                       'shape': (self.rows, *self.row_shape)})
+        header = header.ljust(HEADER - 10 - 1) + "\n"   # magic + version + length field, then the dict
+        self.f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+    def append(self, block):
+        block = np.ascontiguousarray(block, dtype=self.dtype)
+        self.f.write(block.tobytes())
+        self.rows += len(block)
+
+    def close(self):
+        self.f.seek(0)
+        self._header()
+        self.f.close()
+
+
+def convert(csv, path, tokenizer=None, column="clean_text", label="label", maxlen=MAXLEN,
+            chunksize=65536, log=sys.stderr):
+    """Write the corpus for ``csv`` (CSV or JSONL) to directory ``path``; returns the opened ``Corpus``.
+
+    ``tokenizer`` is a path or a loaded tokenizer; without one only texts and
+    labels are stored.  The directory is replaced only once it is complete.
+    A missing label raises ``ValueError`` rather than being cast to an integer.
+    """
+    from detector.score import read_chunks
+
+    if isinstance(tokenizer, str):
+        tokenizer = load_tokenizer(tokenizer)
+    if tokenizer is not None and not hasattr(tokenizer, "encode"):
+        tokenizer = Vocabulary.from_tokenizer(tokenizer)
+
+    tmp, old = path.rstrip("/") + ".tmp", path.rstrip("/") + ".old"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    started = time.perf_counter()
+    offsets = _NpyAppender(os.path.join(tmp, "offsets.npy"), np.int64)
+    tokens  = _NpyAppender(os.path.join(tmp, "tokens.npy"), np.int32, (maxlen,)) if tokenizer else None
+    labels  = None
+    offsets.append([0])
+    end    = 0
+    digest = hashlib.sha256()
+    with open(os.path.join(tmp, "text.bin"), "wb") as text:
+        for i, chunk in enumerate(read_chunks(csv, chunksize)):
+            if column not in chunk.columns:
+                raise KeyError(f"column {column!r} not in input (have: {', '.join(map(str, chunk.columns))})")
+            texts   = chunk[column].astype(str).tolist()
+            encoded = [t.encode("utf-8") for t in texts]
+            text.write(b"".join(encoded))
+            digest.update(b"".join(e + b"\n" for e in encoded))
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            offsets.append(end + np.cumsum(lengths))
+            end += int(lengths.sum())
+            if i == 0 and label and label in chunk.columns:
+                labels = _NpyAppender(os.path.join(tmp, "labels.npy"), np.int64)
+            if labels is not None:
+                missing = chunk[label].isna().to_numpy()
+                if missing.any():
+                    row = offsets.rows - 1 - len(texts) + int(missing.argmax())
+                    raise ValueError(f"{csv}: row {row} has no {label!r}; fix or drop it before converting")
+                labels.append(chunk[label].to_numpy())
+            if tokens is not None:
+                tokens.append(tokenizer.encode(texts, maxlen))
+            print(f"{offsets.rows - 1} rows ({time.perf_counter() - started:.1f}s)", file=log)
+    rows = offsets.rows - 1
+    for column_file in (offsets, labels, tokens):
+        if column_file is not None:
+            column_file.close()
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump({'format': FORMAT, 'rows': rows, 'column': column,
+                   'label': label if labels is not None else None,
+                   'maxlen': maxlen if tokens is not None else None,
+                   'tokenizer': fingerprint(tokenizer) if tokens is not None else None,
+                   'texts_sha256': digest.hexdigest(), 'source': os.path.abspath(csv),
+                   'created': time.time()}, f, indent=2)
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, old)
+    os.rename(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return Corpus.open(path)
+
+
+class Corpus:
+    """Read-only, memory-mapped view of a converted corpus directory."""
+
+    def __init__(self, path, meta, text, offsets, labels=None, tokens=None):
+        self.path    = path
+        self.meta    = meta
+        self.column  = meta['column']
+        self.text    = text      # uint8 memmap of text.bin
+        self.offsets = offsets
+        self.labels  = labels    # None without a label column
+        self.tokens  = tokens    # None when converted without a tokenizer
+
+    @classmethod
+    def open(cls, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} directory")
+
+        def column(name):
+            file = os.path.join(path, name)
+            return np.load(file, mmap_mode="r") if os.path.exists(file) else None
+
+        text_path = os.path.join(path, "text.bin")   # np.memmap refuses empty files
+        text = np.memmap(text_path, np.uint8, "r") if os.path.getsize(text_path) else np.empty(0, np.uint8)
+        return cls(path, meta, text, column("offsets.npy"), column("labels.npy"), column("tokens.npy"))
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def texts(self, start=0, stop=None):
+        """Decoded texts of rows ``start:stop``, or of an index array passed as ``start``."""
+        if not isinstance(start, (int, np.integer)):
+            idx = np.asarray(start)
+            lo, hi = self.offsets[idx], self.offsets[idx + 1]
+        else:
+            bounds = np.asarray(self.offsets[start:(len(self) if stop is None else stop) + 1])
+            lo, hi = bounds[:-1], bounds[1:]
+        buf = memoryview(self.text)
+        return [str(buf[a:b], "utf-8") for a, b in zip(lo.tolist(), hi.tolist())]
+
+    def frame(self, start=0, stop=None):
+        """Rows ``start:stop`` as a DataFrame with the text and label columns."""
+        import pandas as pd
+
+        df = pd.DataFrame({self.column: self.texts(start, stop)})
+        if self.labels is not None:
+            df[self.meta['label']] = self.labels[start:stop]
+        return df
+
+    def encoded_with(self, tokenizer, maxlen=MAXLEN):
+        """Whether ``tokens`` holds exactly what this tokenizer and maxlen would produce."""
+        return (self.tokens is not None and self.meta['maxlen'] == maxlen
+                and self.meta['tokenizer'] == fingerprint(tokenizer))
+
+    def split(self, test_size=0.2, seed=42):
+        """The notebook's stratified split as row indices: ``(train_idx, test_idx)``."""
+        from sklearn.model_selection import train_test_split
+
+        if self.labels is None:
+            raise ValueError(f"{self.path} has no labels")
+        y = np.asarray(self.labels)
+        return train_test_split(np.arange(len(self)), test_size=test_size, stratify=y, random_state=seed)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert a CSV/JSONL corpus to the memory-mapped format.")
+    ap.add_argument("input",  nargs="?", default="df_polarity.csv")
+    ap.add_argument("output", nargs="?", help="corpus directory (default: <input stem>.corpus)")
+    ap.add_argument("--tokenizer", help="store token ids from this tokenizer (.vocab or .pkl)")
+    ap.add_argument("--column",    default="clean_text")
+    ap.add_argument("--label",     default="label", help="label column, stored when present")
+    ap.add_argument("--maxlen",    type=int, default=MAXLEN)
+    ap.add_argument("--chunksize", type=int, default=65536)
+    ap.add_argument("--info",      action="store_true", help="describe an existing corpus instead")
+    args = ap.parse_args(argv)
+
+    if args.info:
+        corpus = Corpus.open(args.input)
+        print(json.dumps(corpus.meta, indent=2))
+        return
+    output = args.output or os.path.splitext(args.input)[0] + ".corpus"
+    started = time.perf_counter()
+    corpus = convert(args.input, output, args.tokenizer, args.column, args.label, args.maxlen, args.chunksize)
+    size = sum(os.path.getsize(os.path.join(output, n)) for n in os.listdir(output))
+    print(f"wrote {output}: {len(corpus)} rows, {size / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Predictor plus shared batcher, loaded on a background thread.
+
+Lets a UI render immediately and show a "warming up" state while the model
+(and possibly TensorFlow) loads, instead of blocking the first paint.
+"""
+import threading
+import time
+
+from detector.batcher import MicroBatcher
+from detector.predictor import Predictor
+
+
+class Engine:
+    """Starts loading on construction; ``wait()`` blocks until ready or failed.
+
+    ``timings`` holds seconds since construction for the ``ready`` stage and
+    for any stage a caller ``mark``s (the app marks ``first_paint`` and
+    ``first_prediction``).
+    """
+
+    def __init__(self, loader=None):
+        self.t_start   = time.perf_counter()
+        self.timings   = {}
+        self.predictor = None
+        self.batcher   = None
+        self.error     = None
+        self._ready    = threading.Event()
+        self._loader   = loader or (lambda: Predictor.load().warmup())
+        threading.Thread(target=self._load, name="engine-loader", daemon=True).start()
+
+    def _load(self):
+        try:
+            predictor      = self._loader()
+            self.batcher   = MicroBatcher(predictor.forward)
+            self.predictor = predictor
+        except Exception as e:
+            self.error = e
+        finally:
+            self.mark("ready")
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def mark(self, stage):
+        """Record the first time ``stage`` happens; returns True if this call recorded it."""
+        if stage in self.timings:
+            return False
+        self.timings[stage] = time.perf_counter() - self.t_start
+        return True
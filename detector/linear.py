@@ -0,0 +1,149 @@
+"""TF-IDF + logistic regression as a NumPy-only first stage for the LSTM.
+
+    python -m detector.linear df_polarity.csv linear_model.npz --check
+
+Fits the notebook's ``log_model`` pipeline (``TfidfVectorizer(max_features=
+10000)`` + ``LogisticRegression(max_iter=1000)``) on the notebook's training
+split, or exports an already fitted pipeline with ``--pipeline log_model.pkl``.
+The result is an ``.npz`` of terms, idf, coefficients and intercept that
+``LinearModel`` scores without scikit-learn.  ``--check`` compares its
+probabilities with ``predict_proba`` on the held-out split.
+"""
+import argparse
+import re
+from itertools import chain, repeat
+
+import numpy as np
+
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"   # TfidfVectorizer's default
+
+
+def notebook_split(csv, column="clean_text", label="label", test_size=0.2, seed=42):
+    """The notebook's single stratified split: ``(x_train, x_test, y_train, y_test)``."""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(csv)
+    texts = df[column].astype(str).fillna("")   # as the notebook does, so NaN becomes "nan"
+    return [list(p) if i < 2 else p.to_numpy() for i, p in enumerate(
+        train_test_split(texts, df[label], test_size=test_size, stratify=df[label], random_state=seed))]
+
+
+class LinearModel:
+    """``predict_proba(texts)[:, 1]`` of a fitted TF-IDF + LogisticRegression pipeline."""
+
+    def __init__(self, terms, idf, coef, intercept, ngram_range=(1, 1), lowercase=True,
+                 sublinear_tf=False, token_pattern=TOKEN_PATTERN):
+        self.terms        = list(terms)
+        self.idf          = np.asarray(idf, dtype=np.float64)
+        self.coef         = np.asarray(coef, dtype=np.float64)
+        self.intercept    = float(intercept)
+        self.ngram_range  = tuple(int(n) for n in ngram_range)
+        self.lowercase    = bool(lowercase)
+        self.sublinear_tf = bool(sublinear_tf)
+        self.token_re     = re.compile(str(token_pattern))
+        self._lookup      = {t: i for i, t in enumerate(self.terms)}
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Build from a fitted ``Pipeline([("tfidf", ...), ("clf", ...)])``."""
+        tfidf, clf = pipeline.steps[0][1], pipeline.steps[-1][1]
+        if tfidf.norm != "l2" or not tfidf.use_idf or tfidf.analyzer != "word":
+            raise ValueError("only word analyzers with use_idf=True and norm='l2' are supported")
+        terms = np.empty(len(tfidf.vocabulary_), dtype=object)
+        for term, i in tfidf.vocabulary_.items():
+            terms[i] = term
+        return cls(terms, tfidf.idf_, clf.coef_[0], clf.intercept_[0], tfidf.ngram_range,
+                   tfidf.lowercase, tfidf.sublinear_tf, tfidf.token_pattern)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as npz:
+            terms = npz["terms"].tobytes().decode("utf-8").split("\n")
+            return cls(terms, npz["idf"], npz["coef"], npz["intercept"],
+                       npz["ngram_range"], npz["lowercase"], npz["sublinear_tf"], npz["token_pattern"])
+
+    def save(self, path):
+        # newline-joined UTF-8 rather than a fixed-width string array, whose
+        # width would be set by the single longest term
+        terms = np.frombuffer("\n".join(self.terms).encode("utf-8"), dtype=np.uint8)
+        np.savez(path, terms=terms, idf=self.idf, coef=self.coef,
+                 intercept=np.array(self.intercept), ngram_range=np.array(self.ngram_range),
+                 lowercase=np.array(self.lowercase), sublinear_tf=np.array(self.sublinear_tf),
+                 token_pattern=np.array(self.token_re.pattern))
+
+    def _tokens(self, text):
+        words = self.token_re.findall(text.lower() if self.lowercase else text)
+        lo, hi = self.ngram_range
+        if hi == 1:
+            return words
+        grams = list(words) if lo == 1 else []
+        for n in range(max(lo, 2), hi + 1):
+            grams.extend(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+        return grams
+
+    def predict(self, texts):
+        """Probability of the Positive class for each text, as float32."""
+        tokens = [self._tokens(t) for t in texts]
+        n      = len(tokens)
+        lens   = np.fromiter(map(len, tokens), dtype=np.int64, count=n)
+        ids    = np.fromiter(map(self._lookup.get, chain.from_iterable(tokens), repeat(-1)),
+                             dtype=np.int64, count=int(lens.sum()))
+        rows   = np.repeat(np.arange(n), lens)
+        keep   = ids >= 0
+        # term counts per (row, term) pair, then tf-idf, l2 norm and the dot product
+        pairs, tf = np.unique(rows[keep] * len(self.terms) + ids[keep], return_counts=True)
+        r, c   = np.divmod(pairs, len(self.terms))
+        tf     = 1 + np.log(tf) if self.sublinear_tf else tf.astype(np.float64)
+        w      = tf * self.idf[c]
+        norm   = np.sqrt(np.bincount(r, w * w, minlength=n))
+        dot    = np.bincount(r, w * self.coef[c], minlength=n)
+        z      = np.divide(dot, norm, out=np.zeros(n), where=norm > 0) + self.intercept
+        return (1 / (1 + np.exp(-z))).astype(np.float32)
+
+    def predict_one(self, text):
+        return float(self.predict([text])[0])
+
+
+def fit(x_train, y_train):
+    """The notebook's ``log_model`` pipeline, fitted on the given split."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(max_features=10000)),
+        ("clf",   LogisticRegression(max_iter=1000)),
+    ]).fit(x_train, y_train)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export the TF-IDF + logistic regression fast tier.")
+    ap.add_argument("csv", nargs="?", default="df_polarity.csv")
+    ap.add_argument("output", nargs="?", default="linear_model.npz")
+    ap.add_argument("--pipeline", help="fitted sklearn pipeline (joblib/pickle) to export instead of fitting")
+    ap.add_argument("--check", action="store_true", help="compare with sklearn on the held-out split")
+    args = ap.parse_args(argv)
+
+    x_train, x_test, y_train, y_test = notebook_split(args.csv)
+    if args.pipeline:
+        import joblib
+
+        pipeline = joblib.load(args.pipeline)
+    else:
+        pipeline = fit(x_train, y_train)
+    model = LinearModel.from_pipeline(pipeline)
+    model.save(args.output)
+    print(f"wrote {args.output} ({len(model.terms)} terms)")
+
+    if args.check:
+        from sklearn.metrics import roc_auc_score
+
+        ref  = pipeline.predict_proba(x_test)[:, 1]
+        ours = model.predict(x_test)
+        print(f"max |sklearn - numpy| = {np.abs(ref - ours).max():.2e} over {len(x_test)} rows, "
+              f"AUC {roc_auc_score(y_test, ours):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Per-stage latency histograms and counters, exported as Prometheus text or JSON.
+
+Stages are timed with ``time.perf_counter`` (monotonic, high resolution)
+and recorded in one histogram family, ``detector_stage_seconds{stage=...}``:
+
+    ocr       image bytes → text (preprocessing + tesseract)
+    clean     lower-casing and filter-character removal
+    tokenize  splitting and vocabulary lookups
+    pad       building the left-padded id matrix
+    screen    the cascade's linear fast tier
+    queue     time a row waits in the ``MicroBatcher``
+    predict   one model forward pass
+    render    drawing the result and analytics columns in the app
+    startup_* the app's first paint, model ready and first prediction,
+              recorded once per process, in seconds since model load began
+
+``detector_batch_size`` records rows per forward pass, and the hit/miss
+counters of registered caches are read at scrape time.  The HTTP service
+serves ``/metrics`` and ``/metrics.json``; the Streamlit app serves the same
+on ``DETECTOR_METRICS_PORT`` when it is set.
+
+    with metrics.timed("tokenize"):
+        ...
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)          # seconds
+SIZE_BUCKETS    = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(names, values):
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, values)) + "}" if names else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets, labelnames=()):
+        self.name       = name
+        self.help       = help
+        self.buckets    = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._series    = {}   # label values → [per-bucket counts (+Inf last), sum, count, min, max]
+        self._lock      = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0, value, value]
+            s[0][bisect_left(self.buckets, value)] += 1
+            s[1] += value
+            s[2] += 1
+            s[3]  = min(s[3], value)
+            s[4]  = max(s[4], value)
+
+    def quantile(self, q, counts, count, lo, hi):
+        """Estimate a quantile by interpolating inside its bucket, clamped to the observed range."""
+        rank, seen = q * count, 0
+        for i, n in enumerate(counts):
+            if seen + n >= rank and n:
+                a = max(self.buckets[i - 1] if i else lo, lo)
+                b = min(self.buckets[i] if i < len(self.buckets) else hi, hi)
+                return a + (b - a) * (rank - seen) / n
+            seen += n
+        return hi
+
+    def collect(self):
+        with self._lock:
+            return {k: ([*v[0]], *v[1:]) for k, v in sorted(self._series.items())}
+
+    def prometheus(self):
+        lines = []
+        for labels, (counts, total, count, _, _) in self.collect().items():
+            cum = 0
+            for bound, n in zip(self.buckets + ("+Inf",), counts):
+                cum += n
+                le = _labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{le} {cum}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+    def snapshot(self):
+        out = []
+        for labels, (counts, total, count, lo, hi) in self.collect().items():
+            out.append({"labels": dict(zip(self.labelnames, labels)), "count": count, "sum": total,
+                        "mean": total / count, "min": lo, "max": hi,
+                        **{f"p{int(q * 100)}": self.quantile(q, counts, count, lo, hi) for q in (0.5, 0.95, 0.99)}})
+        return out
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name       = name
+        self.help       = help
+        self.labelnames = tuple(labelnames)
+        self._values    = {}
+        self._lock      = threading.Lock()
+
+    def inc(self, *labels, n=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def collect(self):
+        with self._lock:
+            return dict(sorted(self._values.items()))
+
+    def prometheus(self):
+        return [f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in self.collect().items()]
+
+    def snapshot(self):
+        return [{"labels": dict(zip(self.labelnames, k)), "value": v} for k, v in self.collect().items()]
+
+
+class Registry:
+    """Named metrics plus caches whose ``stats()`` are read at scrape time."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.caches  = {}
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, labelnames=()):
+        return self.metrics.setdefault(name, Histogram(name, help, buckets, labelnames))
+
+    def counter(self, name, help, labelnames=()):
+        return self.metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def track_cache(self, name, cache):
+        """Export ``cache.stats()`` hits and misses as ``detector_cache_requests_total``."""
+        self.caches[name] = cache
+
+    def _cache_counter(self):
+        c = Counter("detector_cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"))
+        for name, cache in sorted(self.caches.items()):
+            s = cache.stats()
+            c.inc(name, "hit", n=s["hits"])
+            c.inc(name, "miss", n=s["misses"])
+        return c
+
+    def _all(self):
+        return [*self.metrics.values()] + ([self._cache_counter()] if self.caches else [])
+
+    def prometheus(self):
+        """Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for m in self._all():
+            lines += [f"# HELP {m.name} {m.help}", f"# TYPE {m.name} {m.kind}", *m.prometheus()]
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """JSON-friendly dict: histograms with mean/p50/p95/p99, counters with values."""
+        return {m.name: {"type": m.kind, "help": m.help, "series": m.snapshot()} for m in self._all()}
+
+
+REGISTRY   = Registry()
+STAGES     = REGISTRY.histogram("detector_stage_seconds", "Wall time per pipeline stage.", labelnames=("stage",))
+BATCH_SIZE = REGISTRY.histogram("detector_batch_size", "Rows per model forward pass.", SIZE_BUCKETS)
+
+
+def observe(stage, seconds):
+    STAGES.observe(seconds, stage)
+
+
+@contextmanager
+def timed(stage):
+    """Record the wall time of the ``with`` block under ``stage``."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGES.observe(time.perf_counter() - t0, stage)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body, kind = self.registry.prometheus().encode(), PROMETHEUS_CONTENT_TYPE
+        elif self.path.split("?")[0] == "/metrics.json":
+            body, kind = json.dumps(self.registry.snapshot()).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, host="0.0.0.0"):
+    """Serve ``/metrics`` and ``/metrics.json`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
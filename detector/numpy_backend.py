@@ -0,0 +1,173 @@
+"""Pure-NumPy forward pass for the BiLSTM, with an exporter from Keras ``.h5``.
+
+The deployed network is Embedding(10000, 128) → BiLSTM(64, return_sequences)
+→ BiLSTM(32) → Dense(1, sigmoid).  Importing TensorFlow just to run it costs
+seconds and hundreds of MB per worker, so the weights are exported once to a
+compact ``.npz`` and evaluated here with batched matrix products.
+
+    python -m detector.numpy_backend lstm_model.h5 lstm_model.npz --check df_polarity.csv
+"""
+import argparse
+import os
+
+import numpy as np
+
+
+def _sigmoid(z):
+    # tanh form avoids overflow warnings from exp() on large negative inputs
+    return 0.5 * (np.tanh(0.5 * z) + 1.0)
+
+
+def _lstm(x, kernel, recurrent, bias, reverse=False, return_sequences=False):
+    """One LSTM direction over a (N, T, D) batch, Keras gate order i, f, c, o."""
+    n, steps, _ = x.shape
+    units = recurrent.shape[0]
+    xw = x @ kernel + bias            # input projections for every step at once
+    h  = np.zeros((n, units), dtype=x.dtype)
+    c  = np.zeros((n, units), dtype=x.dtype)
+    out = np.empty((n, steps, units), dtype=x.dtype) if return_sequences else None
+    for t in (range(steps - 1, -1, -1) if reverse else range(steps)):
+        z = xw[:, t] + h @ recurrent
+        s = _sigmoid(z)               # one call for i, f, o; the c slice is discarded
+        g = np.tanh(z[:, 2 * units:3 * units])
+        c = s[:, units:2 * units] * c + s[:, :units] * g
+        h = s[:, 3 * units:] * np.tanh(c)
+        if return_sequences:
+            out[:, t] = h
+    return out if return_sequences else h
+
+
+class NumpyBiLSTM:
+    """Inference-only twin of the Keras model, built from exported weights."""
+
+    def __init__(self, weights):
+        self.weights = _dequantize(weights)
+        self.layers  = int(weights["num_bilstm"])
+        self.variant = str(weights["variant"]) if "variant" in weights else "fp32"
+        self._scale  = weights.get("embedding_scale")
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """Load an ``.npz``, or a directory of ``.npy`` files written by ``unpack``.
+
+        With ``mmap=True`` the directory form is memory-mapped read-only, so
+        every process that maps it shares one copy of the weights in the page
+        cache.
+        """
+        if os.path.isdir(path):
+            mode = "r" if mmap else None
+            return cls({name[:-4]: np.load(os.path.join(path, name), mmap_mode=mode)
+                        for name in os.listdir(path) if name.endswith(".npy")})
+        with np.load(path) as npz:
+            return cls({k: npz[k] for k in npz.files})
+
+    def __call__(self, x):
+        """Probability of the Positive class for an encoded (N, T) int batch."""
+        w = self.weights
+        h = self._embed(np.asarray(x))
+        for i in range(self.layers):
+            seq = i < self.layers - 1
+            fwd = _lstm(h, w[f"bilstm{i}_fw_kernel"], w[f"bilstm{i}_fw_recurrent"], w[f"bilstm{i}_fw_bias"],
+                        return_sequences=seq)
+            bwd = _lstm(h, w[f"bilstm{i}_bw_kernel"], w[f"bilstm{i}_bw_recurrent"], w[f"bilstm{i}_bw_bias"],
+                        reverse=True, return_sequences=seq)
+            h = np.concatenate([fwd, bwd], axis=-1)
+        return _sigmoid(h @ w["dense_kernel"] + w["dense_bias"]).reshape(-1)
+
+    def _embed(self, x):
+        """Gather embedding rows, dequantizing only the rows actually used."""
+        rows = self.weights["embedding"][x]
+        if self._scale is not None:
+            return rows.astype(np.float32) * self._scale[x][..., None]
+        return rows.astype(np.float32, copy=False)
+
+
+def _dequantize(weights):
+    """Expand reduced-precision LSTM/dense weights (see ``detector.quantize``) to float32.
+
+    The embedding is left as stored; ``NumpyBiLSTM._embed`` dequantizes
+    per lookup so the large table stays compact in memory.
+    """
+    out = {}
+    for k, w in weights.items():
+        if k == "embedding" or k.endswith("_scale"):
+            out[k] = w
+        elif f"{k}_scale" in weights:
+            out[k] = w.astype(np.float32) * weights[f"{k}_scale"]
+        elif w.dtype == np.float16:
+            out[k] = w.astype(np.float32)
+        else:
+            out[k] = w
+    return out
+
+
+def export_weights(model, path):
+    """Write the Keras model's weights to ``path`` in the layout NumpyBiLSTM expects."""
+    from tensorflow.keras.layers import Bidirectional, Dense, Embedding
+
+    if isinstance(model, str):
+        from tensorflow.keras.models import load_model
+        model = load_model(model, compile=False)
+
+    arrays, n = {}, 0
+    for layer in model.layers:
+        if isinstance(layer, Embedding):
+            arrays["embedding"] = layer.get_weights()[0]
+        elif isinstance(layer, Bidirectional):
+            for tag, rnn in (("fw", layer.forward_layer), ("bw", layer.backward_layer)):
+                kernel, recurrent, bias = rnn.get_weights()
+                arrays[f"bilstm{n}_{tag}_kernel"]    = kernel
+                arrays[f"bilstm{n}_{tag}_recurrent"] = recurrent
+                arrays[f"bilstm{n}_{tag}_bias"]      = bias
+            n += 1
+        elif isinstance(layer, Dense):
+            arrays["dense_kernel"], arrays["dense_bias"] = layer.get_weights()
+    arrays = {k: v.astype(np.float32) for k, v in arrays.items()}
+    arrays["num_bilstm"] = np.array(n)
+    np.savez(path, **arrays)
+    return path
+
+
+def unpack(npz_path, out_dir):
+    """Write each array of an ``.npz`` to ``out_dir/<name>.npy`` so it can be memory-mapped."""
+    os.makedirs(out_dir, exist_ok=True)
+    with np.load(npz_path) as npz:
+        for k in npz.files:
+            np.save(os.path.join(out_dir, f"{k}.npy"), npz[k])
+    return out_dir
+
+
+def check(model_path, weights_path, tokenizer_path, texts, atol=1e-3):
+    """Largest |Keras − NumPy| probability difference over ``texts``."""
+    from detector.predictor import Predictor
+
+    keras_p = Predictor.from_files(model_path, tokenizer_path, mode="predict")
+    numpy_p = Predictor.from_files(weights_path, tokenizer_path)
+    x    = keras_p.encode(texts)
+    diff = float(np.abs(keras_p.forward(x) - numpy_p.forward(x)).max())
+    return diff, diff <= atol
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export lstm_model.h5 weights for the NumPy backend.")
+    ap.add_argument("model",  nargs="?", default="lstm_model.h5")
+    ap.add_argument("output", nargs="?", default="lstm_model.npz")
+    ap.add_argument("--tokenizer", default="tokenizer.pkl")
+    ap.add_argument("--check", metavar="CSV", help="compare against Keras on the clean_text column of CSV")
+    ap.add_argument("--limit", type=int, default=2000, help="rows of --check CSV to compare")
+    ap.add_argument("--atol",  type=float, default=1e-3)
+    args = ap.parse_args(argv)
+
+    export_weights(args.model, args.output)
+    print(f"wrote {args.output}")
+    if args.check:
+        import pandas as pd
+        texts = pd.read_csv(args.check, nrows=args.limit)["clean_text"].astype(str).tolist()
+        diff, ok = check(args.model, args.output, args.tokenizer, texts, args.atol)
+        print(f"max |keras - numpy| over {len(texts)} texts: {diff:.2e} ({'ok' if ok else 'FAIL'})")
+        if not ok:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""OCR for uploaded screenshots, single or in bulk.
+
+Each ``pytesseract.image_to_string`` call starts a tesseract subprocess and
+blocks for seconds, so bulk jobs run OCR through a bounded thread pool (the
+work happens in the subprocess, so threads are enough) and stream the
+extracted texts into batched model inference.
+
+    python -m detector.ocr screenshots/            # a directory
+    python -m detector.ocr batch.zip --workers 8   # or a zip of images
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from detector import config
+from detector.cache import content_key
+from detector.metrics import timed
+from detector.predictor import classify
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff")
+STEPS      = ("gray", "downscale", "binarize", "crop")
+
+
+def _open(image):
+    from PIL import Image
+
+    if isinstance(image, Image.Image):
+        return image
+    if isinstance(image, (bytes, bytearray)):
+        image = io.BytesIO(image)
+    return Image.open(image)
+
+
+# ─── Preprocessing ─────────────────────────────────────────────────────────────
+def parse_steps(spec):
+    """``"gray,downscale"`` → ``("gray", "downscale")``; ``"none"`` or ``""`` → ``()``."""
+    steps = tuple(s.strip() for s in spec.split(",") if s.strip() and s.strip() != "none")
+    unknown = set(steps) - set(STEPS)
+    if unknown:
+        raise ValueError(f"unknown preprocessing step(s): {', '.join(sorted(unknown))}")
+    return steps
+
+
+def _otsu(hist):
+    """Otsu threshold for a 256-bin grayscale histogram."""
+    total = sum(hist)
+    sum_all = sum(i * h for i, h in enumerate(hist))
+    best, best_t, w0, sum0 = -1.0, 127, 0, 0
+    for t, h in enumerate(hist):
+        w0 += h
+        if w0 == 0:
+            continue
+        w1 = total - w0
+        if w1 == 0:
+            break
+        sum0 += t * h
+        m0, m1 = sum0 / w0, (sum_all - sum0) / w1
+        between = w0 * w1 * (m0 - m1) ** 2
+        if between > best:
+            best, best_t = between, t
+    return best_t
+
+
+def preprocess(img, steps=None, max_width=None, target_dpi=None):
+    """Shrink and simplify a screenshot before OCR; tesseract time grows with pixel count.
+
+    ``gray``      convert to 8-bit grayscale
+    ``downscale`` shrink to at most ``max_width`` pixels wide, and to
+                  ``target_dpi`` when the file records a higher DPI (retina
+                  screenshots are often tagged 144 or more)
+    ``binarize``  Otsu threshold, inverted for dark-mode screenshots so text is dark
+    ``crop``      trim to the bounding box of the text pixels, plus a margin
+    """
+    from PIL import Image, ImageOps
+
+    steps      = parse_steps(config.OCR_PREPROCESS) if steps is None else steps
+    max_width  = max_width  or config.OCR_MAX_WIDTH
+    target_dpi = target_dpi or config.OCR_TARGET_DPI
+
+    if "gray" in steps or "binarize" in steps or "crop" in steps:
+        img = img.convert("L")
+    else:
+        img = img.convert("RGB")
+    if "downscale" in steps:
+        dpi    = img.info.get("dpi", (0, 0))[0] or 0
+        factor = min(1.0, max_width / img.width, target_dpi / dpi if dpi > target_dpi else 1.0)
+        if factor < 1.0:
+            img = img.resize((max(1, round(img.width * factor)), max(1, round(img.height * factor))),
+                             Image.LANCZOS)
+    if "binarize" in steps or "crop" in steps:
+        t  = _otsu(img.histogram())
+        bw = img.point(lambda v: 255 if v > t else 0)
+        if sum(bw.histogram()[:128]) > bw.width * bw.height / 2:   # mostly dark → dark mode
+            bw = ImageOps.invert(bw)
+        if "crop" in steps:
+            box = ImageOps.invert(bw).getbbox()   # bbox of dark (text) pixels
+            if box:
+                pad = 8
+                box = (max(0, box[0] - pad), max(0, box[1] - pad),
+                       min(img.width, box[2] + pad), min(img.height, box[3] + pad))
+                bw, img = bw.crop(box), img.crop(box)
+        if "binarize" in steps:
+            img = bw
+    return img
+
+
+def extract_text(image, tesseract_config=None, steps=None):
+    """Text in one image (path, bytes, file object or PIL image); None if OCR fails.
+
+    ``steps`` selects the ``preprocess`` stages; ``None`` uses ``DETECTOR_OCR_PREPROCESS``.
+    """
+    import pytesseract
+
+    try:
+        with timed("ocr"):
+            img  = preprocess(_open(image), steps)
+            text = pytesseract.image_to_string(img, config=tesseract_config or config.OCR_TESSERACT_CONFIG)
+        return text.strip()
+    except Exception:
+        return None
+
+
+def iter_images(source):
+    """Yield ``(name, bytes)`` for an image file, a directory of images or a zip archive."""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(IMAGE_EXTS):
+                with open(os.path.join(source, name), "rb") as f:
+                    yield name, f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTS):
+                    yield info.filename, zf.read(info)
+    else:
+        with open(source, "rb") as f:
+            yield os.path.basename(source), f.read()
+
+
+# ─── Caching ───────────────────────────────────────────────────────────────────
+def ocr_key(data):
+    """Cache key for image bytes under the current OCR settings."""
+    return content_key(data, config.OCR_TESSERACT_CONFIG, config.OCR_PREPROCESS,
+                       config.OCR_MAX_WIDTH, config.OCR_TARGET_DPI)
+
+
+def extract_text_cached(data, cache, extract=extract_text):
+    """``extract`` on image bytes, skipped when ``cache`` already holds the result.
+
+    Returns ``(text, hit)``.  Failed OCR (``None``) is not cached.
+    """
+    if cache is None:
+        return extract(data), False
+    key  = ocr_key(data)
+    text = cache.get(key)
+    if text is not None:
+        return text, True
+    text = extract(data)
+    if text is not None:
+        cache.put(key, text)
+    return text, False
+
+
+# ─── Bulk ──────────────────────────────────────────────────────────────────────
+def _timed_ocr(name, data, extract, cache):
+    t0        = time.perf_counter()
+    text, hit = extract_text_cached(data, cache, extract)
+    return {'name': name, 'text': text, 'ocr_ms': (time.perf_counter() - t0) * 1000, 'cached': hit}
+
+
+def ocr_many(items, workers=None, extract=extract_text, cache=None):
+    """OCR ``(name, bytes)`` items on a bounded pool, yielding results in input order.
+
+    At most ``2 * workers`` images are held in memory at once, so a large
+    directory or archive streams through.  With a ``cache`` (see
+    ``detector.cache.ocr_cache``) repeated images skip tesseract.
+    """
+    workers = workers or config.OCR_WORKERS
+    with ThreadPoolExecutor(workers, thread_name_prefix="ocr") as pool:
+        pending = deque()
+        for name, data in items:
+            pending.append(pool.submit(_timed_ocr, name, data, extract, cache))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def analyze_images(items, predictor, batch_size=16, workers=None, extract=extract_text, cache=None):
+    """OCR ``items`` and score the extracted texts in batches as they arrive.
+
+    Yields one dict per image with ``name``, ``text``, ``ocr_ms``, ``cached``
+    and — when OCR found text — ``prob`` and ``cls``.
+    """
+    buf = []
+
+    def flush():
+        ok = [r for r in buf if r['text']]
+        if ok:
+            for r, p in zip(ok, predictor.predict([r['text'] for r in ok])):
+                r['prob'], r['cls'] = float(p), classify(p)
+        yield from buf
+        buf.clear()
+
+    for result in ocr_many(items, workers, extract, cache):
+        buf.append(result)
+        if len(buf) >= batch_size:
+            yield from flush()
+    yield from flush()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="OCR and score a directory or zip of screenshots.")
+    ap.add_argument("source", help="image file, directory or .zip")
+    ap.add_argument("--workers",    type=int, default=None, help=f"OCR threads (default {config.OCR_WORKERS})")
+    ap.add_argument("--batch-size", type=int, default=16, help="texts per model call")
+    ap.add_argument("--cache-dir",  default=config.OCR_CACHE_DIR or None,
+                    help="reuse OCR results across runs (default DETECTOR_OCR_CACHE_DIR)")
+    args = ap.parse_args(argv)
+
+    from detector.cache import DiskCache, LRUCache, TieredCache
+    from detector.predictor import Predictor
+
+    predictor = Predictor.load().warmup()
+    cache = TieredCache(LRUCache(config.OCR_CACHE_SIZE, ttl=0), DiskCache(args.cache_dir)) if args.cache_dir else None
+    t0, n, ocr_total = time.perf_counter(), 0, 0.0
+    for r in analyze_images(iter_images(args.source), predictor, args.batch_size, args.workers, cache=cache):
+        n += 1
+        ocr_total += r['ocr_ms']
+        print(json.dumps(r, ensure_ascii=False), flush=True)
+    wall = (time.perf_counter() - t0) * 1000
+    print(f"{n} images: {wall:.0f} ms wall, {ocr_total:.0f} ms summed OCR "
+          f"({ocr_total / max(n, 1):.0f} ms/image)", file=sys.stderr)
+    if cache is not None:
+        print(f"OCR cache: {cache.stats()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Fan batch scoring out to a pool of worker processes.
+
+Each worker loads the NumPy backend once in its initializer.  Weights are
+unpacked from the ``.npz`` into a directory of ``.npy`` files and
+memory-mapped read-only, so N workers share one copy in the page cache
+instead of holding N private copies.  Results come back in input order.
+"""
+import hashlib
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from detector.numpy_backend import NumpyBiLSTM, unpack
+from detector.predictor import Predictor, load_fast_tier
+from detector.vocab import load_tokenizer
+
+_predictor = None  # per-worker, set by _init
+
+BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def shared_weights_dir(weights_path):
+    """Directory of memory-mappable ``.npy`` files for ``weights_path``, unpacked once."""
+    if os.path.isdir(weights_path):
+        return weights_path
+    st  = os.stat(weights_path)
+    tag = hashlib.sha1(f"{os.path.abspath(weights_path)}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()[:12]
+    out = os.path.join(tempfile.gettempdir(), f"detector-weights-{tag}")
+    if not os.path.isdir(out):
+        tmp = tempfile.mkdtemp(prefix="detector-weights-", dir=tempfile.gettempdir())
+        unpack(weights_path, tmp)
+        try:
+            os.rename(tmp, out)
+        except OSError:  # another process won the race
+            shutil.rmtree(tmp, ignore_errors=True)
+    return out
+
+
+@contextmanager
+def _single_threaded_blas():
+    """Default the BLAS thread counts to 1 for processes spawned inside the block.
+
+    Spawned workers read these at import time, so they must be in the
+    environment when the pool starts them; the parent's own values are put
+    back afterwards.  Values the user set explicitly are kept.
+    """
+    saved = {var: os.environ.get(var) for var in BLAS_THREAD_VARS}
+    for var in BLAS_THREAD_VARS:
+        os.environ.setdefault(var, "1")
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _init(weights_dir, tokenizer_path, fast_path=None, bucket_size=0, max_drift=None):
+    global _predictor
+    _predictor = Predictor(NumpyBiLSTM.load(weights_dir, mmap=True), load_tokenizer(tokenizer_path),
+                           mode="numpy", fast=load_fast_tier(fast_path), bucket_size=bucket_size,
+                           max_drift=max_drift)
+
+
+def _score(texts):
+    t0    = time.perf_counter()
+    probs = _predictor.predict(texts)
+    return probs, (time.perf_counter() - t0) * 1000
+
+
+class ParallelScorer:
+    """Process pool scoring lists of texts with shared, memory-mapped weights.
+
+        with ParallelScorer("lstm_model.npz", "tokenizer.vocab", workers=4) as pool:
+            for payload, probs, ms in pool.imap(items):
+                ...
+    """
+
+    def __init__(self, weights_path, tokenizer_path, workers=None, max_pending=None, fast_path=None,
+                 bucket_size=0, max_drift=None):
+        if not (os.path.isdir(weights_path) or weights_path.endswith(".npz")):
+            raise ValueError("parallel scoring needs NumPy weights; export them with "
+                             "'python -m detector.numpy_backend lstm_model.h5 lstm_model.npz'")
+        self.workers     = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        weights_dir = shared_weights_dir(weights_path)
+        # one BLAS thread per worker; the pool provides the parallelism
+        with _single_threaded_blas():
+            self._pool = mp.get_context("spawn").Pool(
+                self.workers, initializer=_init,
+                initargs=(weights_dir, tokenizer_path, fast_path, bucket_size, max_drift))
+
+    def imap(self, items):
+        """Score ``(payload, texts)`` items, yielding ``(payload, probs, ms)`` in input order.
+
+        At most ``max_pending`` batches are in flight, so a lazily read input
+        never piles up in memory ahead of the workers.
+        """
+        pending = deque()
+        for payload, texts in items:
+            pending.append((payload, self._pool.apply_async(_score, (list(texts),))))
+            if len(pending) >= self.max_pending:
+                payload, res = pending.popleft()
+                yield (payload, *res.get())
+        while pending:
+            payload, res = pending.popleft()
+            yield (payload, *res.get())
+
+    def predict(self, texts, batch_size=1024):
+        """Score one list of texts across the pool and return the concatenated probabilities."""
+        import numpy as np
+
+        texts = list(texts)
+        items = ((None, texts[i:i + batch_size]) for i in range(0, len(texts), batch_size))
+        parts = [probs for _, probs, _ in self.imap(items)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            self._pool.terminate()
@@ -0,0 +1,208 @@
+"""Streamlit-free predictor owning the BiLSTM model and its tokenizer."""
+import os
+from time import perf_counter
+
+import numpy as np
+
+from detector import config
+from detector.metrics import BATCH_SIZE, observe, timed
+from detector.vocab import load_tokenizer, pad
+
+MAXLEN       = 100    # sequence length the model was trained with
+THRESHOLD    = 0.5    # prob >= THRESHOLD → Positive, below → Negative
+DRIFT_SAMPLE = 64     # rows per bucketed batch re-scored at full width to measure drift
+
+
+def classify(prob):
+    """Map a model probability to the app's class label."""
+    return "Positive" if prob >= THRESHOLD else "Negative"
+
+
+def load_fast_tier(path=None):
+    """The cascade's linear first stage (``FAST_MODEL_PATH``), or None when it is disabled."""
+    path = config.FAST_MODEL_PATH if path is None else path
+    if not path:
+        return None
+    from detector.linear import LinearModel
+
+    return LinearModel.load(path)
+
+
+class Predictor:
+    """Tokenize, pad and score texts with the trained LSTM.
+
+    The model outputs the probability of the *Positive* (non-suicidal) class,
+    so low values mean high risk.
+    """
+
+    def __init__(self, model, tokenizer, maxlen=MAXLEN, mode=None, bucket_size=0, fast=None, band=None,
+                 max_drift=None):
+        self.model       = model
+        self.tokenizer   = tokenizer
+        self.maxlen      = maxlen
+        self.mode        = mode or config.INFERENCE_MODE
+        self.bucket_size = bucket_size   # offline scoring only (detector.score --bucket-size)
+        self.max_drift   = max_drift     # largest |bucketed - fixed| tolerated; None skips the check
+        self.fast        = fast
+        self.band        = band or (config.CASCADE_LOW, config.CASCADE_HIGH)
+        self.screened    = 0   # texts scored by the fast tier
+        self.escalated   = 0   # of those, texts passed on to the LSTM
+        self._serve    = self._trace() if self.mode == "graph" else None
+
+    @classmethod
+    def from_files(cls, model_path=None, tokenizer_path=None, mode=None, fast=None):
+        """Load a saved model and tokenizer (default ``MODEL_PATH`` and ``TOKENIZER_PATH``).
+
+        ``.npz`` weights exported by ``detector.numpy_backend`` run on the
+        NumPy backend without importing TensorFlow; anything else is loaded
+        with Keras.  A ``.vocab`` tokenizer (see ``detector.vocab``) loads
+        without Keras as well.
+        """
+        model_path     = config.MODEL_PATH     if model_path     is None else model_path
+        tokenizer_path = config.TOKENIZER_PATH if tokenizer_path is None else tokenizer_path
+        if model_path.endswith(".npz"):
+            from detector.numpy_backend import NumpyBiLSTM
+
+            model, mode = NumpyBiLSTM.load(model_path), "numpy"
+        else:
+            from tensorflow.keras.models import load_model
+
+            model = load_model(model_path, compile=False)
+        return cls(model, load_tokenizer(tokenizer_path), mode=mode, fast=fast)
+
+    @classmethod
+    def load(cls):
+        """Load the artifacts selected by ``detector.config``.
+
+        A reduced-precision ``MODEL_VARIANT`` implies the NumPy backend, since
+        only the exported weights have quantized copies.
+        """
+        from detector.quantize import variant_path
+
+        backend = config.BACKEND
+        weights = variant_path(config.WEIGHTS_PATH, config.MODEL_VARIANT)
+        if config.MODEL_VARIANT != "fp32" and backend == "keras":
+            raise ValueError(f"MODEL_VARIANT={config.MODEL_VARIANT} needs the numpy backend")
+        if backend == "numpy" or config.MODEL_VARIANT != "fp32" or (backend == "auto" and os.path.exists(weights)):
+            return cls.from_files(weights, config.TOKENIZER_PATH, fast=load_fast_tier())
+        return cls.from_files(config.MODEL_PATH, config.TOKENIZER_PATH, fast=load_fast_tier())
+
+    def _trace(self):
+        """Wrap the model in a tf.function with a fixed (None, maxlen) int32 signature.
+
+        ``model.predict`` builds a tf.data pipeline and step function on every
+        call; calling the traced graph directly skips that fixed cost.
+        """
+        import tensorflow as tf
+
+        model = self.model
+
+        @tf.function(input_signature=[tf.TensorSpec((None, self.maxlen), tf.int32)])
+        def serve(x):
+            return model(x, training=False)
+
+        return serve
+
+    def warmup(self):
+        """Trace and run the model once so the first real request is fast."""
+        self.forward(np.zeros((1, self.maxlen), dtype=np.int32))
+        return self
+
+    def encode(self, texts):
+        """Turn texts into a left-padded (N, maxlen) int32 matrix."""
+        if hasattr(self.tokenizer, "encode"):
+            return self.tokenizer.encode(texts, self.maxlen)   # records clean/tokenize/pad itself
+        with timed("tokenize"):
+            seqs = self.tokenizer.texts_to_sequences(list(texts))
+        with timed("pad"):
+            return pad(seqs, self.maxlen)
+
+    def forward(self, x):
+        """Run the model on an encoded batch and return a 1-D float array."""
+        if len(x) == 0:
+            return np.empty(0, dtype=np.float32)
+        t0 = perf_counter()
+        if self.mode == "numpy":
+            probs = self.model(x)
+        elif self._serve is not None and x.shape[1] == self.maxlen:
+            probs = self._serve(x).numpy().reshape(-1)
+        else:
+            probs = self.model.predict(x, verbose=0).reshape(-1)
+        observe("predict", perf_counter() - t0)
+        BATCH_SIZE.observe(len(x))
+        return probs
+
+    def forward_bucketed(self, x, bucket_size=None):
+        """Like ``forward``, but trims each length bucket to its longest row.
+
+        Rows are sorted by token count and cut into buckets of ``bucket_size``;
+        each bucket keeps only its last ``width`` columns (the padding is on
+        the left) and results are scattered back to input order.  The model
+        has no masking, so dropping leading zeros shifts probabilities,
+        sometimes across the threshold; ``benchmarks/bench_buckets.py``
+        reports by how much.  ``predict`` only uses it when ``bucket_size``
+        is set, which only offline scoring does.
+        """
+        bucket_size = bucket_size or self.bucket_size
+        lengths = np.count_nonzero(x, axis=1)       # ids start at 1, so 0 is always padding
+        order   = np.argsort(lengths, kind="stable")
+        out     = np.empty(len(x), dtype=np.float32)
+        for start in range(0, len(x), bucket_size):
+            idx   = order[start:start + bucket_size]
+            width = max(int(lengths[idx[-1]]), 1)
+            out[idx] = self.forward(x[idx, x.shape[1] - width:])
+        return out
+
+    def screen(self, texts):
+        """Run the fast tier: ``(probs, escalate)``, where ``escalate`` marks rows the LSTM must score.
+
+        Without a fast tier every row escalates.  Otherwise a row escalates
+        when its linear probability falls strictly inside ``band``.
+        """
+        if self.fast is None:
+            return np.zeros(len(texts), dtype=np.float32), np.ones(len(texts), dtype=bool)
+        with timed("screen"):
+            probs = self.fast.predict(texts)
+        low, high = self.band
+        escalate  = (probs > low) & (probs < high)
+        self.screened  += len(texts)
+        self.escalated += int(escalate.sum())
+        return probs, escalate
+
+    def check_drift(self, x, probs):
+        """Re-score a sample of ``x`` at full width; raise if ``probs`` strays more than ``max_drift``."""
+        if self.max_drift is None or not len(x):
+            return
+        idx   = np.unique(np.linspace(0, len(x) - 1, min(len(x), DRIFT_SAMPLE)).astype(int))
+        drift = float(np.abs(probs[idx] - self.forward(np.asarray(x[idx]))).max())
+        if drift > self.max_drift:
+            raise RuntimeError(f"length bucketing moved probabilities by {drift:.4f} "
+                               f"(more than max_drift {self.max_drift}); score without bucketing")
+
+    def _predict_lstm(self, texts, x=None):
+        x = self.encode(texts) if x is None else x
+        if not self.bucket_size:
+            return self.forward(x)
+        probs = self.forward_bucketed(x)
+        self.check_drift(x, probs)
+        return probs
+
+    def predict(self, texts, x=None):
+        """Probability of the Positive class for each text.
+
+        With a fast tier attached, confident linear scores are returned as is
+        and only the ambiguous texts reach the LSTM.  ``x``, when given, is
+        ``encode(texts)`` computed ahead of time (a corpus's token ids).
+        """
+        if self.fast is None:
+            return self._predict_lstm(texts, x)
+        texts = list(texts)
+        probs, escalate = self.screen(texts)
+        if escalate.any():
+            probs[escalate] = self._predict_lstm([t for t, e in zip(texts, escalate) if e],
+                                                 None if x is None else x[escalate])
+        return probs
+
+    def predict_one(self, text):
+        """Probability for a single text, as a plain float."""
+        return float(self.predict([text])[0])
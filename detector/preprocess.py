@@ -0,0 +1,222 @@
+"""Corpus-at-once versions of the notebook's tweet cleaning and lexicon labels.
+
+    python -m detector.preprocess Suicidal_Twitter_Data.csv -o df_polarity.csv
+    python -m detector.preprocess --check df_polarity.csv
+
+The notebook builds ``df_polarity.csv`` in two stages: ``clean_tweet`` (URLs,
+hashtags, single letters, ``RT``, mentions, ``emoji.demojize``, whitespace,
+punctuation) produces ``clean_text``, then a second, stricter clean feeds a
+substring lexicon that sets ``Sentiment``/``label``.  Both ran per tweet in a
+Python loop.  Here each stage joins the whole column into one string with a
+``\\x00`` separator and runs every regex once over it; the patterns are
+adjusted so no match can cross a separator, which keeps the output
+byte-identical to the per-tweet functions (also kept below, as the reference).
+``demojize`` only runs on the non-ASCII rows.  The keywords are compiled into
+one prefix-trie regex and matched in a single ``finditer`` pass.
+"""
+import argparse
+import re
+import string
+import sys
+
+import numpy as np
+
+SEP = "\x00"
+
+MENTAL_HEALTH_KEYWORDS = frozenset([
+    'depressed', 'suicide', 'hopeless', 'worthless', 'alone',
+    'anxious', 'kill', 'selfharm', 'sad', 'tired', 'pain', 'useless',
+    'die', 'dying', 'crying', 'breakdown', 'fear', 'mentalhealth',
+    'overwhelmed', 'panic', 'cutting', 'hate myself', 'end it all',
+])
+
+_PUNCT = str.maketrans('', '', string.punctuation)
+
+
+# ─── Notebook reference (per tweet) ────────────────────────────────────────────
+def clean_tweet(text):
+    """The notebook's first ``clean_tweet``: raw tweet → ``clean_text``."""
+    import emoji
+
+    text = re.sub(r'http\S+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'\s+[a-zA-Z]\s+', ' ', text)
+    text = re.sub(r'^RT[\s]+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = emoji.demojize(text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text.translate(_PUNCT)
+
+
+def lexicon_text(tweet):
+    """The notebook's second ``clean_tweet``, applied before keyword matching."""
+    tweet = re.sub(r"http\S+|www\S+|https\S+", '', tweet)
+    tweet = re.sub(r'\@\w+|\#', '', tweet)
+    tweet = re.sub(r'[^A-Za-z\s]', '', tweet)
+    return tweet.lower().strip()
+
+
+def lexicon_label(tweet, keywords=MENTAL_HEALTH_KEYWORDS):
+    """``"Negative"`` when any keyword is a substring of ``lexicon_text(tweet)``."""
+    processed = lexicon_text(tweet)
+    return "Negative" if any(k in processed for k in keywords) else "Positive"
+
+
+# ─── Vectorized ────────────────────────────────────────────────────────────────
+# \S and [^...] classes exclude SEP so a match never runs into the next tweet;
+# \s and \w never match it anyway.
+_URL      = re.compile(r'http[^\s\x00]+')
+_HASHTAG  = re.compile(r'#\w+')
+_SINGLE   = re.compile(r'\s+[a-zA-Z]\s+')
+_RT       = re.compile(r'\x00RT\s+')                    # run on SEP + corpus, so ^ is a SEP too
+_MENTION  = re.compile(r'@\w+')
+_SPACE    = re.compile(r'\s{2,}|[^\S ]')                # same result as \s+ → " ", fewer replacements
+_PUNCT_RE = re.compile("[" + re.escape(string.punctuation) + "]+")
+_NONASCII = re.compile(r'[#*0-9]?[^\x00-\x7f]+')          # emoji only contain ASCII as a keycap base
+
+_LEX_URL   = re.compile(r'http[^\s\x00]+|www[^\s\x00]+|https[^\s\x00]+')
+_LEX_AT    = re.compile(r'\@\w+|\#')
+_LEX_ALPHA = re.compile(r'[^A-Za-z\s\x00]+')
+
+
+def _join(texts):
+    texts = [str(t) for t in texts]
+    if any(SEP in t for t in texts):
+        raise ValueError("texts may not contain NUL characters")
+    return texts, SEP.join(texts)
+
+
+def _strip(joined):
+    """Per-tweet ``.strip()`` on the joined corpus (cheaper per piece than as a regex)."""
+    return SEP.join(t.strip() for t in joined.split(SEP))
+
+
+def _split(joined, n):
+    return joined.split(SEP) if n else []
+
+
+def _demojize(s):
+    """``emoji.demojize(s)``, tokenizing only the non-ASCII runs, in one call."""
+    runs = _NONASCII.findall(s)
+    if not runs:
+        return s
+    import emoji
+
+    done = iter(emoji.demojize(SEP.join(runs)).split(SEP))
+    return _NONASCII.sub(lambda m: next(done), s)
+
+
+def clean_texts(texts):
+    """``[clean_tweet(t) for t in texts]``, one regex pass per step over the whole corpus."""
+    texts, s = _join(texts)
+    s = _URL.sub('', s)
+    s = _HASHTAG.sub('', s)
+    s = _SINGLE.sub(' ', s)
+    s = _RT.sub(SEP, SEP + s)[1:]
+    s = _MENTION.sub('', s)
+    s = _demojize(s)
+    s = _strip(_SPACE.sub(' ', s))
+    return _split(_PUNCT_RE.sub('', s), len(texts))
+
+
+def lexicon_texts(texts):
+    """``[lexicon_text(t) for t in texts]`` over the joined corpus."""
+    texts, s = _join(texts)
+    s = _LEX_URL.sub('', s)
+    s = _LEX_AT.sub('', s)
+    s = _LEX_ALPHA.sub('', s).lower()
+    return _split(_strip(s), len(texts))
+
+
+def trie_pattern(words):
+    """A regex matching any of ``words``, with shared prefixes factored out.
+
+    ``{"die", "dying", "depressed"}`` → ``d(?:epressed|ie|ying)``: at each
+    position the engine follows one branch per character instead of trying
+    every keyword in turn.  No words at all gives ``(?!)``, which never matches.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        if list(node) == [""]:
+            return ""
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie) if trie else "(?!)"
+
+
+def lexicon_labels(texts, keywords=MENTAL_HEALTH_KEYWORDS):
+    """``[lexicon_label(t) for t in texts]``: one trie-regex scan over the whole corpus."""
+    processed = lexicon_texts(texts)
+    joined    = SEP.join(processed)
+    starts    = np.cumsum([0] + [len(t) + 1 for t in processed[:-1]])
+    pattern   = re.compile(f"(?:{trie_pattern(keywords)})[^\x00]*")   # first hit, then skip the tweet
+    hits      = np.fromiter((m.start() for m in pattern.finditer(joined)), dtype=np.int64)
+    negative  = np.zeros(len(processed), dtype=bool)
+    negative[np.searchsorted(starts, hits, side="right") - 1] = True
+    return np.where(negative, "Negative", "Positive").tolist()
+
+
+def polarity_frame(clean):
+    """The notebook's ``df_polarity`` from already cleaned texts."""
+    import pandas as pd
+
+    df = pd.DataFrame({'clean_text': clean, 'Sentiment': lexicon_labels(clean)})
+    df['label'] = (df['Sentiment'] == 'Positive').astype(int)
+    return df
+
+
+def check(path, limit=None):
+    """Compare against the notebook; returns the number of mismatching rows.
+
+    A file with a ``Text`` column (a raw scrape) is cleaned both ways.  A
+    ``df_polarity.csv`` is relabelled from its ``clean_text`` and rewritten,
+    and the CSV bytes must equal the file on disk.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path, keep_default_na=False, nrows=limit)
+    if "Text" in df.columns:
+        raw  = df["Text"].astype(str).tolist()
+        fast = clean_texts(raw)
+        bad  = sum(a != clean_tweet(t) for a, t in zip(fast, raw))
+        bad += sum(a != lexicon_label(t) for a, t in zip(lexicon_labels(fast), fast))
+        print(f"{len(raw)} raw tweets, {bad} mismatches against the notebook functions")
+        return bad
+    out = polarity_frame(df["clean_text"].astype(str).tolist())
+    bad = int((out['Sentiment'] != df['Sentiment']).sum())
+    with open(path, "rb") as f:
+        same = limit is not None or out.to_csv(index=False).encode("utf-8") == f.read()
+    print(f"{len(out)} rows, {bad} label mismatches, CSV bytes {'identical' if same else 'DIFFER'}")
+    return bad + (not same)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Clean raw tweets and lexicon-label them like the notebook.")
+    ap.add_argument("input", nargs="?", help="raw CSV with a Text column")
+    ap.add_argument("-o", "--output", default="df_polarity.csv")
+    ap.add_argument("--column", default="Text")
+    ap.add_argument("--check", metavar="CSV", help="verify against the notebook functions instead")
+    ap.add_argument("--limit", type=int, help="only the first N rows (with --check)")
+    args = ap.parse_args(argv)
+
+    if args.check:
+        sys.exit(1 if check(args.check, args.limit) else 0)
+    if not args.input:
+        ap.error("input is required unless --check is given")
+    import pandas as pd
+
+    raw = pd.read_csv(args.input)[args.column].astype(str).tolist()
+    polarity_frame(clean_texts(raw)).to_csv(args.output, index=False)
+    print(f"wrote {args.output} ({len(raw)} rows)")
+
+
+if __name__ == "__main__":
+    main()
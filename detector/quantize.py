@@ -0,0 +1,73 @@
+"""Reduced-precision variants of the exported NumPy weights.
+
+    python -m detector.quantize lstm_model.npz --variant int8   # → lstm_model.int8.npz
+    python -m detector.quantize lstm_model.npz --variant fp16   # → lstm_model.fp16.npz
+
+``fp16`` stores every weight as float16.  ``int8`` stores the embedding
+table and the LSTM kernels as int8 with a symmetric float32 scale per
+embedding row / kernel output column; biases and the dense layer stay
+float32.  ``NumpyBiLSTM`` keeps the embedding quantized in memory and only
+dequantizes the rows it gathers; the small LSTM matrices are expanded to
+float32 at load so the matmuls run at full speed.  Select a variant in the
+app with ``DETECTOR_MODEL_VARIANT``.
+"""
+import argparse
+import os
+
+import numpy as np
+
+VARIANTS = ("fp32", "fp16", "int8")
+
+
+def variant_path(path, variant):
+    """``lstm_model.npz`` → ``lstm_model.int8.npz`` (``fp32`` is the path itself)."""
+    if variant == "fp32":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{variant}{ext}"
+
+
+def _int8(w, axis):
+    """Symmetric int8 quantization with one scale per slice along ``axis``."""
+    amax  = np.abs(w).max(axis=axis, keepdims=True)
+    scale = np.where(amax > 0, amax / 127.0, 1.0).astype(np.float32)
+    q     = np.clip(np.rint(w / scale), -127, 127).astype(np.int8)
+    return q, np.squeeze(scale, axis=axis)
+
+
+def quantize(weights, variant):
+    """Return a new weight dict for ``variant`` from float32 ``weights``."""
+    if variant not in VARIANTS:
+        raise ValueError(f"unknown variant {variant!r}; choose from {', '.join(VARIANTS)}")
+    out = {"num_bilstm": weights["num_bilstm"], "variant": np.array(variant)}
+    for k, w in weights.items():
+        if k in out or w.dtype.kind != "f":
+            continue
+        if variant == "fp16":
+            out[k] = w.astype(np.float16)
+        elif variant == "int8" and k == "embedding":
+            out[k], out[f"{k}_scale"] = _int8(w, axis=1)          # per row
+        elif variant == "int8" and k.endswith(("_kernel", "_recurrent")) and k.startswith("bilstm"):
+            out[k], out[f"{k}_scale"] = _int8(w, axis=0)          # per output column
+        else:
+            out[k] = w.astype(np.float32)
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write a reduced-precision copy of lstm_model.npz.")
+    ap.add_argument("weights", nargs="?", default="lstm_model.npz")
+    ap.add_argument("--variant", choices=VARIANTS[1:], default="int8")
+    ap.add_argument("-o", "--output", help="default: <weights>.<variant>.npz")
+    args = ap.parse_args(argv)
+
+    with np.load(args.weights) as npz:
+        weights = {k: npz[k] for k in npz.files}
+    out = args.output or variant_path(args.weights, args.variant)
+    np.savez(out, **quantize(weights, args.variant))
+    print(f"wrote {out} ({os.path.getsize(out) / 1e6:.2f} MB, "
+          f"from {os.path.getsize(args.weights) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
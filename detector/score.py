@@ -0,0 +1,251 @@
+"""Score large CSV/JSONL exports offline, one chunk at a time.
+
+    python -m detector.score df_polarity.csv -o scored.jsonl
+    python -m detector.score big.csv -o scored.parquet --chunksize 4096 --resume
+    python -m detector.score big.csv -o scored.csv --workers 8 --model lstm_model.npz
+
+The input is streamed in chunks of ``--chunksize`` rows; each chunk is
+encoded and predicted as one batch and appended to the output before the
+next is read, so memory stays flat however large the file is.  After every
+chunk a small ``<output>.ckpt`` file records how many chunks (and output
+bytes) are complete; ``--resume`` truncates any partial write and carries
+on from there.  Parquet output is a directory of ``part-NNNNN.parquet``
+files, one per chunk.  ``--workers N`` scores chunks in N processes that
+share memory-mapped NumPy weights (see ``detector.parallel``).
+``--bucket-size N`` pads each length bucket of N rows only to its longest row
+(``Predictor.forward_bucketed``).  The model has no masking, so this changes
+scores; a sample of every batch is re-scored at full width and the run stops
+if any probability moved more than ``--max-drift``.
+
+The input may also be a directory written by ``detector.corpus``: chunks are
+then sliced from its memory-mapped columns without parsing, and when its
+token ids were built with the predictor's tokenizer they go straight to the
+model instead of being re-encoded.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from detector.corpus import Corpus, is_corpus
+from detector.predictor import Predictor, classify, load_fast_tier
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def _format(path, explicit=None):
+    if explicit:
+        return explicit
+    if is_corpus(path):
+        return "corpus"
+    ext = os.path.splitext(path)[1].lstrip(".").lower()
+    return {"json": "jsonl", "ndjson": "jsonl", "pq": "parquet"}.get(ext, ext)
+
+
+def read_chunks(path, chunksize, fmt=None):
+    """Yield DataFrames of at most ``chunksize`` rows."""
+    import pandas as pd
+
+    fmt = _format(path, fmt)
+    if fmt == "csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif fmt == "jsonl":
+        with pd.read_json(path, lines=True, chunksize=chunksize) as reader:
+            yield from reader
+    elif fmt == "corpus":
+        corpus = Corpus.open(path)
+        for start in range(0, len(corpus), chunksize):
+            yield corpus.frame(start, start + chunksize)
+    else:
+        raise ValueError(f"unsupported input format: {fmt!r}")
+
+
+class Checkpoint:
+    """Progress marker written atomically next to the output."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, **state):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _FileWriter:
+    """Append CSV or JSONL chunks to one file, tracking the committed byte offset."""
+
+    def __init__(self, path, fmt, offset=0):
+        self.fmt = fmt
+        self.f   = open(path, "r+b" if offset and os.path.exists(path) else "wb")
+        self.f.seek(offset)
+        self.f.truncate()
+
+    def write(self, df):
+        if self.fmt == "csv":
+            data = df.to_csv(index=False, header=self.f.tell() == 0)
+        else:
+            data = df.to_json(orient="records", lines=True, force_ascii=False)
+            data = data if data.endswith("\n") else data + "\n"
+        self.f.write(data.encode("utf-8"))
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+
+
+class _ParquetWriter:
+    """One parquet file per chunk inside the output directory."""
+
+    def __init__(self, path, chunks_done=0):
+        self.path = path
+        self.n    = chunks_done
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):  # drop parts written after the last checkpoint
+            if name.startswith("part-") and int(name[5:10]) >= chunks_done:
+                os.remove(os.path.join(path, name))
+
+    def write(self, df):
+        df.to_parquet(os.path.join(self.path, f"part-{self.n:05d}.parquet"), index=False)
+        self.n += 1
+        return 0
+
+    def close(self):
+        pass
+
+
+def _texts(df, column):
+    if column not in df.columns:
+        raise KeyError(f"column {column!r} not in input (have: {', '.join(map(str, df.columns))})")
+    return df[column].astype(str).tolist()   # as the notebook, train and detector.corpus: NaN becomes "nan"
+
+
+def _score_local(predictor, items):
+    """In-process counterpart of ``ParallelScorer.imap``."""
+    for payload, texts, *x in items:   # x: precomputed token ids, for corpus input
+        t0    = time.perf_counter()
+        probs = predictor.predict(texts, *x)
+        yield payload, probs, (time.perf_counter() - t0) * 1000
+
+
+def _corpus_items(predictor, corpus, column, chunksize, skip):
+    """Chunks of a ``detector.corpus`` directory, with its token ids when the tokenizer matches."""
+    encoded = (not hasattr(predictor, "imap")
+               and corpus.encoded_with(predictor.tokenizer, predictor.maxlen))
+    for start in range(skip * chunksize, len(corpus), chunksize):
+        df = corpus.frame(start, start + chunksize)
+        if encoded:
+            yield df, _texts(df, column), corpus.tokens[start:start + chunksize]
+        else:
+            yield df, _texts(df, column)
+
+
+def annotate(df, probs, ms):
+    """Add probability, prediction and per-row latency columns to one chunk."""
+    out = df.copy()
+    out["probability"] = probs
+    out["prediction"]  = [classify(p) for p in probs]
+    out["latency_ms"]  = ms / max(len(df), 1)
+    return out
+
+
+def score_file(predictor, input_path, output_path, column="clean_text", chunksize=2048,
+               out_format=None, in_format=None, resume=False, log=sys.stderr):
+    """Stream ``input_path`` through the predictor into ``output_path``; returns rows scored.
+
+    ``predictor`` is a ``Predictor`` or a ``detector.parallel.ParallelScorer``.
+    """
+    out_format = _format(output_path, out_format)
+    if out_format not in FORMATS:
+        raise ValueError(f"unsupported output format: {out_format!r}")
+    ckpt  = Checkpoint(output_path.rstrip("/") + ".ckpt")
+    state = ckpt.load() if resume else None
+    if state and state["chunksize"] != chunksize:
+        raise ValueError(f"checkpoint was written with --chunksize {state['chunksize']}")
+    chunks, rows, offset = (state["chunks"], state["rows"], state["bytes"]) if state else (0, 0, 0)
+    if chunks:
+        print(f"resuming after chunk {chunks} ({rows} rows)", file=log)
+
+    if _format(input_path, in_format) == "corpus":
+        items = _corpus_items(predictor, Corpus.open(input_path), column, chunksize, chunks)
+    else:
+        # re-parse completed chunks rather than skipping lines, so quoted
+        # multi-line rows can't shift the chunk boundaries
+        items = ((df, _texts(df, column))
+                 for i, df in enumerate(read_chunks(input_path, chunksize, in_format)) if i >= chunks)
+    scored = predictor.imap(items) if hasattr(predictor, "imap") else _score_local(predictor, items)
+
+    writer = (_ParquetWriter(output_path, chunks) if out_format == "parquet"
+              else _FileWriter(output_path, out_format, offset))
+    start = time.perf_counter()
+    try:
+        for df, probs, ms in scored:
+            offset  = writer.write(annotate(df, probs, ms))
+            chunks += 1
+            rows   += len(df)
+            ckpt.save(chunks=chunks, rows=rows, bytes=offset, chunksize=chunksize)
+            rate = rows / (time.perf_counter() - start)
+            print(f"chunk {chunks}: {rows} rows ({rate:,.0f} rows/s)", file=log)
+    finally:
+        writer.close()
+    ckpt.remove()
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Score a CSV/JSONL file with the suicidal-ideation model.")
+    ap.add_argument("input")
+    ap.add_argument("-o", "--output", required=True)
+    ap.add_argument("--column",       default="clean_text", help="text column to score")
+    ap.add_argument("--chunksize",    type=int, default=2048)
+    ap.add_argument("--format",       choices=FORMATS, help="output format (default: from extension)")
+    ap.add_argument("--input-format", choices=("csv", "jsonl", "corpus"))
+    ap.add_argument("--resume",       action="store_true", help="continue from <output>.ckpt")
+    ap.add_argument("--workers",      type=int, default=1, help="worker processes (NumPy weights only)")
+    ap.add_argument("--model",        help="model path (.h5 or .npz); default from detector.config")
+    ap.add_argument("--tokenizer",    help="tokenizer path (.vocab or .pkl)")
+    ap.add_argument("--bucket-size",  type=int, default=0,
+                    help="pad rows per length bucket of this many rows instead of to maxlen (changes scores)")
+    ap.add_argument("--max-drift",    type=float, default=0.02,
+                    help="with --bucket-size, fail if a sampled probability moves more than this")
+    args = ap.parse_args(argv)
+
+    from detector import config
+    tokenizer = args.tokenizer or config.TOKENIZER_PATH
+    if args.workers > 1:
+        from detector.parallel import ParallelScorer
+        from detector.quantize import variant_path
+        weights   = args.model or variant_path(config.WEIGHTS_PATH, config.MODEL_VARIANT)   # as Predictor.load
+        predictor = ParallelScorer(weights, tokenizer, args.workers, bucket_size=args.bucket_size,
+                                   max_drift=args.max_drift)
+    else:
+        if args.model or args.tokenizer:
+            predictor = Predictor.from_files(args.model or config.MODEL_PATH, tokenizer, fast=load_fast_tier())
+        else:
+            predictor = Predictor.load()
+        predictor.bucket_size, predictor.max_drift = args.bucket_size, args.max_drift
+    try:
+        n = score_file(predictor, args.input, args.output, args.column, args.chunksize,
+                       args.format, args.input_format, args.resume)
+    finally:
+        if args.workers > 1:
+            predictor.close()
+    print(f"scored {n} rows → {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
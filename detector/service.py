@@ -0,0 +1,229 @@
+"""Asyncio HTTP API for the detector, alongside the Streamlit UI.
+
+    python -m detector.service --port 8080
+
+    POST /predict        {"text": "..."}          → {"probability", "prediction", "latency_ms"}
+    POST /predict/batch  {"texts": ["...", ...]}  → {"results": [...], "latency_ms"}
+    GET  /healthz        liveness (always 200 while the loop runs)
+    GET  /readyz         200 once the model is loaded, 503 before
+    GET  /metrics        per-stage latency histograms and counters (Prometheus text)
+    GET  /metrics.json   the same, with p50/p95/p99 estimates, as JSON
+
+Artifacts are loaded exactly as the app's ``load_model_and_tokenizer`` does
+(``Predictor.load().warmup()``), in the background so the port opens
+immediately.  Single-text requests share forward passes through a
+``MicroBatcher`` (and a prediction cache); batch requests run in a thread
+pool, at most ``concurrency`` at once.  At most ``max_queue`` requests may
+be admitted in total — beyond that the service answers 429 with
+``Retry-After``.
+
+Test it in-process with aiohttp's test client::
+
+    from aiohttp.test_utils import TestClient, TestServer
+    async with TestClient(TestServer(create_app(predictor))) as client:
+        resp = await client.post("/predict", json={"text": "hello"})
+"""
+import argparse
+import asyncio
+import contextlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from detector import config, metrics
+from detector.batcher import MicroBatcher
+from detector.cache import LRUCache, row_key
+from detector.predictor import Predictor, classify
+
+STATE = web.AppKey("state", dict)
+
+
+class Busy(Exception):
+    """Raised when the admission queue is full."""
+
+
+def _result(prob, ms=None):
+    out = {"probability": float(prob), "prediction": classify(prob)}
+    if ms is not None:
+        out["latency_ms"] = ms
+    return out
+
+
+async def _json_field(request, field, kind):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="body must be JSON")
+    value = body.get(field) if isinstance(body, dict) else None
+    if not isinstance(value, kind):
+        raise web.HTTPBadRequest(text=f"expected JSON object with {field!r}")
+    return value
+
+
+class _Admission:
+    """Counts admitted requests; raises ``Busy`` beyond ``max_queue``."""
+
+    def __init__(self, max_queue):
+        self.max_queue = max_queue
+        self.admitted  = 0
+
+    def __enter__(self):
+        if self.admitted >= self.max_queue:
+            raise Busy()
+        self.admitted += 1
+
+    def __exit__(self, *exc):
+        self.admitted -= 1
+
+
+async def _run(state, fn, *args):
+    """Run blocking ``fn`` in the executor, at most ``concurrency`` at a time."""
+    loop = asyncio.get_running_loop()
+    async with state["running"]:
+        return await loop.run_in_executor(state["executor"], fn, *args)
+
+
+def _ready(state):
+    if state["predictor"] is None:
+        raise web.HTTPServiceUnavailable(text="model is warming up", headers={"Retry-After": "1"})
+    return state["predictor"]
+
+
+@web.middleware
+async def _backpressure(request, handler):
+    try:
+        return await handler(request)
+    except Busy:
+        return web.json_response({"error": "too many requests"}, status=429, headers={"Retry-After": "1"})
+
+
+async def predict(request):
+    state = request.app[STATE]
+    text  = await _json_field(request, "text", str)
+    predictor, batcher, cache = _ready(state), state["batcher"], state["cache"]
+
+    with state["admission"]:
+        t0   = time.perf_counter()
+        fast, escalate = predictor.screen([text])   # confident fast-tier scores skip the LSTM
+        prob = float(fast[0])
+        if escalate[0]:
+            row  = predictor.encode([text])[0]   # one short text: cheaper inline than a thread hop
+            key  = row_key(row)
+            prob = cache.get(key)
+            if prob is None:
+                # the batcher thread does the forward pass; awaiting its future
+                # leaves the executor free and lets concurrent requests coalesce
+                prob = await asyncio.wrap_future(batcher.submit(row))
+                cache.put(key, prob)
+        ms = (time.perf_counter() - t0) * 1000
+    return web.json_response(_result(prob, ms))
+
+
+async def predict_batch(request):
+    state = request.app[STATE]
+    texts = await _json_field(request, "texts", list)
+    if len(texts) > state["max_batch"]:
+        raise web.HTTPRequestEntityTooLarge(max_size=state["max_batch"], actual_size=len(texts))
+    if not all(isinstance(t, str) for t in texts):
+        raise web.HTTPBadRequest(text="'texts' must be a list of strings")
+    predictor = _ready(state)
+
+    def work():
+        t0 = time.perf_counter()
+        return predictor.predict(texts), (time.perf_counter() - t0) * 1000
+
+    with state["admission"]:
+        probs, ms = await _run(state, work)
+    return web.json_response({"results": [_result(p) for p in probs], "latency_ms": ms})
+
+
+async def healthz(request):
+    return web.json_response({"status": "ok"})
+
+
+async def readyz(request):
+    state = request.app[STATE]
+    p = state["predictor"]
+    if p is None:
+        status = 500 if state["load_error"] else 503
+        return web.json_response({"ready": False, "error": state["load_error"]}, status=status)
+    return web.json_response({"ready": True, "backend": p.mode})
+
+
+async def prometheus(request):
+    return web.Response(body=metrics.REGISTRY.prometheus().encode(),
+                        headers={"Content-Type": metrics.PROMETHEUS_CONTENT_TYPE})
+
+
+async def metrics_json(request):
+    return web.json_response(metrics.REGISTRY.snapshot())
+
+
+def create_app(predictor=None, concurrency=None, max_queue=None, max_batch=None):
+    """Build the aiohttp application; loads the configured model in the background if none is given."""
+    state = {
+        "predictor":  None,
+        "batcher":    None,
+        "cache":      LRUCache(),
+        "load_error": None,
+        "executor":   ThreadPoolExecutor(concurrency or config.SERVICE_CONCURRENCY, thread_name_prefix="predict"),
+        "max_batch":  max_batch or config.SERVICE_MAX_BATCH,
+        "concurrency": concurrency or config.SERVICE_CONCURRENCY,
+        "max_queue":  max_queue or config.SERVICE_MAX_QUEUE,
+    }
+    app = web.Application(middlewares=[_backpressure])
+    app[STATE] = state
+    app.router.add_post("/predict", predict)
+    app.router.add_post("/predict/batch", predict_batch)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/readyz", readyz)
+    app.router.add_get("/metrics", prometheus)
+    app.router.add_get("/metrics.json", metrics_json)
+    metrics.REGISTRY.track_cache("service", state["cache"])
+
+    def install(p):
+        state["predictor"] = p
+        state["batcher"]   = MicroBatcher(p.forward)
+
+    async def on_startup(app):
+        state["admission"] = _Admission(state["max_queue"])
+        state["running"]   = asyncio.Semaphore(state["concurrency"])
+        if predictor is not None:
+            install(predictor)
+            return
+
+        async def load():
+            loop = asyncio.get_running_loop()
+            try:
+                install(await loop.run_in_executor(state["executor"], lambda: Predictor.load().warmup()))
+            except Exception as e:
+                state["load_error"] = str(e)
+
+        state["loader"] = asyncio.create_task(load())
+
+    async def on_cleanup(app):
+        loader = state.get("loader")
+        if loader is not None and not loader.done():
+            loader.cancel()   # shutting down mid-load; the executor thread finishes on its own
+            with contextlib.suppress(asyncio.CancelledError):
+                await loader
+        if state["batcher"] is not None:
+            state["batcher"].close()
+        state["executor"].shutdown(wait=False)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve the suicidal-ideation detector over HTTP.")
+    ap.add_argument("--host", default=config.SERVICE_HOST)
+    ap.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    args = ap.parse_args(argv)
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
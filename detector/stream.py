@@ -0,0 +1,427 @@
+"""Classify a live text feed and raise alerts on rolling negative rates and trends.
+
+    tail -F tweets.log | python -m detector.stream -
+    python -m detector.stream tweets.jsonl --follow
+    python -m detector.stream tcp://127.0.0.1:9400 --window 3600 --step 300
+
+Input is line-delimited: plain text, or JSON objects with ``text`` and
+optionally ``ts`` (unix seconds) and ``id``.  Without ``ts`` the arrival
+time is used and idle windows are closed by the wall clock; with it,
+windows follow event time and older files can be replayed.  A reader thread
+fills a bounded queue (so a slow model pushes back on the source), and the
+main loop scores micro-batches of up to ``batch_size`` texts, waiting at
+most ``max_wait_ms`` for a batch to fill.
+
+``RiskMonitor`` keeps only the per-step counts of the current window and the
+last ``trend_windows`` window totals, so memory is bounded however long the
+feed runs.  Every ``step_s`` it emits the sliding ``window_s`` aggregate and
+two kinds of alert, each once per episode rather than on every step:
+
+- ``rate``: the window's negative rate reaches ``rate_alert`` (given at
+  least ``min_count`` texts);
+- ``trend``: a Mann-Kendall test (the notebook's ``mk_test``, updated in
+  O(n) per window) over the negative counts of the last ``trend_windows``
+  non-overlapping windows finds a significant increase at ``alpha``.
+
+Events are JSON lines on stdout.  Thousands of texts per second need the
+cascade's fast tier (``DETECTOR_FAST_MODEL_PATH`` or ``--fast``), so the LSTM
+only sees the ambiguous ones; ``--fast-only`` skips the LSTM entirely.
+``--topics DIR`` also feeds the negative texts to a ``detector.topics``
+tracker, saved on exit.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+import numpy as np
+
+from detector import config
+from detector.predictor import THRESHOLD, Predictor, classify, load_fast_tier
+
+EOF = None   # queued by a reader when its source is exhausted
+
+
+# ─── Trend test ────────────────────────────────────────────────────────────────
+class TrendTest:
+    """Mann-Kendall test over the last ``n`` values, updated incrementally.
+
+    ``S = Σ_{i<j} sign(x_j - x_i)`` changes by one row of sign comparisons
+    when a value enters or leaves, and the tie correction of the variance
+    by one group count, so a push costs O(n) rather than O(n²).  The
+    statistics match ``pymannkendall.original_test`` on the same values.
+    """
+
+    def __init__(self, n, alpha=0.05):
+        self.n      = n
+        self.alpha  = alpha
+        self.values = deque()
+        self.s      = 0
+        self.ties   = Counter()
+
+    def push(self, x):
+        x = float(x)
+        if len(self.values) == self.n:
+            old = self.values.popleft()
+            self.s -= int(np.sign(np.fromiter(self.values, float, len(self.values)) - old).sum())
+            self.ties[old] -= 1
+            if not self.ties[old]:
+                del self.ties[old]
+        if self.values:
+            self.s += int(np.sign(x - np.fromiter(self.values, float, len(self.values))).sum())
+        self.values.append(x)
+        self.ties[x] += 1
+
+    def result(self):
+        """``{'trend', 's', 'var_s', 'z', 'p', 'tau', 'n'}``, or None below 3 values."""
+        n = len(self.values)
+        if n < 3:
+            return None
+        var = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in self.ties.values())) / 18
+        s   = self.s
+        z   = 0.0 if s == 0 or var <= 0 else (s - 1 if s > 0 else s + 1) / math.sqrt(var)
+        p   = math.erfc(abs(z) / math.sqrt(2))                # two-sided normal p-value
+        trend = "no trend" if p >= self.alpha else "increasing" if z > 0 else "decreasing"
+        return {'trend': trend, 's': s, 'var_s': var, 'z': z, 'p': p, 'tau': s / (n * (n - 1) / 2), 'n': n}
+
+
+# ─── Rolling windows ───────────────────────────────────────────────────────────
+def _iso(ts):
+    return datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+
+
+class RiskMonitor:
+    """Sliding negative-rate window plus a trend test over whole windows, in bounded memory."""
+
+    def __init__(self, window_s=None, step_s=None, rate_alert=None, min_count=None, trend_windows=None,
+                 alpha=None):
+        self.window_s   = window_s   or config.STREAM_WINDOW_S
+        self.step_s     = step_s     or config.STREAM_STEP_S
+        self.rate_alert = rate_alert if rate_alert is not None else config.STREAM_RATE_ALERT
+        self.min_count  = min_count  if min_count  is not None else config.STREAM_MIN_COUNT
+        if self.window_s % self.step_s:
+            raise ValueError("window_s must be a multiple of step_s")
+        self.k          = self.window_s // self.step_s             # steps per window
+        self.trend      = TrendTest(trend_windows or config.STREAM_TREND_WINDOWS,
+                                    alpha if alpha is not None else config.STREAM_TREND_ALPHA)
+        self.steps      = deque(maxlen=self.k)                     # closed steps: (total, negative, prob_sum)
+        self.current    = None                                     # [step index, total, negative, prob_sum]
+        self.rate_on    = False
+        self.trend_on   = False
+        self.seen       = 0
+        self.late       = 0
+
+    def observe(self, probs, ts):
+        """Add scored texts (``ts`` in unix seconds); returns the events of any steps this closes."""
+        probs  = np.asarray(probs, dtype=np.float64)
+        steps  = (np.asarray(ts, dtype=np.float64) // self.step_s).astype(np.int64)
+        events = []
+        unique = np.unique(steps)                                   # in time order, even within a batch
+        for step in unique:
+            p = probs if len(unique) == 1 else probs[steps == step]
+            if self.current is not None and step < self.current[0]:
+                self.late += len(p)                                 # its step has been reported already
+                continue
+            events += self._advance_to(int(step))
+            c = self.current
+            c[1] += len(p)
+            c[2] += int((p < THRESHOLD).sum())
+            c[3] += float(p.sum())
+            self.seen += len(p)
+        return events
+
+    def tick(self, now):
+        """Close steps that ended before ``now`` (wall clock), for feeds without event times."""
+        if self.current is None:
+            return []
+        return self._advance_to(int(now // self.step_s))
+
+    def flush(self):
+        """Close the open step (end of input)."""
+        if self.current is None:
+            return []
+        events = self._close()
+        self.current = None
+        return events
+
+    # ── Internals ────────────────────────────────────────────────────────────
+    def _advance_to(self, step):
+        if self.current is None:
+            self.current = [step, 0, 0, 0.0]
+            return []
+        events = []
+        span   = self.k * (self.trend.n + 1)    # idle steps that flush every bit of state
+        while self.current[0] < step:
+            events += self._close()
+            # idle steps count as zeros; beyond ``span`` of them, more change nothing
+            self.current = [max(self.current[0] + 1, step - span), 0, 0, 0.0]
+        return events
+
+    def _close(self):
+        step, total, negative, prob_sum = self.current
+        self.steps.append((total, negative, prob_sum))
+        total    = sum(s[0] for s in self.steps)
+        negative = sum(s[1] for s in self.steps)
+        end      = (step + 1) * self.step_s
+        rate     = negative / total if total else 0.0
+        window   = {'type': 'window', 'start': _iso(end - self.window_s), 'end': _iso(end), 'total': total,
+                    'negative': negative, 'rate': rate,
+                    'mean_prob': sum(s[2] for s in self.steps) / total if total else None}
+        events = [window]
+
+        hot = total >= self.min_count and rate >= self.rate_alert
+        if hot and not self.rate_on:
+            events.append({'type': 'alert', 'kind': 'rate', 'end': window['end'], 'rate': rate,
+                           'threshold': self.rate_alert, 'total': total, 'negative': negative})
+        self.rate_on = hot
+
+        if (step + 1) % self.k == 0:                                # a whole window: one trend point
+            self.trend.push(negative)
+            mk = self.trend.result()
+            window['trend'] = mk
+            rising = mk is not None and mk['trend'] == "increasing"
+            if rising and not self.trend_on:
+                events.append({'type': 'alert', 'kind': 'trend', 'end': window['end'], **mk})
+            self.trend_on = rising
+        return events
+
+
+# ─── Sources ───────────────────────────────────────────────────────────────────
+def _rotated(path, f):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:   # mid-rotation; keep reading the old file
+        return False
+    return st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell()
+
+
+def read_file(path, put, follow=False, from_start=True, poll_s=0.25):
+    """Put each line of ``path``; with ``follow``, keep tailing it through truncation and rotation."""
+    f = open(path, "rb")
+    if not from_start:
+        f.seek(0, os.SEEK_END)
+    partial = b""   # a line still being written
+    try:
+        while True:
+            line = f.readline()
+            if line:
+                partial += line
+                if partial.endswith(b"\n") or not follow:
+                    put(partial.decode("utf-8", errors="replace"))
+                    partial = b""
+            elif not follow:
+                return
+            elif _rotated(path, f):
+                f.close()
+                f = open(path, "rb")
+            else:
+                time.sleep(poll_s)
+    finally:
+        f.close()
+
+
+def serve_socket(address, put):
+    """Accept any number of clients on ``tcp://host:port`` or ``unix:///path`` and put their lines.
+
+    Returns the server, already serving on a daemon thread.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                put(raw.decode("utf-8", errors="replace"))
+
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        server = socketserver.ThreadingTCPServer((host or "127.0.0.1", int(port)), Handler)
+    elif address.startswith("unix://"):
+        path = address[len("unix://"):]
+        if os.path.exists(path):
+            os.remove(path)
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    else:
+        raise ValueError(f"unsupported socket address: {address!r}")
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stream-socket", daemon=True).start()
+    return server
+
+
+def parse_line(line):
+    """``(ts, text, id)`` from a plain or JSON line; None for blank lines."""
+    line = line.rstrip("\r\n")
+    if not line.strip():
+        return None
+    if line[0] == "{":
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and isinstance(obj.get("text"), str):
+            ts = obj.get("ts")
+            return (float(ts) if isinstance(ts, (int, float)) else None), obj["text"], obj.get("id")
+    return None, line, None
+
+
+# ─── Pipeline ──────────────────────────────────────────────────────────────────
+class StreamClassifier:
+    """Micro-batch scoring of queued lines, feeding a ``RiskMonitor``."""
+
+    def __init__(self, score, monitor, emit, batch_size=None, max_wait_ms=None, max_queue=None,
+                 predictions=False):
+        self.score       = score
+        self.monitor     = monitor
+        self.emit        = emit
+        self.batch_size  = batch_size  or config.STREAM_BATCH_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else config.STREAM_MAX_WAIT_MS
+        self.queue       = queue.Queue(max_queue or config.STREAM_MAX_QUEUE)
+        self.predictions = predictions
+        self.event_time  = False
+        self.stats       = {'texts': 0, 'batches': 0, 'alerts': 0, 'seconds': 0.0}
+
+    def put(self, line):
+        """Queue one raw line (blocks while the queue is full)."""
+        self.queue.put((time.time(), line))
+
+    def close(self):
+        self.queue.put(EOF)
+
+    def _collect(self):
+        """Wait up to one step for a first line, then gather more until size or deadline."""
+        try:
+            first = self.queue.get(timeout=1.0)
+        except queue.Empty:
+            return [], False
+        if first is EOF:
+            return [], True
+        batch    = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is EOF:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _handle(self, events):
+        for e in events:
+            self.stats['alerts'] += e['type'] == 'alert'
+            self.emit(e)
+
+    def run(self):
+        """Score until a source closes the queue (or KeyboardInterrupt); then flush the open window."""
+        started = time.perf_counter()
+        try:
+            done = False
+            while not done:
+                batch, done = self._collect()
+                rows = [(now, r) for now, r in ((now, parse_line(line)) for now, line in batch) if r is not None]
+                if rows:
+                    ts   = [r[0] if r[0] is not None else now for now, r in rows]
+                    rows = [r for _, r in rows]
+                    self.event_time |= any(r[0] is not None for r in rows)
+                    probs   = self.score([r[1] for r in rows])
+                    self.stats['texts']   += len(rows)
+                    self.stats['batches'] += 1
+                    if self.predictions:
+                        for (_, _, id_), p in zip(rows, probs):
+                            self.emit({'type': 'prediction', 'id': id_, 'probability': float(p),
+                                       'prediction': classify(p)})
+                    self._handle(self.monitor.observe(probs, ts))
+                if not self.event_time:
+                    self._handle(self.monitor.tick(time.time()))
+        except KeyboardInterrupt:
+            pass
+        self._handle(self.monitor.flush())
+        self.stats['seconds'] = time.perf_counter() - started
+        self.stats['late']    = self.monitor.late
+        return self.stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Classify a line-delimited text feed and alert on risk windows.")
+    ap.add_argument("source", nargs="?", default="-",
+                    help="'-' for stdin, a file path, tcp://host:port or unix:///path")
+    ap.add_argument("--follow",      action="store_true", help="keep tailing the file, like tail -F")
+    ap.add_argument("--from-end",    action="store_true", help="with --follow, skip lines already in the file")
+    ap.add_argument("--window",      type=int,   default=config.STREAM_WINDOW_S, help="window length, seconds")
+    ap.add_argument("--step",        type=int,   default=config.STREAM_STEP_S, help="window slide, seconds")
+    ap.add_argument("--rate-alert",  type=float, default=config.STREAM_RATE_ALERT)
+    ap.add_argument("--min-count",   type=int,   default=config.STREAM_MIN_COUNT)
+    ap.add_argument("--trend-windows", type=int, default=config.STREAM_TREND_WINDOWS)
+    ap.add_argument("--alpha",       type=float, default=config.STREAM_TREND_ALPHA)
+    ap.add_argument("--batch-size",  type=int,   default=config.STREAM_BATCH_SIZE)
+    ap.add_argument("--fast",        help="linear_model.npz fast tier (default DETECTOR_FAST_MODEL_PATH)")
+    ap.add_argument("--fast-only",   action="store_true", help="score with the fast tier alone")
+    ap.add_argument("--predictions", action="store_true", help="also emit one event per text")
+    ap.add_argument("--alerts-only", action="store_true", help="emit alerts, not window summaries")
+    ap.add_argument("--topics",      metavar="DIR", help="feed negative texts to a detector.topics state")
+    args = ap.parse_args(argv)
+
+    fast = load_fast_tier(args.fast)
+    if args.fast_only:
+        if fast is None:
+            ap.error("--fast-only needs --fast or DETECTOR_FAST_MODEL_PATH")
+        score = fast.predict
+    else:
+        predictor = Predictor.load().warmup()
+        if args.fast:
+            predictor.fast = fast
+        score = predictor.predict
+
+    tracker = None
+    if args.topics:
+        from detector.topics import TopicTracker
+
+        tracker, classify_batch = TopicTracker.open(args.topics), score
+
+        def score(texts):
+            probs = classify_batch(texts)
+            tracker.update([t for t, p in zip(texts, probs) if p < THRESHOLD])
+            return probs
+
+    def emit(event):
+        if not (args.alerts_only and event['type'] == 'window'):
+            print(json.dumps(event), flush=True)
+
+    monitor = RiskMonitor(args.window, args.step, args.rate_alert, args.min_count, args.trend_windows, args.alpha)
+    stream  = StreamClassifier(score, monitor, emit, args.batch_size, predictions=args.predictions)
+
+    if args.source.startswith(("tcp://", "unix://")):
+        server = serve_socket(args.source, stream.put)
+        print(f"listening on {args.source}", file=sys.stderr, flush=True)
+    else:
+        def reader():
+            try:
+                if args.source == "-":
+                    for line in sys.stdin:
+                        stream.put(line)
+                else:
+                    read_file(args.source, stream.put, args.follow, not args.from_end)
+            finally:
+                stream.close()
+
+        server = None
+        threading.Thread(target=reader, name="stream-reader", daemon=True).start()
+
+    stats = stream.run()
+    if server is not None:
+        server.shutdown()
+    if tracker is not None:
+        tracker.save(args.topics)
+    rate = stats['texts'] / stats['seconds'] if stats['seconds'] else 0.0
+    print(f"{stats['texts']} texts in {stats['batches']} batches, {rate:.0f}/s, {stats['alerts']} alerts, "
+          f"{stats['late']} late", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Online LDA topic tracking over negatively classified texts.
+
+    python -m detector.topics update new_tweets.csv --state topics
+    python -m detector.topics show --state topics
+
+The notebook rebuilds a gensim ``Dictionary`` and retrains
+``LdaModel(num_topics=10)`` over every tweet whenever the corpus changes, so
+each refresh costs more than the last.  ``TopicTracker`` instead folds each
+new mini-batch into the existing model with ``LdaModel.update`` (online
+variational Bayes; old batches are never revisited).  Documents are buffered
+until ``chunksize`` are waiting, since online LDA learns poorly from tiny
+batches; the remainder is saved with the state and carries over.  Words are mapped with
+a ``HashDictionary``, whose id space is fixed up front, so new vocabulary
+never changes the model's shape; the dictionary also remembers which words
+hashed to each id, for display.  ``LdaMulticore`` is used when more than one
+worker is available.
+
+Texts get the notebook's topic-model cleaning (``preprocess.lexicon_texts``)
+and whitespace split.  State lives in one directory (``dictionary``,
+``lda``, ``pending.json``, ``meta.json``) and is replaced atomically on ``save``.  Reading the
+current topics only touches the topic-word matrix, so it costs the same
+however much history has been ingested.
+
+Needs ``gensim`` (``pip install gensim``), imported on first use.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from detector import config
+from detector.preprocess import lexicon_texts
+
+
+class TopicTracker:
+    """A persisted online LDA model plus the hashed dictionary feeding it."""
+
+    def __init__(self, num_topics=None, id_range=None, workers=None, chunksize=None, eta=None, seed=0):
+        from gensim.corpora import HashDictionary
+
+        self.num_topics = num_topics or config.TOPICS_NUM
+        self.id_range   = id_range   or config.TOPICS_ID_RANGE
+        self.workers    = workers    or config.TOPICS_WORKERS
+        self.chunksize  = chunksize  or config.TOPICS_CHUNKSIZE
+        self.eta        = eta        or config.TOPICS_ETA
+        self.seed       = seed
+        self.dictionary = HashDictionary(id_range=self.id_range, debug=True)
+        self.lda        = None
+        self.pending    = []   # bag-of-words documents not yet in the model
+        self.meta       = {'docs': 0, 'updates': 0, 'created': None, 'updated': None}
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+    @classmethod
+    def load(cls, path, workers=None):
+        """Restore a saved tracker; ``workers`` overrides the saved worker count."""
+        from gensim.corpora import HashDictionary
+        from gensim.models import LdaModel
+
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        tracker = cls(meta['num_topics'], meta['id_range'], workers, meta['chunksize'], meta['eta'], meta['seed'])
+        tracker.meta       = {k: meta[k] for k in ('docs', 'updates', 'created', 'updated')}
+        tracker.dictionary = HashDictionary.load(os.path.join(path, "dictionary"))
+        if os.path.exists(os.path.join(path, "lda")):
+            tracker.lda = LdaModel.load(os.path.join(path, "lda"))   # keeps the saved class (LdaMulticore too)
+        if tracker.lda is not None and hasattr(tracker.lda, "workers"):
+            tracker.lda.workers = tracker.workers
+        with open(os.path.join(path, "pending.json")) as f:
+            tracker.pending = [[tuple(pair) for pair in bow] for bow in json.load(f)]
+        return tracker
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """``load(path)`` if it exists, else a fresh tracker."""
+        if os.path.exists(os.path.join(path, "meta.json")):
+            return cls.load(path, kwargs.get("workers"))
+        return cls(**kwargs)
+
+    def save(self, path):
+        """Write the state to ``path``, replacing any previous state only once it is complete."""
+        tmp, old = path + ".tmp", path + ".old"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        self.dictionary.save(os.path.join(tmp, "dictionary"))
+        if self.lda is not None:
+            self.lda.save(os.path.join(tmp, "lda"))
+        with open(os.path.join(tmp, "pending.json"), "w") as f:
+            json.dump(self.pending, f)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({**self.meta, 'num_topics': self.num_topics, 'id_range': self.id_range,
+                       'chunksize': self.chunksize, 'eta': self.eta, 'seed': self.seed}, f, indent=2)
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, old)
+        os.rename(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+        return path
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+    def _new_model(self):
+        from gensim.models import LdaModel, LdaMulticore
+
+        kwargs = dict(num_topics=self.num_topics, id2word=self.dictionary, chunksize=self.chunksize,
+                      eta=self.eta, eval_every=None, random_state=self.seed)
+        if self.workers > 1:
+            return LdaMulticore(workers=self.workers, **kwargs)
+        return LdaModel(**kwargs)
+
+    def update(self, texts):
+        """Add texts to the dictionary and the model (in whole ``chunksize`` batches); returns the documents kept."""
+        corpus = [self.dictionary.doc2bow(t.split(), allow_update=True) for t in lexicon_texts(texts)]
+        corpus = [bow for bow in corpus if bow]
+        self.pending += corpus
+        while len(self.pending) >= self.chunksize:
+            self._train(self.pending[:self.chunksize])
+            self.pending = self.pending[self.chunksize:]
+        return len(corpus)
+
+    def flush(self):
+        """Train on the pending documents now, even if fewer than ``chunksize``."""
+        if self.pending:
+            self._train(self.pending)
+            self.pending = []
+
+    def _train(self, corpus):
+        if self.lda is None:
+            self.lda = self._new_model()
+            self.meta['created'] = time.time()
+        self.lda.update(corpus)   # chunksize was fixed at construction
+        self.meta['docs']    += len(corpus)
+        self.meta['updates'] += 1
+        self.meta['updated']  = time.time()
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+    def _word(self, term):
+        """The most frequent of the words that hash to ``term``."""
+        words = self.dictionary.id2token.get(term)
+        if not words:
+            return str(term)
+        return max(sorted(words), key=lambda w: self.dictionary.dfs_debug.get(w, 0))
+
+    def topics(self, num_words=10):
+        """``[(topic, [(word, weight), ...])]`` for every topic, heaviest words first."""
+        if self.lda is None:
+            return []
+        weights = self.lda.get_topics()
+        top     = np.argpartition(-weights, num_words, axis=1)[:, :num_words]
+        out     = []
+        for k, ids in enumerate(top):
+            ids = ids[np.argsort(-weights[k, ids])]
+            out.append((k, [(self._word(int(i)), float(weights[k, i])) for i in ids]))
+        return out
+
+    def show(self, num_words=10):
+        """The topics in the notebook's ``show_topics`` format."""
+        return [(k, " + ".join(f'{w:.3f}*"{word}"' for word, w in words))
+                for k, words in self.topics(num_words)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Track LDA topics of negatively classified texts online.")
+    ap.add_argument("command", choices=("update", "show"))
+    ap.add_argument("input", nargs="?", help="CSV/JSONL to ingest (update)")
+    ap.add_argument("--state",     default=config.TOPICS_PATH, help="state directory")
+    ap.add_argument("--column",    default="clean_text")
+    ap.add_argument("--label",     help="use this 0/1 column (0 = negative) instead of running the model")
+    ap.add_argument("--chunksize", type=int, default=config.TOPICS_CHUNKSIZE, help="documents per model update")
+    ap.add_argument("--flush",     action="store_true", help="train on a final partial batch too")
+    ap.add_argument("--workers",   type=int, default=config.TOPICS_WORKERS)
+    ap.add_argument("--words",     type=int, default=10)
+    args = ap.parse_args(argv)
+
+    tracker = TopicTracker.open(args.state, workers=args.workers, chunksize=args.chunksize)
+    if args.command == "update":
+        if not args.input:
+            ap.error("update needs an input file")
+        from detector.predictor import THRESHOLD, Predictor
+        from detector.score import read_chunks
+
+        predictor = None if args.label else Predictor.load().warmup()
+        started, used = time.perf_counter(), 0
+        for chunk in read_chunks(args.input, args.chunksize):
+            texts = chunk[args.column].astype(str).tolist()
+            if args.label:
+                negative = chunk[args.label].to_numpy() == 0
+            else:
+                negative = predictor.predict(texts) < THRESHOLD
+            used += tracker.update([t for t, n in zip(texts, negative) if n])
+        if args.flush:
+            tracker.flush()
+        tracker.save(args.state)
+        print(f"ingested {used} negative texts in {time.perf_counter() - started:.1f}s "
+              f"({tracker.meta['docs']} in the model, {len(tracker.pending)} pending)", file=sys.stderr)
+    if tracker.lda is None:
+        print(f"no model yet: {len(tracker.pending)} of {tracker.chunksize} documents for the first update",
+              file=sys.stderr)
+    for k, topic in tracker.show(args.words):
+        print((k, topic))
+
+
+if __name__ == "__main__":
+    main()
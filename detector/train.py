@@ -0,0 +1,191 @@
+"""Headless, reproducible retraining of the BiLSTM from ``df_polarity.csv``.
+
+    python -m detector.train df_polarity.csv --out artifacts --epochs 15 --batch-size 16
+
+Follows the notebook's training cell: a Keras ``Tokenizer(num_words=10000,
+oov_token="<OOV>")`` fitted on every row, left padding to 100, the stratified
+80/20 split with ``random_state=42``, the last 20% of the training rows held
+out for validation, and the same BiLSTM, optimizer and early stopping.  Input
+batches come from a seeded ``tf.data`` pipeline with prefetch, and TensorFlow
+ops run deterministically, so the same seed and CSV give the same weights.
+
+Each run writes a versioned directory ``<out>/<timestamp>-<csv sha256[:8]>/``
+holding ``lstm_model.h5``, ``tokenizer.pkl``, ``tokenizer.vocab``,
+``lstm_model.npz`` (NumPy backend), ``linear_model.npz`` (cascade fast tier,
+fitted on the same split) and ``metrics.json``; ``<out>/LATEST`` names it.
+
+``csv`` may instead be a ``detector.corpus`` directory.  Texts and labels
+are then read from its memory-mapped columns, and its token ids are used as
+they are when the freshly fitted tokenizer turns out to be the one they were
+built with (the usual case when retraining on unchanged data).  The run
+version then hashes the corpus texts rather than the CSV file.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from detector.corpus import Corpus, is_corpus
+from detector.linear import LinearModel, fit as fit_linear
+from detector.predictor import MAXLEN, THRESHOLD
+from detector.vocab import Vocabulary, pad
+
+NUM_WORDS = 10000
+OOV_TOKEN = "<OOV>"
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def build_model(maxlen=MAXLEN, learning_rate=3e-4):
+    """The notebook's BiLSTM, compiled."""
+    from tensorflow.keras.layers import LSTM, Bidirectional, Dense, Dropout, Embedding, Input
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.optimizers import Adam
+
+    model = Sequential([
+        Input((maxlen,), dtype="int32"),
+        Embedding(NUM_WORDS, 128),
+        Bidirectional(LSTM(64, return_sequences=True)),
+        Dropout(0.5),
+        Bidirectional(LSTM(32)),
+        Dropout(0.4),
+        Dense(1, activation="sigmoid"),
+    ])
+    model.compile(loss="binary_crossentropy", optimizer=Adam(learning_rate=learning_rate), metrics=["accuracy"])
+    return model
+
+
+def dataset(x, y, batch_size, seed=None):
+    """Batched, prefetched ``tf.data`` pipeline; shuffled each epoch when ``seed`` is given."""
+    import tensorflow as tf
+
+    ds = tf.data.Dataset.from_tensor_slices((x, y.astype(np.float32)))
+    if seed is not None:
+        ds = ds.shuffle(len(x), seed=seed, reshuffle_each_iteration=True)
+    return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def train(csv, out="artifacts", epochs=15, batch_size=16, seed=42, patience=3, learning_rate=3e-4,
+          validation_split=0.2, test_size=0.2, version=None, log=sys.stderr):
+    """Train, evaluate and write one versioned artifact directory; returns its path."""
+    import pandas as pd
+    import tensorflow as tf
+    from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+    from tensorflow.keras.callbacks import EarlyStopping
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    from detector.numpy_backend import export_weights
+
+    tf.keras.utils.set_random_seed(seed)
+    tf.config.experimental.enable_op_determinism()
+    started = time.perf_counter()
+
+    corpus = Corpus.open(csv) if is_corpus(csv) else None
+    if corpus is not None:
+        if corpus.labels is None:
+            raise ValueError(f"{csv} has no labels")
+        texts  = pd.Series(corpus.texts())
+        y      = np.asarray(corpus.labels)
+        digest = corpus.meta['texts_sha256']
+    else:
+        df     = pd.read_csv(csv)
+        texts  = df["clean_text"].astype(str).fillna("")
+        y      = df["label"].to_numpy()
+        digest = _sha256(csv)
+
+    tokenizer = Tokenizer(num_words=NUM_WORDS, oov_token=OOV_TOKEN)
+    tokenizer.fit_on_texts(texts)
+    if corpus is not None and corpus.encoded_with(tokenizer, MAXLEN):
+        x = np.asarray(corpus.tokens)
+        print("using the corpus's token ids", file=log)
+    else:
+        x = pad(tokenizer.texts_to_sequences(texts), MAXLEN)
+
+    idx = np.arange(len(y))
+    train_idx, test_idx = train_test_split(idx, test_size=test_size, stratify=y, random_state=seed)
+    split_at = int(math.ceil(len(train_idx) * (1 - validation_split)))   # as Keras' validation_split
+    fit_idx, val_idx = train_idx[:split_at], train_idx[split_at:]
+    print(f"rows: train {len(fit_idx)}, validation {len(val_idx)}, test {len(test_idx)}", file=log)
+
+    model = build_model(MAXLEN, learning_rate)
+    early = EarlyStopping(monitor="val_loss", patience=patience, restore_best_weights=True)
+    history = model.fit(dataset(x[fit_idx], y[fit_idx], batch_size, seed),
+                        validation_data=dataset(x[val_idx], y[val_idx], batch_size),
+                        epochs=epochs, callbacks=[early], shuffle=False, verbose=2)   # tf.data shuffles
+    train_s = time.perf_counter() - started
+
+    probs = model.predict(dataset(x[test_idx], y[test_idx], batch_size), verbose=0).reshape(-1)
+    preds = (probs >= THRESHOLD).astype(int)
+    linear = fit_linear(texts.iloc[train_idx].tolist(), y[train_idx])
+    linear_probs = linear.predict_proba(texts.iloc[test_idx].tolist())[:, 1]
+
+    version = version or f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:8]}"
+    path    = os.path.join(out, version)
+    os.makedirs(path, exist_ok=True)
+    model.save(os.path.join(path, "lstm_model.h5"))
+    export_weights(model, os.path.join(path, "lstm_model.npz"))
+    with open(os.path.join(path, "tokenizer.pkl"), "wb") as f:
+        pickle.dump(tokenizer, f)
+    Vocabulary.from_tokenizer(tokenizer).save(os.path.join(path, "tokenizer.vocab"))
+    LinearModel.from_pipeline(linear).save(os.path.join(path, "linear_model.npz"))
+
+    losses = history.history["val_loss"]
+    metrics = {
+        "version": version,
+        "data":    {"path": os.path.abspath(csv), "sha256": digest, "rows": len(y)},
+        "params":  {"epochs": epochs, "batch_size": batch_size, "seed": seed, "patience": patience,
+                    "learning_rate": learning_rate, "validation_split": validation_split,
+                    "test_size": test_size, "maxlen": MAXLEN, "num_words": NUM_WORDS},
+        "split":   {"train": len(fit_idx), "validation": len(val_idx), "test": len(test_idx)},
+        "history": {k: [float(v) for v in vs] for k, vs in history.history.items()},
+        "best_epoch": int(np.argmin(losses)) + 1,
+        "test":    {"accuracy": accuracy_score(y[test_idx], preds),
+                    "f1":       f1_score(y[test_idx], preds),
+                    "auc":      roc_auc_score(y[test_idx], probs)},
+        "linear_test": {"accuracy": accuracy_score(y[test_idx], linear_probs >= THRESHOLD),
+                        "f1":       f1_score(y[test_idx], linear_probs >= THRESHOLD),
+                        "auc":      roc_auc_score(y[test_idx], linear_probs)},
+        "train_seconds": round(train_s, 1),
+        "versions": {"tensorflow": tf.__version__, "numpy": np.__version__},
+    }
+    with open(os.path.join(path, "metrics.json"), "w") as f:
+        json.dump(metrics, f, indent=2)
+    with open(os.path.join(out, "LATEST"), "w") as f:
+        f.write(version + "\n")
+    return path
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Retrain the BiLSTM and write versioned artifacts.")
+    ap.add_argument("csv", nargs="?", default="df_polarity.csv", help="CSV or detector.corpus directory")
+    ap.add_argument("--out",        default="artifacts", help="parent directory for versioned runs")
+    ap.add_argument("--version",    help="run directory name (default: <timestamp>-<csv hash>)")
+    ap.add_argument("--epochs",     type=int,   default=15)
+    ap.add_argument("--batch-size", type=int,   default=16)
+    ap.add_argument("--seed",       type=int,   default=42)
+    ap.add_argument("--patience",   type=int,   default=3)
+    ap.add_argument("--lr",         type=float, default=3e-4)
+    args = ap.parse_args(argv)
+
+    path = train(args.csv, args.out, args.epochs, args.batch_size, args.seed, args.patience, args.lr,
+                 version=args.version)
+    with open(os.path.join(path, "metrics.json")) as f:
+        test = json.load(f)["test"]
+    print(f"wrote {path}: accuracy {test['accuracy']:.4f}, f1 {test['f1']:.4f}, auc {test['auc']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
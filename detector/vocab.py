@@ -0,0 +1,176 @@
+"""Compact replacement for the pickled Keras ``Tokenizer``.
+
+``tokenizer.pkl`` carries word_counts and word_docs for every word ever seen
+and needs Keras importable to unpickle.  Inference only uses the word_index
+entries below ``num_words`` plus the OOV id, so those are written as a plain
+UTF-8 string table — a JSON header line, then one word per line in index
+order — and the dict is rebuilt on load.
+
+    python -m detector.vocab tokenizer.pkl tokenizer.vocab --verify df_polarity.csv
+"""
+import argparse
+import json
+import pickle
+import re
+from itertools import repeat
+from time import perf_counter
+
+import numpy as np
+
+from detector.metrics import observe
+
+FORMAT = "detector-vocab/1"
+SEP    = "\x00"   # joins texts for bulk encoding; assumed absent from real input
+
+
+class Vocabulary:
+    """The inference half of a Keras ``Tokenizer``, with identical ``texts_to_sequences``."""
+
+    def __init__(self, words, num_words, oov_token, filters, lower=True, split=" "):
+        self.words      = list(words)                     # words[i] has id i + 1
+        self.word_index = dict(zip(self.words, range(1, len(self.words) + 1)))
+        self.num_words  = num_words
+        self.oov_token  = oov_token
+        self.oov_index  = self.word_index.get(oov_token) if oov_token is not None else None
+        self.filters    = filters
+        self.lower      = lower
+        self.split      = split
+        self._table     = str.maketrans({c: split for c in filters})
+        self._lookup    = dict(self.word_index, **{"": -2, SEP: -1})
+        # re.sub over a character class is far faster than str.translate on
+        # non-ASCII strings, and the bulk blob is non-ASCII as soon as one text is
+        self._filter_re = re.compile("[" + re.escape(filters) + "]") if filters else None
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer):
+        """Keep only the ids a fitted Keras tokenizer can actually emit."""
+        limit = tokenizer.num_words or len(tokenizer.word_index) + 1
+        ranked = sorted((i, w) for w, i in tokenizer.word_index.items() if i < limit)
+        return cls([w for _, w in ranked], tokenizer.num_words, tokenizer.oov_token,
+                   tokenizer.filters, tokenizer.lower, tokenizer.split)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8", newline="") as f:
+            header, *words = f.read().split("\n")
+        meta = json.loads(header)
+        if meta.pop("format", None) != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} file")
+        return cls(words, **meta)
+
+    def save(self, path):
+        for w in self.words:
+            if "\n" in w:
+                raise ValueError(f"cannot store word containing a newline: {w!r}")
+        header = json.dumps({"format": FORMAT, "num_words": self.num_words, "oov_token": self.oov_token,
+                             "filters": self.filters, "lower": self.lower, "split": self.split})
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write("\n".join([header] + self.words))
+        return path
+
+    def text_to_words(self, text):
+        """Keras ``text_to_word_sequence``: lower, map filters to the split char, split."""
+        if self.lower:
+            text = text.lower()
+        return [w for w in text.translate(self._table).split(self.split) if w]
+
+    def texts_to_sequences(self, texts):
+        get, oov = self.word_index.get, self.oov_index
+        seqs = []
+        for text in texts:
+            ids = [get(w, oov) for w in self.text_to_words(text)]
+            seqs.append([i for i in ids if i is not None] if oov is None else ids)
+        return seqs
+
+    def encode(self, texts, maxlen):
+        """Encode straight into a left-padded (N, maxlen) int32 matrix.
+
+        Same output as ``pad_sequences(texts_to_sequences(texts), maxlen)``,
+        but lower/filter/split run once over all texts joined by ``SEP``,
+        the lookups go through a single ``map``, and the ids are scattered
+        into the preallocated matrix with NumPy instead of per-row lists.
+        """
+        texts = list(texts)
+        out   = np.zeros((len(texts), maxlen), dtype=np.int32)
+        if not texts:
+            return out
+        t0   = perf_counter()
+        blob = SEP.join(texts)
+        if SEP in self.filters or blob.count(SEP) != len(texts) - 1:
+            seqs = self.texts_to_sequences(texts)
+            t1   = perf_counter()
+            out  = pad(seqs, maxlen)
+            observe("tokenize", t1 - t0)
+            observe("pad", perf_counter() - t1)
+            return out
+        if self.lower:
+            blob = blob.lower()
+        split = self.split
+        if self._filter_re is not None:
+            blob = self._filter_re.sub(split.replace("\\", "\\\\"), blob)
+        t1     = perf_counter()
+        tokens = blob.replace(SEP, split + SEP + split).split(split)
+        miss   = self.oov_index if self.oov_index is not None else -2
+        ids    = np.fromiter(map(self._lookup.get, tokens, repeat(miss)), dtype=np.int32, count=len(tokens))
+        t2     = perf_counter()
+
+        row  = np.cumsum(ids == -1)                    # text each token belongs to
+        keep = ids >= 0
+        row, ids = row[keep], ids[keep]
+        ends = np.cumsum(np.bincount(row, minlength=len(texts)))
+        back = ends[row] - np.arange(len(ids))         # 1 for a text's last token
+        sel  = back <= maxlen                          # pad_sequences truncates from the front
+        out[row[sel], maxlen - back[sel]] = ids[sel]
+        observe("clean", t1 - t0)
+        observe("tokenize", t2 - t1)
+        observe("pad", perf_counter() - t2)
+        return out
+
+
+def pad(seqs, maxlen):
+    """NumPy equivalent of Keras ``pad_sequences`` with pre-padding and pre-truncation."""
+    out = np.zeros((len(seqs), maxlen), dtype=np.int32)
+    for i, seq in enumerate(seqs):
+        seq = seq[-maxlen:]
+        if seq:
+            out[i, maxlen - len(seq):] = seq
+    return out
+
+
+def load_tokenizer(path):
+    """Load either a ``.vocab`` string table or a pickled Keras tokenizer."""
+    if path.endswith(".vocab"):
+        return Vocabulary.load(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def verify(tokenizer, vocab, texts):
+    """Indices of texts whose sequences differ between the two tokenizers."""
+    a = tokenizer.texts_to_sequences(texts)
+    b = vocab.texts_to_sequences(texts)
+    return [i for i, (x, y) in enumerate(zip(a, b)) if x != y]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export tokenizer.pkl to a compact vocabulary file.")
+    ap.add_argument("tokenizer", nargs="?", default="tokenizer.pkl")
+    ap.add_argument("output",    nargs="?", default="tokenizer.vocab")
+    ap.add_argument("--verify", metavar="CSV", help="check texts_to_sequences on the clean_text column of CSV")
+    args = ap.parse_args(argv)
+
+    tokenizer = load_tokenizer(args.tokenizer)
+    Vocabulary.from_tokenizer(tokenizer).save(args.output)
+    vocab = Vocabulary.load(args.output)
+    print(f"wrote {args.output} ({len(vocab.words)} words)")
+    if args.verify:
+        import pandas as pd
+        texts = pd.read_csv(args.verify)["clean_text"].astype(str).tolist()
+        bad = verify(tokenizer, vocab, texts)
+        print(f"{len(texts) - len(bad)}/{len(texts)} texts encode identically")
+        if bad:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
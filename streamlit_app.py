@@ -1,15 +1,12 @@
 import streamlit as st
-import pickle
-import numpy as np
 import time
-from datetime import datetime
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from tensorflow.keras.models import load_model
-import plotly.graph_objects as go
-import plotly.express as px
-from PIL import Image
-import pytesseract
-import io
+
+# Heavy libraries (TensorFlow, plotly, PIL, pytesseract) are imported on first
+# use so the page can render before the model is ready.
+from detector import LRUCache, config, metrics
+from detector.analytics import AnalyticsStore
+from detector.cache import ocr_cache, row_key
+from detector.engine import Engine
 
 # ─── Page config ───────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -325,33 +322,63 @@ SAMPLE_TWEETS = {
 }
 
 # ─── Session state ──────────────────────────────────────────────────────────────
-if 'analytics' not in st.session_state:
-    st.session_state.analytics = {'total_analyses': 0, 'positive_count': 0, 'negative_count': 0, 'history': []}
 if 'user_input'     not in st.session_state: st.session_state.user_input     = ""
 if 'should_analyze' not in st.session_state: st.session_state.should_analyze = False
 if 'last_result'    not in st.session_state: st.session_state.last_result    = None
 if 'input_mode'     not in st.session_state: st.session_state.input_mode     = "text"  # "text" or "image"
 
-# ─── Patch stale history entries (fixes KeyError on reloads) ──────────────────
-for entry in st.session_state.analytics.get('history', []):
-    entry.setdefault('cls',  'Unknown')
-    entry.setdefault('ts',   '')
-    entry.setdefault('prob', 0.0)
-    entry.setdefault('txt',  '')
-
 # ─── Load model ─────────────────────────────────────────────────────────────────
 @st.cache_resource
 def load_model_and_tokenizer():
-    try:
-        model = load_model("lstm_model.h5")
-        with open("tokenizer.pkl", "rb") as f:
-            tokenizer = pickle.load(f)
-        return model, tokenizer
-    except Exception as e:
-        st.error(f"❌ {e}")
+    # Loads and warms the predictor (plus the process-wide micro-batcher that
+    # every session shares) on a background thread; the page renders meanwhile.
+    return Engine()
+
+@st.cache_resource
+def load_prediction_cache():
+    # Shared by all sessions; sample-tweet clicks and reruns hit it.
+    return LRUCache()
+
+@st.cache_resource
+def load_ocr_cache():
+    # Maps a hash of the uploaded bytes to extracted text; re-uploads and reruns skip tesseract.
+    return ocr_cache()
+
+@st.cache_resource
+def load_analytics():
+    # One SQLite (WAL) log for every session and worker; writes are batched off the request path.
+    return AnalyticsStore()
+
+@st.cache_resource
+def load_metrics():
+    # Process-wide stage histograms; scraped from DETECTOR_METRICS_PORT when it is set.
+    metrics.REGISTRY.track_cache("prediction", prediction_cache)
+    metrics.REGISTRY.track_cache("ocr", ocr_results)
+    if config.METRICS_PORT:
+        metrics.serve(config.METRICS_PORT, config.METRICS_HOST)
+    return metrics.REGISTRY
+
+engine           = load_model_and_tokenizer()
+prediction_cache = load_prediction_cache()
+ocr_results      = load_ocr_cache()
+analytics        = load_analytics()
+load_metrics()
+
+def ready_engine():
+    """Wait for the background load (with a spinner) and stop on failure."""
+    if not engine.ready:
+        with st.spinner("⏳ Warming up the model…"):
+            engine.wait()
+    if engine.error:
+        load_model_and_tokenizer.clear()   # don't cache the failure; the next rerun loads again
+        st.error(f"❌ {engine.error}")
         st.stop()
+    return engine
 
-model, tokenizer = load_model_and_tokenizer()
+def record_startup():
+    """Export the engine's start-up milestones (seconds since model load began) as ``startup_*`` stages."""
+    for stage, seconds in engine.timings.items():
+        metrics.observe(f"startup_{stage}", seconds)
 
 # ─── Helpers ────────────────────────────────────────────────────────────────────
 def clear_text():
@@ -360,42 +387,70 @@ def clear_text():
     st.session_state.should_analyze = False
     st.session_state.last_result    = None
 
-def update_analytics(prob, text):
-    a = st.session_state.analytics
-    a['total_analyses'] += 1
-    cls = "Positive" if prob >= 0.5 else "Negative"
-    if prob >= 0.5:
-        a['positive_count'] += 1
-    else:
-        a['negative_count'] += 1
-    a['history'].append({
-        'ts':   datetime.now().strftime("%H:%M"),
-        'cls':  cls,
-        'prob': float(prob),
-        'txt':  text[:38] + "…" if len(text) > 38 else text
-    })
-    if len(a['history']) > 10:
-        a['history'] = a['history'][-10:]
+def update_analytics(prob, text, source="text"):
+    analytics.record(prob, text, source)
 
 def run_analysis(text):
-    seq  = tokenizer.texts_to_sequences([text])
-    pad  = pad_sequences(seq, maxlen=100)
-    t0   = time.time()
-    prob = model.predict(pad, verbose=0)[0][0]
-    ms   = (time.time() - t0) * 1000
+    eng  = ready_engine()
+    t0   = time.perf_counter()
+    fast, escalate = eng.predictor.screen([text])
+    prob = float(fast[0])
+    if escalate[0]:   # only texts the fast tier is unsure about reach the LSTM
+        row  = eng.predictor.encode([text])[0]
+        key  = row_key(row)
+        prob = prediction_cache.get(key)
+        if prob is None:
+            prob = eng.batcher.predict(row)
+            prediction_cache.put(key, prob)
+    ms   = (time.perf_counter() - t0) * 1000
     update_analytics(prob, text)
-    return float(prob), ms
+    if eng.mark('first_prediction'):
+        record_startup()
+    return prob, ms
 
 def extract_text_from_image(image_file):
     """Extract text from uploaded image using OCR (pytesseract)."""
-    try:
-        img = Image.open(image_file).convert("RGB")
-        text = pytesseract.image_to_string(img, config='--psm 6')
-        return text.strip()
-    except Exception as e:
-        return None
+    from detector.ocr import extract_text_cached
+
+    text, _ = extract_text_cached(image_file.getvalue(), ocr_results)
+    return text
+
+def run_image_batch(files):
+    """OCR several uploads on a thread pool and score the texts in one batch."""
+    from detector.ocr import analyze_images
+
+    predictor = ready_engine().predictor
+    t0        = time.perf_counter()
+    results   = list(analyze_images([(f.name, f.getvalue()) for f in files], predictor, cache=ocr_results))
+    for r in results:
+        if 'prob' in r:
+            update_analytics(r['prob'], r['text'], source="image")
+    return results, (time.perf_counter() - t0) * 1000
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def pie_chart(positive, negative):
+    # Rebuilt only when the counts change, not on every rerun.
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Pie(
+        labels=['Positive', 'Negative'],
+        values=[positive, negative],
+        marker_colors=['#34d399', '#f87171'],
+        hole=0.38,
+        textfont_size=10,
+        textfont_color='white'
+    ))
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': 'white'}, height=185,
+        margin=dict(l=5, r=5, t=8, b=5),
+        legend=dict(font=dict(color='white', size=9), orientation='v', x=1.0, y=0.5)
+    )
+    return fig
 
 def gauge(prob):
+    import plotly.graph_objects as go
+
     if prob >= 0.5:
         intensity = (prob - 0.5) * 2
         clr = "#34d399"
@@ -446,6 +501,16 @@ with colA:
     <hr class="divider">
     """, unsafe_allow_html=True)
 
+    # ── Warm-up status: polls until the background load finishes, then reruns ─
+    if not engine.ready:
+        @st.fragment(run_every=1.0)
+        def warmup_status():
+            if engine.ready:
+                st.rerun()
+            st.markdown('<p class="app-subtitle">⏳ Model warming up… you can start typing.</p>',
+                        unsafe_allow_html=True)
+        warmup_status()
+
     # ── Input mode toggle ────────────────────────────────────────────────────
     mode_col1, mode_col2 = st.columns(2)
     with mode_col1:
@@ -504,18 +569,24 @@ with colA:
     # ── IMAGE MODE ───────────────────────────────────────────────────────────
     else:
         st.markdown(
-            '<p style="font-size:0.75rem;font-weight:600;margin-bottom:0.2rem">📸 Upload a screenshot:</p>',
+            '<p style="font-size:0.75rem;font-weight:600;margin-bottom:0.2rem">📸 Upload one or more screenshots:</p>',
             unsafe_allow_html=True
         )
-        uploaded_file = st.file_uploader(
+        uploaded_files = st.file_uploader(
             "Upload screenshot",
             type=["png", "jpg", "jpeg", "webp"],
+            accept_multiple_files=True,
             label_visibility="collapsed"
         )
 
-        if uploaded_file:
-            img = Image.open(uploaded_file)
+        if uploaded_files:
+            from PIL import Image
+        if len(uploaded_files) == 1:
+            img = Image.open(uploaded_files[0])
             st.image(img, use_container_width=True, caption="Uploaded screenshot")
+        elif uploaded_files:
+            st.image([Image.open(f) for f in uploaded_files[:6]], width=88,
+                     caption=[f.name for f in uploaded_files[:6]])
 
         img_b1, img_b2 = st.columns([1.6, 1])
         with img_b1:
@@ -524,9 +595,21 @@ with colA:
             st.button("🗑️ Clear", use_container_width=True, on_click=clear_text, key="clear_image")
 
         if analyze_img_btn:
-            if uploaded_file:
+            if len(uploaded_files) > 1:
+                with st.spinner(f"Reading text from {len(uploaded_files)} images…"):
+                    results, ms = run_image_batch(uploaded_files)
+                scored = [r for r in results if 'prob' in r]
+                if scored:
+                    worst = min(scored, key=lambda r: r['prob'])
+                    st.session_state.last_result = {
+                        'prob': worst['prob'], 'ms': ms, 'text': worst['text'], 'ok': True,
+                        'from_image': True, 'images': results
+                    }
+                else:
+                    st.session_state.last_result = {'ok': False, 'ocr_fail': True}
+            elif uploaded_files:
                 with st.spinner("Reading text from image…"):
-                    extracted = extract_text_from_image(uploaded_file)
+                    extracted = extract_text_from_image(uploaded_files[0])
                 if extracted:
                     p, ms = run_analysis(extracted)
                     st.session_state.last_result = {
@@ -542,6 +625,7 @@ with colA:
 
 
 # ── COL B — Crisis info + Result ────────────────────────────────────────────
+render_t0 = time.perf_counter()   # result + analytics columns, recorded as the "render" stage
 with colB:
 
     # ── Always-visible Crisis Resources (TOP of col B) ──────────────────────
@@ -583,6 +667,21 @@ with colB:
                 unsafe_allow_html=True
             )
 
+        # Per-image breakdown for multi-screenshot uploads (highest risk is shown below)
+        if r.get('images'):
+            lines = []
+            for item in r['images']:
+                if 'prob' in item:
+                    dot = "🟢" if item['cls'] == "Positive" else "🔴"
+                    lines.append(f"{dot} {item['name']} · {item['prob']:.0%} · OCR {item['ocr_ms']:.0f}ms")
+                else:
+                    lines.append(f"⚪ {item['name']} · no text found · OCR {item['ocr_ms']:.0f}ms")
+            st.markdown(
+                '<p style="font-size:0.66rem;margin:0 0 0.3rem;color:rgba(255,255,255,0.75)">'
+                + "<br>".join(lines) + '</p>',
+                unsafe_allow_html=True
+            )
+
         label    = "🔴 Suicidal / Negative"  if prob < 0.5 else "🟢 Non-Suicidal / Positive"
         color    = "#f87171"                  if prob < 0.5 else "#34d399"
         risk_lbl = "HIGH RISK"                if prob < 0.5 else "LOW RISK"
@@ -642,45 +741,31 @@ with colB:
 with colC:
     st.markdown('<h3 style="text-align:center;margin:0 0 0.4rem">📊 Analytics</h3>', unsafe_allow_html=True)
 
-    a = st.session_state.analytics
-    if a['total_analyses'] > 0:
+    a = analytics.summary()
+    if a['total'] > 0:
         st.markdown(f"""
         <div class="stat-row">
             <div class="stat-card">
                 <div class="stat-label">Total</div>
-                <div class="stat-number">{a['total_analyses']}</div>
+                <div class="stat-number">{a['total']}</div>
             </div>
             <div class="stat-card">
                 <div class="stat-label">Positive</div>
-                <div class="stat-number" style="color:#34d399">{a['positive_count']}</div>
+                <div class="stat-number" style="color:#34d399">{a['positive']}</div>
             </div>
             <div class="stat-card">
                 <div class="stat-label">Negative</div>
-                <div class="stat-number" style="color:#f87171">{a['negative_count']}</div>
+                <div class="stat-number" style="color:#f87171">{a['negative']}</div>
             </div>
         </div>
         """, unsafe_allow_html=True)
 
-        fig_pie = go.Figure(go.Pie(
-            labels=['Positive', 'Negative'],
-            values=[a['positive_count'], a['negative_count']],
-            marker_colors=['#34d399', '#f87171'],
-            hole=0.38,
-            textfont_size=10,
-            textfont_color='white'
-        ))
-        fig_pie.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-            font={'color': 'white'}, height=185,
-            margin=dict(l=5, r=5, t=8, b=5),
-            legend=dict(font=dict(color='white', size=9), orientation='v', x=1.0, y=0.5)
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(pie_chart(a['positive'], a['negative']), use_container_width=True)
 
         st.markdown('<hr class="divider">', unsafe_allow_html=True)
         st.markdown('<p style="font-size:0.74rem;font-weight:600;margin-bottom:0.2rem">📝 Recent Analyses</p>', unsafe_allow_html=True)
 
-        for item in reversed(a['history'][-5:]):
+        for item in analytics.recent(5):
             cls  = item.get('cls',  'Unknown')
             ts   = item.get('ts',   '')
             prob = item.get('prob', 0.0)
@@ -698,3 +783,8 @@ with colC:
             <p style="font-size:0.76rem">No analyses yet.<br>Run your first scan to see stats here.</p>
         </div>
         """, unsafe_allow_html=True)
+
+metrics.observe("render", time.perf_counter() - render_t0)
+
+# ── First paint done (recorded once per process, for the startup breakdown) ──
+engine.mark('first_paint')
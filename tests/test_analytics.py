@@ -0,0 +1,126 @@
+"""``AnalyticsStore`` counts every row exactly once, whether queued, being written or stored."""
+import logging
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from detector.analytics import AnalyticsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = AnalyticsStore(str(tmp_path / "a.db"), flush_ms=10 ** 7, flush_size=10 ** 9)   # flush only by hand
+    yield s
+    s.close()
+
+
+def _wait_for(cond, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _texts(rows):
+    return [r['txt'] for r in rows]
+
+
+def test_reads_during_a_flush_count_each_row_once(store):
+    for i in range(1000):
+        store.record(0.9 if i % 4 else 0.1, f"t{i}")
+    assert store.summary()['total'] == 1000
+
+    # hold the write lock from another connection so the flush stalls inside its transaction
+    blocker = sqlite3.connect(store.path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    _wait_for(lambda: store._inflight)
+    for i in range(1000, 1010):
+        store.record(0.9, f"t{i}")
+
+    s = store.summary()
+    assert (s['total'], s['positive'], s['negative']) == (1010, 760, 250)
+    assert _texts(store.recent(15)) == [f"t{i}" for i in range(1009, 994, -1)]
+
+    blocker.rollback()
+    blocker.close()
+    flusher.join(10)
+    assert not store._inflight
+    s = store.summary()
+    assert (s['total'], s['positive']) == (1010, 760)
+    assert _texts(store.recent(15)) == [f"t{i}" for i in range(1009, 994, -1)]
+
+    store.flush()
+    assert store.summary()['total'] == 1010
+    assert _texts(store.recent(15)) == [f"t{i}" for i in range(1009, 994, -1)]
+
+
+def test_failed_flush_keeps_rows_counted_once(store, monkeypatch):
+    for i in range(5):
+        store.record(0.9, f"t{i}")
+
+    def fail(rows):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, "_write", fail)
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.summary()['total'] == 5
+    assert _texts(store.recent(10)) == ["t4", "t3", "t2", "t1", "t0"]
+
+    monkeypatch.undo()
+    store.flush()
+    assert store.summary()['total'] == 5
+    assert _texts(store.recent(10)) == ["t4", "t3", "t2", "t1", "t0"]
+
+
+def test_concurrent_readers_never_over_or_undercount(tmp_path):
+    store = AnalyticsStore(str(tmp_path / "a.db"), flush_ms=1, flush_size=50)
+    started, done, problems, stop = [0], [0], [], threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            lo = done[0]
+            total = store.summary()['total']
+            hi = started[0]
+            if not lo <= total <= hi:
+                problems.append((lo, total, hi))
+            texts = _texts(store.recent(5))
+            if len(set(texts)) != len(texts):
+                problems.append(texts)
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for i in range(5000):
+        started[0] = i + 1
+        store.record(0.7, f"t{i}")
+        done[0] = i + 1
+    stop.set()
+    for t in threads:
+        t.join()
+    store.close()
+    assert problems == []
+    assert store.summary()['total'] == 5000
+
+
+def test_background_flush_failure_is_logged(tmp_path, monkeypatch, caplog):
+    store = AnalyticsStore(str(tmp_path / "a.db"), flush_ms=1, flush_size=1)
+    failed = threading.Event()
+
+    def fail(rows):
+        failed.set()
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "_write", fail)
+    with caplog.at_level(logging.WARNING, logger="detector.analytics"):
+        store.record(0.9, "t0")
+        assert failed.wait(10)
+        _wait_for(lambda: caplog.records)
+    assert "database is locked" in caplog.records[0].getMessage()
+    monkeypatch.undo()
+    store.close()
+    assert store.summary()['total'] == 1
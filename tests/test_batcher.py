@@ -0,0 +1,142 @@
+"""How ``MicroBatcher`` forms batches and hands results and errors back to callers."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from detector.batcher import MicroBatcher
+
+
+class RecordingForward:
+    """``forward`` returning each row's first id / 1000 and remembering every batch size."""
+
+    def __init__(self, fail=False):
+        self.sizes = []
+        self.fail  = fail
+        self.lock  = threading.Lock()
+
+    def __call__(self, x):
+        with self.lock:
+            self.sizes.append(len(x))
+        if self.fail:
+            raise ValueError("model exploded")
+        return x[:, 0].astype(np.float32) / 1000
+
+
+def _row(i):
+    row = np.zeros(100, dtype=np.int32)
+    row[0] = i
+    return row
+
+
+@pytest.fixture
+def batcher_factory():
+    made = []
+
+    def make(forward, **kwargs):
+        b = MicroBatcher(forward, **kwargs)
+        made.append(b)
+        return b
+    yield make
+    for b in made:
+        b.close()
+
+
+def test_full_batch_flushes_without_waiting(batcher_factory):
+    forward = RecordingForward()
+    batcher = batcher_factory(forward, max_size=4, max_wait_ms=10_000)
+    t0   = time.perf_counter()
+    futs = [batcher.submit(_row(i)) for i in range(8)]
+    assert [f.result(5) for f in futs] == pytest.approx([i / 1000 for i in range(8)])
+    assert time.perf_counter() - t0 < 5           # far below the 10 s window
+    assert forward.sizes == [4, 4]
+    assert batcher.stats()['max_batch'] == 4
+
+
+def test_partial_batch_flushes_after_max_wait(batcher_factory):
+    forward = RecordingForward()
+    batcher = batcher_factory(forward, max_size=100, max_wait_ms=100)
+    t0   = time.perf_counter()
+    futs = [batcher.submit(_row(i)) for i in range(3)]
+    assert [f.result(5) for f in futs] == pytest.approx([0, 0.001, 0.002])
+    assert time.perf_counter() - t0 >= 0.09       # held for the window to gather company
+    assert forward.sizes == [3]
+
+
+def test_zero_wait_does_not_hold_a_lone_request(batcher_factory):
+    batcher = batcher_factory(RecordingForward(), max_size=32, max_wait_ms=0)
+    t0 = time.perf_counter()
+    assert batcher.predict(_row(7), timeout=5) == pytest.approx(0.007)
+    assert time.perf_counter() - t0 < 1
+
+
+def test_concurrent_callers_get_their_own_results(batcher_factory):
+    forward = RecordingForward()
+    batcher = batcher_factory(forward, max_size=8, max_wait_ms=5)
+    callers, per_caller = 16, 50
+    results, barrier = {}, threading.Barrier(callers)
+
+    def caller(c):
+        barrier.wait()
+        results[c] = [batcher.predict(_row(c * per_caller + k), timeout=10) for k in range(per_caller)]
+
+    threads = [threading.Thread(target=caller, args=(c,)) for c in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for c in range(callers):
+        assert results[c] == pytest.approx([(c * per_caller + k) / 1000 for k in range(per_caller)])
+    assert sum(forward.sizes) == callers * per_caller
+    assert max(forward.sizes) <= 8
+    assert max(forward.sizes) > 1                  # concurrent requests really were coalesced
+
+
+def test_forward_error_reaches_every_waiting_caller(batcher_factory):
+    forward = RecordingForward(fail=True)
+    batcher = batcher_factory(forward, max_size=5, max_wait_ms=10_000)
+    futs = [batcher.submit(_row(i)) for i in range(5)]
+    for f in futs:
+        with pytest.raises(ValueError, match="model exploded"):
+            f.result(5)
+    assert forward.sizes == [5]
+
+    forward.fail = False                           # the worker survives and keeps serving
+    futs = [batcher.submit(_row(i)) for i in range(5)]
+    assert [f.result(5) for f in futs] == pytest.approx([i / 1000 for i in range(5)])
+
+
+def test_close_serves_queued_requests_then_refuses(batcher_factory):
+    batcher = MicroBatcher(RecordingForward(), max_size=100, max_wait_ms=10_000)
+    futs = [batcher.submit(_row(i)) for i in range(3)]
+    batcher.close()
+    assert [f.result(1) for f in futs] == pytest.approx([0, 0.001, 0.002])
+    with pytest.raises(RuntimeError):
+        batcher.submit(_row(0))
+
+
+def test_app_path_matches_predict(batcher_factory):
+    """screen → encode → batcher(forward), as the app and service run it, equals ``Predictor.predict``."""
+    from detector.linear import LinearModel
+    from detector.predictor import Predictor
+    from detector.vocab import Vocabulary
+
+    vocab = Vocabulary(["<OOV>", "sad", "happy", "alone", "great"], None, "<OOV>", "")
+
+    def model(x):
+        return (np.count_nonzero(x == 3, axis=1) * 0.3 + np.count_nonzero(x == 5, axis=1) * 0.1 + 0.2
+                ).astype(np.float32)
+
+    fast = LinearModel(["sad", "happy", "alone"], [1.0, 1.0, 1.0], [-3.0, 3.0, -0.2], 0.0)
+    predictor = Predictor(model, vocab, mode="numpy", fast=fast)
+    batcher   = batcher_factory(predictor.forward, max_size=4, max_wait_ms=1)
+    texts = ["sad sad", "happy", "alone alone great", "great", "", "sad happy alone"]
+
+    def app_path(text):
+        probs, escalate = predictor.screen([text])
+        if not escalate[0]:
+            return float(probs[0])
+        return batcher.predict(predictor.encode([text])[0], timeout=5)
+
+    assert [app_path(t) for t in texts] == pytest.approx(predictor.predict(texts).tolist())
@@ -0,0 +1,83 @@
+"""``detector.score`` resumes an interrupted run without duplicating or losing rows."""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from detector.score import Checkpoint, score_file
+
+
+class Crash(Exception):
+    pass
+
+
+class StubPredictor:
+    """Deterministic per-text scores; raises ``Crash`` on call number ``crash_at`` (0-based)."""
+
+    def __init__(self, crash_at=None):
+        self.crash_at = crash_at
+        self.calls    = 0
+
+    def predict(self, texts):
+        if self.calls == self.crash_at:
+            raise Crash()
+        self.calls += 1
+        return np.array([(len(t) % 97) / 97 for t in texts], dtype=np.float32)
+
+
+def _input(tmp_path, fmt, rows=103):
+    texts = [f"tweet {i} " + "word " * (i % 7) for i in range(rows)]
+    texts[5]  = 'a "quoted", multi-line\ntweet'
+    texts[40] = "ünïcödé 😭"
+    df   = pd.DataFrame({"clean_text": texts, "label": [i % 2 for i in range(rows)]})
+    path = tmp_path / f"in.{fmt}"
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    return str(path)
+
+
+def _score(predictor, src, out, **kwargs):
+    return score_file(predictor, src, out, chunksize=10, log=io.StringIO(), **kwargs)
+
+
+def _read(path, fmt):
+    if fmt == "csv":
+        return pd.read_csv(path, keep_default_na=False)
+    return pd.read_json(path, lines=True)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+@pytest.mark.parametrize("crash_at", [0, 1, 4, 10])
+@pytest.mark.parametrize("torn_write", [False, True])
+def test_resume_matches_uninterrupted_run(tmp_path, fmt, crash_at, torn_write):
+    src      = _input(tmp_path, fmt)
+    expected = tmp_path / f"expected.{fmt}"
+    output   = tmp_path / f"out.{fmt}"
+    assert _score(StubPredictor(), src, str(expected)) == 103
+
+    with pytest.raises(Crash):
+        _score(StubPredictor(crash_at), src, str(output))
+    state = Checkpoint(str(output) + ".ckpt").load()
+    assert (state or {"chunks": 0})["chunks"] == crash_at
+    if torn_write:   # the process died halfway through appending the next chunk
+        with open(output, "ab") as f:
+            f.write(b'"half a row,0.5\n{"clean_text": "tru')
+
+    rows = _score(StubPredictor(), src, str(output), resume=True)
+    assert rows == 103
+    got, want = _read(output, fmt), _read(expected, fmt)
+    assert len(got) == 103
+    assert got["clean_text"].is_unique
+    pd.testing.assert_frame_equal(got.drop(columns="latency_ms"), want.drop(columns="latency_ms"))
+    assert not (tmp_path / f"out.{fmt}.ckpt").exists()
+
+
+def test_resume_refuses_other_chunksize(tmp_path):
+    src, output = _input(tmp_path, "csv"), str(tmp_path / "out.csv")
+    with pytest.raises(Crash):
+        _score(StubPredictor(2), src, output)
+    with pytest.raises(ValueError, match="chunksize"):
+        score_file(StubPredictor(), src, output, chunksize=20, resume=True, log=io.StringIO())
@@ -0,0 +1,178 @@
+"""The HTTP service, in process, against a stub predictor."""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from detector import service  # noqa: E402
+from detector.predictor import MAXLEN  # noqa: E402
+
+
+class StubPredictor:
+    """Probability = word count / 10 (capped at 1); ``gate`` blocks ``predict`` until set."""
+
+    mode = "stub"
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def screen(self, texts):
+        return np.zeros(len(texts), dtype=np.float32), np.ones(len(texts), dtype=bool)
+
+    def encode(self, texts):
+        x = np.zeros((len(texts), MAXLEN), dtype=np.int32)
+        for i, t in enumerate(texts):
+            x[i, :min(len(t.split()), MAXLEN)] = 1
+        return x
+
+    def forward(self, x):
+        return np.minimum(np.count_nonzero(x, axis=1) / 10, 1.0).astype(np.float32)
+
+    def predict(self, texts):
+        self.gate.wait(10)
+        return self.forward(self.encode(texts))
+
+    def warmup(self):
+        return self
+
+
+def run(app, scenario):
+    async def main():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_predict():
+    async def scenario(client):
+        resp = await client.post("/predict", json={"text": "one two three"})
+        assert resp.status == 200
+        body = await resp.json()
+        assert body["probability"] == pytest.approx(0.3)
+        assert body["prediction"] == "Negative"
+        assert body["latency_ms"] >= 0
+
+        resp = await client.post("/predict", json={"text": " ".join(["w"] * 8)})
+        assert (await resp.json())["prediction"] == "Positive"
+    run(service.create_app(StubPredictor()), scenario)
+
+
+def test_predict_batch_keeps_order():
+    texts = ["a", "a b c d e f", "a b", ""]
+
+    async def scenario(client):
+        resp = await client.post("/predict/batch", json={"texts": texts})
+        assert resp.status == 200
+        body = await resp.json()
+        assert [r["probability"] for r in body["results"]] == pytest.approx([0.1, 0.6, 0.2, 0.0])
+        assert [r["prediction"] for r in body["results"]] == ["Negative", "Positive", "Negative", "Negative"]
+    run(service.create_app(StubPredictor()), scenario)
+
+
+@pytest.mark.parametrize("path,data", [
+    ("/predict",       b"not json"),
+    ("/predict",       b'["a list"]'),
+    ("/predict",       b'{"txt": "wrong key"}'),
+    ("/predict",       b'{"text": 42}'),
+    ("/predict/batch", b"not json"),
+    ("/predict/batch", b'{"texts": "not a list"}'),
+    ("/predict/batch", b'{"texts": ["ok", 3]}'),
+])
+def test_bad_bodies_are_400(path, data):
+    async def scenario(client):
+        resp = await client.post(path, data=data, headers={"Content-Type": "application/json"})
+        assert resp.status == 400
+    run(service.create_app(StubPredictor()), scenario)
+
+
+def test_batch_too_large_is_413():
+    async def scenario(client):
+        resp = await client.post("/predict/batch", json={"texts": ["a"] * 5})
+        assert resp.status == 413
+    run(service.create_app(StubPredictor(), max_batch=4), scenario)
+
+
+def test_429_beyond_max_queue():
+    stub = StubPredictor()
+    stub.gate.clear()
+    app  = service.create_app(stub, max_queue=1)
+
+    async def scenario(client):
+        first = asyncio.create_task(client.post("/predict/batch", json={"texts": ["a b"]}))
+        while app[service.STATE]["admission"].admitted < 1:
+            await asyncio.sleep(0.005)
+        busy = await client.post("/predict/batch", json={"texts": ["a"]})
+        assert busy.status == 429
+        assert busy.headers["Retry-After"] == "1"
+        busy = await client.post("/predict", json={"text": "a"})
+        assert busy.status == 429
+
+        stub.gate.set()
+        assert (await first).status == 200
+        again = await client.post("/predict/batch", json={"texts": ["a"]})
+        assert again.status == 200
+    run(app, scenario)
+
+
+def test_readyz_before_and_after_load(monkeypatch):
+    loaded = threading.Event()
+    stub   = StubPredictor()
+
+    def load():
+        loaded.wait(10)
+        return stub
+
+    monkeypatch.setattr(service.Predictor, "load", staticmethod(load))
+    app = service.create_app()
+
+    async def scenario(client):
+        resp = await client.get("/readyz")
+        assert resp.status == 503
+        assert (await resp.json())["ready"] is False
+        resp = await client.post("/predict", json={"text": "a"})
+        assert resp.status == 503
+        assert (await client.get("/healthz")).status == 200
+
+        loaded.set()
+        await asyncio.wait_for(app[service.STATE]["loader"], 10)
+        resp = await client.get("/readyz")
+        assert resp.status == 200
+        assert await resp.json() == {"ready": True, "backend": "stub"}
+        assert (await client.post("/predict", json={"text": "a"})).status == 200
+    run(app, scenario)
+
+
+def test_readyz_reports_load_failure(monkeypatch):
+    def load():
+        raise FileNotFoundError("lstm_model.npz")
+
+    monkeypatch.setattr(service.Predictor, "load", staticmethod(load))
+    app = service.create_app()
+
+    async def scenario(client):
+        await asyncio.wait_for(app[service.STATE]["loader"], 10)
+        resp = await client.get("/readyz")
+        assert resp.status == 500
+        assert "lstm_model.npz" in (await resp.json())["error"]
+    run(app, scenario)
+
+
+def test_cleanup_cancels_pending_load(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(service.Predictor, "load", staticmethod(lambda: release.wait(10) and StubPredictor()))
+    app = service.create_app()
+
+    async def main():
+        async with TestClient(TestServer(app)) as client:
+            assert (await client.get("/readyz")).status == 503
+        return app[service.STATE]["loader"].cancelled()   # checked before asyncio.run tears the loop down
+
+    try:
+        assert asyncio.run(main())
+    finally:
+        release.set()
@@ -0,0 +1,76 @@
+"""The incremental Mann-Kendall ``TrendTest`` against a direct O(n²) computation."""
+import math
+
+import numpy as np
+import pytest
+
+from detector.stream import TrendTest
+
+norm = pytest.importorskip("scipy.stats").norm
+
+
+def mann_kendall(values, alpha):
+    """Textbook Mann-Kendall over ``values``: every pair compared, ties grouped with ``np.unique``."""
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    s = sum(int(np.sign(x[j] - x[i])) for i in range(n) for j in range(i + 1, n))
+    _, counts = np.unique(x, return_counts=True)
+    var = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in counts)) / 18
+    if s > 0:
+        z = (s - 1) / math.sqrt(var)
+    elif s < 0:
+        z = (s + 1) / math.sqrt(var)
+    else:
+        z = 0.0
+    p = 2 * norm.sf(abs(z))
+    trend = "no trend" if p >= alpha else "increasing" if z > 0 else "decreasing"
+    return {'trend': trend, 's': s, 'var_s': var, 'z': z, 'p': p, 'tau': s / (n * (n - 1) / 2), 'n': n}
+
+
+def _streams(rng, length):
+    yield "continuous", rng.normal(size=length)
+    yield "rates",      rng.integers(0, 21, size=length) / 20          # heavy ties, like negative rates
+    yield "few values", rng.integers(0, 3, size=length).astype(float)  # almost all ties
+    drift = np.cumsum(rng.normal(0.05, 1, size=length))                # runs of real trends
+    yield "drifting",   np.round(drift, 1)
+
+
+@pytest.mark.parametrize("window", [3, 4, 7, 12, 30])
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_matches_direct_over_sliding_window(window, seed):
+    rng = np.random.default_rng(seed)
+    for name, stream in _streams(rng, 400):
+        test = TrendTest(window, alpha=0.05)
+        for i, x in enumerate(stream):
+            test.push(x)
+            got = test.result()
+            recent = stream[max(0, i + 1 - window):i + 1]
+            if len(recent) < 3:
+                assert got is None
+                continue
+            want = mann_kendall(recent, 0.05)
+            assert got['s'] == want['s'], (name, i)
+            assert got['n'] == want['n']
+            assert got['var_s'] == pytest.approx(want['var_s']), (name, i)
+            assert got['z'] == pytest.approx(want['z']), (name, i)
+            assert got['p'] == pytest.approx(want['p'], rel=1e-9, abs=1e-12), (name, i)
+            assert got['tau'] == pytest.approx(want['tau'])
+            assert got['trend'] == want['trend'], (name, i)
+
+
+def test_detects_monotonic_trends():
+    up, down = TrendTest(12), TrendTest(12)
+    for x in range(20):
+        up.push(x)
+        down.push(-x)
+    assert up.result()['trend'] == "increasing"
+    assert down.result()['trend'] == "decreasing"
+    assert up.result()['tau'] == 1.0
+
+
+def test_constant_window_has_no_trend():
+    test = TrendTest(10)
+    for _ in range(25):
+        test.push(0.5)
+    r = test.result()
+    assert (r['s'], r['var_s'], r['z'], r['trend']) == (0, 0, 0.0, "no trend")
@@ -0,0 +1,76 @@
+"""``tokenizer.vocab`` must encode exactly like the pickled Keras tokenizer it replaces."""
+import os
+
+import numpy as np
+import pytest
+
+from detector.predictor import MAXLEN
+from detector.vocab import SEP, Vocabulary, load_tokenizer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("tensorflow")   # tokenizer.pkl unpickles into a Keras Tokenizer
+from tensorflow.keras.preprocessing.sequence import pad_sequences  # noqa: E402
+
+EDGE_CASES = [
+    "",
+    "   ",
+    " ".join(f"word{i}" for i in range(250)),             # longer than MAXLEN: keep the last 100
+    "I feel so alone " * 40,
+    "Café naïve ŞEHİR résumé — “quotes” ünïcödé 😭😂 🇰🇪",
+    "tabs\tand\nnewlines\r\nmixed\t\tin",
+    "punctuation!!! everywhere??? (really) #tags @users",
+    "UPPER lower MiXeD",
+    "zzzunknownword qqqnotinvocab",
+]
+
+
+@pytest.fixture(scope="module")
+def tokenizers():
+    return (load_tokenizer(os.path.join(ROOT, "tokenizer.pkl")),
+            Vocabulary.load(os.path.join(ROOT, "tokenizer.vocab")))
+
+
+@pytest.fixture(scope="module")
+def texts():
+    import pandas as pd
+
+    return pd.read_csv(os.path.join(ROOT, "df_polarity.csv"))["clean_text"].astype(str).tolist()
+
+
+def test_texts_to_sequences_matches_keras(tokenizers, texts):
+    keras, vocab = tokenizers
+    assert vocab.texts_to_sequences(texts) == keras.texts_to_sequences(texts)
+
+
+def test_encode_matches_pad_sequences(tokenizers, texts):
+    keras, vocab = tokenizers
+    x = vocab.encode(texts, MAXLEN)
+    assert x.dtype == np.int32
+    np.testing.assert_array_equal(x, pad_sequences(keras.texts_to_sequences(texts), MAXLEN))
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_edge_cases(tokenizers, text):
+    keras, vocab = tokenizers
+    expected = pad_sequences(keras.texts_to_sequences([text]), MAXLEN)
+    assert vocab.texts_to_sequences([text]) == keras.texts_to_sequences([text])
+    np.testing.assert_array_equal(vocab.encode([text], MAXLEN), expected)
+
+
+def test_edge_cases_in_one_batch(tokenizers):
+    keras, vocab = tokenizers
+    np.testing.assert_array_equal(vocab.encode(EDGE_CASES, MAXLEN),
+                                  pad_sequences(keras.texts_to_sequences(EDGE_CASES), MAXLEN))
+
+
+def test_separator_in_input_falls_back(tokenizers):
+    keras, vocab = tokenizers
+    batch = [f"before{SEP}after", "plain text"]
+    np.testing.assert_array_equal(vocab.encode(batch, MAXLEN),
+                                  pad_sequences(keras.texts_to_sequences(batch), MAXLEN))
+
+
+def test_empty_batch(tokenizers):
+    _, vocab = tokenizers
+    assert vocab.encode([], MAXLEN).shape == (0, MAXLEN)